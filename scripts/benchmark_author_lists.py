@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it
+# under the terms of the GPL-2.0 License; see LICENSE file for more details.
+
+"""Benchmark of the INSPIRE harvester on records with large author lists.
+
+Times, for synthetic records with the author lists of large collaborations,
+the mapping of the authors to creators, the update of an existing record with
+them and the comparison of the harvested metadata with the existing one.
+
+Usage:
+
+.. code-block:: shell
+
+    python scripts/benchmark_author_lists.py --authors 5000 10000
+"""
+
+import argparse
+import copy
+import logging
+import timeit
+from types import SimpleNamespace
+
+from cds_rdm.inspire_harvester.transform.mappers.contributors import AuthorsMapper
+from cds_rdm.inspire_harvester.update.config import UPDATE_STRATEGY_CONFIG
+from cds_rdm.inspire_harvester.update.engine import UpdateContext, UpdateEngine
+from cds_rdm.inspire_harvester.utils import compare_metadata
+
+# institutes of the synthetic collaboration, the even ones with a ROR id
+INSTITUTES = 200
+
+
+def build_source_record(authors):
+    """Build an INSPIRE record with the given number of authors."""
+    src_authors = []
+    for i in range(authors):
+        institutes = [i % INSTITUTES, (i * 7) % INSTITUTES]
+        src_authors.append(
+            {
+                "full_name": f"Family {i}, Given",
+                "first_name": "Given",
+                "last_name": f"Family {i}",
+                "ids": [
+                    {"schema": "INSPIRE ID", "value": f"INSPIRE-{i:08d}"},
+                    {"schema": "ORCID", "value": f"0000-0000-{i // 10000:04d}-{i:04d}"},
+                ],
+                "affiliations": [{"value": f"Institute {n}"} for n in institutes],
+                "affiliations_identifiers": [
+                    {"schema": "ROR", "value": f"https://ror.org/0{n:07d}x"}
+                    for n in institutes
+                    if n % 2 == 0
+                ],
+            }
+        )
+    return {"metadata": {"authors": src_authors}}
+
+
+def build_current_record(creators):
+    """Build an existing CDS record with the creators, as read from the service."""
+    current_creators = copy.deepcopy(creators)
+    for creator in current_creators:
+        for affiliation in creator.get("affiliations", []):
+            if "id" in affiliation:
+                affiliation["name"] = f"Institute {affiliation['id']}"
+    return {
+        "pids": {},
+        "files": {"enabled": False},
+        "metadata": {"title": "Title", "creators": current_creators},
+        "custom_fields": {},
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--authors", type=int, nargs="+", default=[5000, 10000])
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    logger = logging.getLogger(__name__)
+    mapper = AuthorsMapper()
+    engine = UpdateEngine(strategies=UPDATE_STRATEGY_CONFIG)
+    update_ctx = UpdateContext(source="inspire_import")
+
+    print(f"{'authors':>8} {'map (ms)':>10} {'update (ms)':>12} {'compare (ms)':>13}")
+    for authors in args.authors:
+        src_record = build_source_record(authors)
+        creators = mapper.map_value(src_record, SimpleNamespace(errors=[]), logger)
+        assert len(creators) == authors
+        current = build_current_record(creators)
+        incoming = {
+            "pids": {},
+            "files": {"enabled": False},
+            "metadata": {"title": "Title", "creators": creators},
+            "custom_fields": {},
+        }
+        # already up to date: only the dereferenced affiliation names differ
+        assert compare_metadata(incoming["metadata"], current["metadata"])
+
+        timings = [
+            timeit.timeit(stmt, number=args.number) / args.number * 1e3
+            for stmt in (
+                lambda: mapper.map_value(
+                    src_record, SimpleNamespace(errors=[]), logger
+                ),
+                lambda: engine.update(current, incoming, update_ctx, logger),
+                lambda: compare_metadata(incoming["metadata"], current["metadata"]),
+            )
+        ]
+        print(
+            f"{authors:>8} {timings[0]:>10.1f} {timings[1]:>12.1f} {timings[2]:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it
+# under the terms of the GPL-2.0 License; see LICENSE file for more details.
+
+"""Micro-benchmark of the merge of the INSPIRE harvester mapper patches.
+
+Compares folding the patches with ``deep_merge`` (one copy of the accumulated
+record per patch) with the single-pass ``deep_merge_all``, for records with
+growing author lists.
+
+Usage:
+
+.. code-block:: shell
+
+    python scripts/benchmark_patch_merge.py --authors 10 1000 10000
+"""
+
+import argparse
+import timeit
+from functools import reduce
+
+from cds_rdm.inspire_harvester.utils import build_path, deep_merge, deep_merge_all
+
+# ids of the mappers of the default policy, which all return a patch
+MAPPER_IDS = [
+    "metadata.resource_type.id",
+    "metadata.title",
+    "metadata.additional_titles",
+    "metadata.creators",
+    "metadata.contributors",
+    "metadata.publisher",
+    "metadata.publication_date",
+    "metadata.copyright",
+    "metadata.rights",
+    "metadata.description",
+    "metadata.additional_descriptions",
+    "metadata.subjects",
+    "metadata.languages",
+    "metadata.funding",
+    "metadata.identifiers",
+    "metadata.related_identifiers",
+    "custom_fields.imprint:imprint",
+    "custom_fields.cern:experiments",
+    "custom_fields.cern:accelerators",
+    "pids",
+    "files",
+]
+
+
+def build_patches(authors):
+    """Build mapper-like patches for a record with the given number of authors."""
+    creators = [
+        {
+            "person_or_org": {
+                "type": "personal",
+                "family_name": f"Family {i}",
+                "given_name": f"Given {i}",
+                "identifiers": [{"scheme": "inspire_author", "identifier": f"{i}"}],
+            },
+            "affiliations": [{"name": "CERN"}],
+        }
+        for i in range(authors)
+    ]
+    patches = []
+    for mapper_id in MAPPER_IDS:
+        value = creators if mapper_id == "metadata.creators" else {"value": mapper_id}
+        patches.append(build_path(mapper_id, value))
+    return patches
+
+
+def fold_merge(patches):
+    """Merge the patches by folding them with ``deep_merge``."""
+    return reduce(lambda a, b: deep_merge(a, b) if b else a, patches, {})
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--authors", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'authors':>8} {'fold (us)':>12} {'single pass (us)':>18} {'speedup':>8}")
+    for authors in args.authors:
+        patches = build_patches(authors)
+        assert fold_merge(patches) == deep_merge_all(patches)
+        fold = timeit.timeit(lambda: fold_merge(patches), number=args.number)
+        single = timeit.timeit(lambda: deep_merge_all(patches), number=args.number)
+        print(
+            f"{authors:>8} {fold / args.number * 1e6:>12.2f} "
+            f"{single / args.number * 1e6:>18.2f} {fold / single:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
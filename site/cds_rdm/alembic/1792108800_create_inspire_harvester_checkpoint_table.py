@@ -0,0 +1,59 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create INSPIRE harvester checkpoint table."""
+
+import sqlalchemy as sa
+from alembic import op
+from invenio_db.shared import UTCDateTime
+
+# revision identifiers, used by Alembic.
+revision = "1792108800"
+down_revision = "1771314900"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "cds_inspire_harvester_checkpoint",
+        sa.Column(
+            "key",
+            sa.String(length=255),
+            nullable=False,
+            comment="Identifier of the harvest (job and date window)",
+        ),
+        sa.Column(
+            "query_url",
+            sa.Text(),
+            nullable=False,
+            comment="First page URL of the harvest query",
+        ),
+        sa.Column(
+            "url",
+            sa.Text(),
+            nullable=False,
+            comment="URL of the page to resume from",
+        ),
+        sa.Column(
+            "skip",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of hits of the page already processed",
+        ),
+        sa.Column("created", UTCDateTime(), nullable=False),
+        sa.Column("updated", UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "key", name=op.f("pk_cds_inspire_harvester_checkpoint")
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table("cds_inspire_harvester_checkpoint")
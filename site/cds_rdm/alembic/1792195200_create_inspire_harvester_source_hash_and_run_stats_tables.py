@@ -0,0 +1,85 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create INSPIRE harvester source hash and run stats tables."""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+from invenio_db.shared import UTCDateTime
+
+from cds_rdm.inspire_harvester.models import SourceHashOutcomeEnum
+
+# revision identifiers, used by Alembic.
+revision = "1792195200"
+down_revision = "1792108800"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "cds_inspire_harvester_source_hash",
+        sa.Column(
+            "inspire_id",
+            sa.String(length=255),
+            nullable=False,
+            comment="The record id in INSPIRE",
+        ),
+        sa.Column(
+            "source_hash",
+            sa.String(length=64),
+            nullable=False,
+            comment="Hash of the INSPIRE metadata read by the mappers",
+        ),
+        sa.Column(
+            "outcome",
+            sqlalchemy_utils.types.choice.ChoiceType(
+                SourceHashOutcomeEnum, impl=sa.String(1)
+            ),
+            nullable=False,
+            comment="Outcome of the last write",
+        ),
+        sa.Column(
+            "record_pid",
+            sa.String(length=255),
+            nullable=True,
+            comment="The record id in CDS",
+        ),
+        sa.Column("created", UTCDateTime(), nullable=False),
+        sa.Column("updated", UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "inspire_id", name=op.f("pk_cds_inspire_harvester_source_hash")
+        ),
+    )
+    op.create_table(
+        "cds_inspire_harvester_run_stats",
+        sa.Column(
+            "run_id",
+            sqlalchemy_utils.types.uuid.UUIDType(),
+            nullable=False,
+            comment="The harvester job run",
+        ),
+        sa.Column(
+            "skipped_count",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of records skipped as unchanged.",
+        ),
+        sa.Column("created", UTCDateTime(), nullable=False),
+        sa.Column("updated", UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "run_id", name=op.f("pk_cds_inspire_harvester_run_stats")
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table("cds_inspire_harvester_run_stats")
+    op.drop_table("cds_inspire_harvester_source_hash")
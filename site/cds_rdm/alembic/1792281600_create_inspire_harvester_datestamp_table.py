@@ -0,0 +1,58 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create INSPIRE harvester datestamp table."""
+
+import sqlalchemy as sa
+import sqlalchemy_utils
+from alembic import op
+from invenio_db.shared import UTCDateTime
+
+# revision identifiers, used by Alembic.
+revision = "1792281600"
+down_revision = "1792195200"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "cds_inspire_harvester_datestamp",
+        sa.Column(
+            "key",
+            sa.String(length=255),
+            nullable=False,
+            comment="Identifier of the incremental harvest (job)",
+        ),
+        sa.Column(
+            "datestamp",
+            sa.String(length=32),
+            nullable=True,
+            comment="OAI-PMH response date of the last processed harvest",
+        ),
+        sa.Column(
+            "pending_datestamp",
+            sa.String(length=32),
+            nullable=True,
+            comment="OAI-PMH response date of the harvest being processed",
+        ),
+        sa.Column(
+            "pending_run_id",
+            sqlalchemy_utils.types.uuid.UUIDType(),
+            nullable=True,
+            comment="Job run that must succeed to commit the pending datestamp",
+        ),
+        sa.Column("created", UTCDateTime(), nullable=False),
+        sa.Column("updated", UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key", name=op.f("pk_cds_inspire_harvester_datestamp")),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_table("cds_inspire_harvester_datestamp")
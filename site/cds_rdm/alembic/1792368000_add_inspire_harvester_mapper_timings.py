@@ -0,0 +1,39 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add mapper timings to the INSPIRE harvester run stats table."""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1792368000"
+down_revision = "1792281600"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "cds_inspire_harvester_run_stats",
+        sa.Column(
+            "mapper_timings",
+            sa.JSON().with_variant(
+                postgresql.JSONB(none_as_null=True),
+                "postgresql",
+            ),
+            nullable=True,
+            comment="Calls and seconds spent per mapper and resource type.",
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("cds_inspire_harvester_run_stats", "mapper_timings")
@@ -0,0 +1,39 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add vocabulary cache stats to the INSPIRE harvester run stats table."""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "1792454400"
+down_revision = "1792368000"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "cds_inspire_harvester_run_stats",
+        sa.Column(
+            "vocabulary_cache",
+            sa.JSON().with_variant(
+                postgresql.JSONB(none_as_null=True),
+                "postgresql",
+            ),
+            nullable=True,
+            comment="Vocabulary cache hits and misses per vocabulary type.",
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("cds_inspire_harvester_run_stats", "vocabulary_cache")
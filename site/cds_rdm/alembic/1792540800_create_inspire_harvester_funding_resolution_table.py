@@ -0,0 +1,91 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Create INSPIRE harvester funding resolution table."""
+
+import sqlalchemy as sa
+from alembic import op
+from invenio_db.shared import UTCDateTime
+
+# revision identifiers, used by Alembic.
+revision = "1792540800"
+down_revision = "1792454400"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.create_table(
+        "cds_inspire_harvester_funding_resolution",
+        sa.Column(
+            "agency",
+            sa.Text(),
+            nullable=False,
+            comment="Normalized INSPIRE agency, empty if none",
+        ),
+        sa.Column(
+            "grant_number",
+            sa.Text(),
+            nullable=False,
+            comment="INSPIRE grant or project number, empty if none",
+        ),
+        sa.Column(
+            "funder_id",
+            sa.String(length=255),
+            nullable=True,
+            comment="The resolved funder, if any",
+        ),
+        sa.Column(
+            "award_id",
+            sa.String(length=255),
+            nullable=True,
+            comment="The resolved award, if any",
+        ),
+        sa.Column("created", UTCDateTime(), nullable=False),
+        sa.Column("updated", UTCDateTime(), nullable=False),
+        sa.PrimaryKeyConstraint(
+            "agency",
+            "grant_number",
+            name=op.f("pk_cds_inspire_harvester_funding_resolution"),
+        ),
+    )
+    op.create_index(
+        op.f("ix_cds_inspire_harvester_funding_resolution_grant_number"),
+        "cds_inspire_harvester_funding_resolution",
+        ["grant_number"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_cds_inspire_harvester_funding_resolution_funder_id"),
+        "cds_inspire_harvester_funding_resolution",
+        ["funder_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_cds_inspire_harvester_funding_resolution_award_id"),
+        "cds_inspire_harvester_funding_resolution",
+        ["award_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_index(
+        op.f("ix_cds_inspire_harvester_funding_resolution_award_id"),
+        table_name="cds_inspire_harvester_funding_resolution",
+    )
+    op.drop_index(
+        op.f("ix_cds_inspire_harvester_funding_resolution_funder_id"),
+        table_name="cds_inspire_harvester_funding_resolution",
+    )
+    op.drop_index(
+        op.f("ix_cds_inspire_harvester_funding_resolution_grant_number"),
+        table_name="cds_inspire_harvester_funding_resolution",
+    )
+    op.drop_table("cds_inspire_harvester_funding_resolution")
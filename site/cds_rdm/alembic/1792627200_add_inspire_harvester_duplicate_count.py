@@ -0,0 +1,36 @@
+#
+# This file is part of Invenio.
+# Copyright (C) 2026 CERN.
+#
+# Invenio is free software; you can redistribute it and/or modify it
+# under the terms of the MIT License; see LICENSE file for more details.
+
+"""Add the duplicate count to the INSPIRE harvester run stats table."""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1792627200"
+down_revision = "1792540800"
+branch_labels = ()
+depends_on = None
+
+
+def upgrade():
+    """Upgrade database."""
+    op.add_column(
+        "cds_inspire_harvester_run_stats",
+        sa.Column(
+            "duplicate_count",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+            comment="Number of records dropped as repeated across result pages.",
+        ),
+    )
+
+
+def downgrade():
+    """Downgrade database."""
+    op.drop_column("cds_inspire_harvester_run_stats", "duplicate_count")
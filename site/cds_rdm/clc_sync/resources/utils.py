@@ -7,9 +7,10 @@
 
 """CDS-RDM CLC Sync Resource utils."""
 
-from flask import current_app, g
+from flask import g
 
 from cds_rdm.clc_sync.proxies import current_clc_sync_service
+from cds_rdm.config_lookups import current_config_lookups
 
 
 def get_clc_sync_entry(record):
@@ -18,12 +19,8 @@ def get_clc_sync_entry(record):
     :param record: The record to get the CLC sync entry for.
     :return: The CLC sync entry.
     """
-    allowed_resource_types = current_app.config["CLC_SYNC_ALLOWED_RESOURCE_TYPES"]
     resource_type = record["metadata"]["resource_type"]["id"]
-    if not any(
-        resource_type.startswith(allowed_resource_type)
-        for allowed_resource_type in allowed_resource_types
-    ):
+    if not current_config_lookups.is_clc_sync_allowed(resource_type):
         return None
     try:
         clc_sync_entry = current_clc_sync_service.read(
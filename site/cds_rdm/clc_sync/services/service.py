@@ -11,11 +11,12 @@ import distutils.util
 
 import arrow
 import requests
-from flask import current_app
 from invenio_db.uow import unit_of_work
 from invenio_records_resources.services import RecordService
 from sqlalchemy.exc import IntegrityError
 
+from cds_rdm.config_lookups import current_config_lookups
+
 from ..models import SyncStatusEnum
 from .errors import CLCSyncAlreadyExistsError
 from .utils import clc_import
@@ -47,10 +48,7 @@ class CLCSyncService(RecordService):
         if not record_data or not auto_sync:
             return  # Skip
         resource = record_data["metadata"]["resource_type"]["id"]
-        if not any(
-            resource.startswith(allowed)
-            for allowed in current_app.config["CLC_SYNC_ALLOWED_RESOURCE_TYPES"]
-        ):
+        if not current_config_lookups.is_clc_sync_allowed(resource):
             data["message"] = f"Resource type {resource} not allowed to sync."
             data["status"] = SyncStatusEnum.FAILED
             return
@@ -21,6 +21,7 @@ from invenio_rdm_records.services.errors import ValidationErrorWithMessageAsList
 from invenio_records_resources.services.uow import TaskOp
 from marshmallow import ValidationError
 
+from .config_lookups import current_config_lookups
 from .tasks import (
     sync_alternate_identifiers,  # submit_community_inclusion_request temporarily disabled
 )
@@ -148,20 +149,6 @@ class CommitteeApprovalComponent(ServiceComponent):
             ActionNeed("superuser-access")
         ).allows(identity)
 
-    def _committee_approval_prefixes(self):
-        """Return the set of fixed prefixes from all configured committee communities.
-
-        E.g. config ``{"prefix": "CERN-EP"}`` → prefix ``"CERN-EP"``.
-        Used to detect cdsrn values that collide with committee report numbers.
-        """
-        communities = current_app.config.get("CDS_COMMITTEE_APPROVAL_COMMUNITIES", {})
-        prefixes = set()
-        for cfg in communities.values():
-            prefix = cfg.get("report_number", {}).get("prefix")
-            if prefix:
-                prefixes.add(prefix)
-        return prefixes
-
     def _validate_identifier_changes(self, identity, data, record):
         """Raise ValidationError if the user is modifying protected identifiers."""
         if self._is_privileged(identity):
@@ -204,13 +191,12 @@ class CommitteeApprovalComponent(ServiceComponent):
             raise ValidationErrorWithMessageAsList(errors)
 
         # Block cdsrn values that look like committee report numbers.
-        ep_prefixes = self._committee_approval_prefixes()
-        if ep_prefixes:
+        if current_config_lookups.committee_approval_prefixes:
             errors = []
             for index, ident in enumerate(incoming_identifiers):
                 if ident.get("scheme") == "cdsrn":
                     val = ident.get("identifier", "")
-                    if any(val.startswith(p) for p in ep_prefixes):
+                    if current_config_lookups.has_committee_approval_prefix(val):
                         errors.append(
                             {
                                 "field": f"metadata.identifiers.{index}.identifier",
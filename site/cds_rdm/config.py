@@ -64,3 +64,70 @@ first version (if the community settings require it).
 
 This only applies to records where the specified community is their parent's default community.
 """
+
+INSPIRE_HARVESTER_PREFETCH_PAGES = 2
+"""Number of INSPIRE result pages fetched ahead by harvester job runs (0 disables it)."""
+
+INSPIRE_HARVESTER_CAPTURE_DIR = None
+"""Directory where harvester job runs capture the fetched INSPIRE pages, for offline replay.
+
+Each run writes to its own sub-directory. Capturing is disabled when not set.
+"""
+
+INSPIRE_HARVESTER_STREAM_PAGES = False
+"""Decode INSPIRE result pages incrementally in harvester job runs, to keep memory flat on large pages.
+
+Requires the ``ijson`` extra. Page prefetching is not used when enabled.
+"""
+
+INSPIRE_HARVESTER_PROJECT_FIELDS = False
+"""Only request the INSPIRE metadata fields read by the harvester mappers in job runs."""
+
+INSPIRE_HARVESTER_ADAPTIVE_PAGE_SIZE = False
+"""Adapt the INSPIRE page size to the observed response time and size in harvester job runs."""
+
+INSPIRE_HARVESTER_SKIP_UNCHANGED = False
+"""Skip INSPIRE records whose mapped metadata did not change since they were last written successfully.
+
+The hash of the mapped INSPIRE metadata of each written record is stored, and
+compared when the record is read again. Skipped records are counted in the run report.
+"""
+
+INSPIRE_HARVESTER_RETRIES = 5
+"""Number of retries of INSPIRE requests failing with a transient error (connection error, 429, 5xx)."""
+
+INSPIRE_HARVESTER_RETRY_BACKOFF = 2
+"""Seconds to wait before the first retry of an INSPIRE request, doubled on each following one (with jitter).
+
+A ``Retry-After`` header sent by INSPIRE takes precedence.
+"""
+
+INSPIRE_HARVESTER_RATE_LIMIT = None
+"""Maximum number of INSPIRE requests per second sent by each worker process (no limit when not set)."""
+
+INSPIRE_HARVESTER_OAI_URL = "https://inspirehep.net/api/oai2d"
+"""OAI-PMH endpoint listing the INSPIRE records changed since the last incremental harvest."""
+
+INSPIRE_HARVESTER_TRANSFORM_WORKERS = 0
+"""Number of processes transforming INSPIRE records in parallel in harvester job runs (0 transforms them in the run process).
+
+Each process runs its own application. The Celery worker running the harvest
+must be allowed to start child processes.
+"""
+
+INSPIRE_HARVESTER_VOCABULARY_CACHE_SIZE = 2000
+"""Maximum number of vocabulary lookups cached by each harvester process, per vocabulary type (0 disables the cache).
+
+Lookups of terms not found in the vocabulary are cached too. The cached lookups
+of a vocabulary type are dropped when one of its entries changes in the process.
+"""
+
+INSPIRE_HARVESTER_VOCABULARY_CACHE_TTL = 3600
+"""Seconds a vocabulary lookup stays cached, which bounds how long changes made by other processes go unnoticed."""
+
+INSPIRE_HARVESTER_VOCABULARY_INDEX_TYPES = ["accelerators", "experiments"]
+"""Small vocabularies whose ids and aliases are loaded in memory by each harvester process, and matched without searching.
+
+An index is loaded again when one of its entries changes in the process, or
+after ``INSPIRE_HARVESTER_VOCABULARY_CACHE_TTL`` seconds.
+"""
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it
+# under the terms of the GPL-2.0 License; see LICENSE file for more details.
+
+"""Lookup structures derived from the application config."""
+
+import re
+
+from flask import current_app
+from werkzeug.local import LocalProxy
+
+
+class ConfigLookups:
+    """Lookup structures derived from config values, built once per application.
+
+    A structure is rebuilt when the config value it derives from is replaced
+    (e.g. on config reload) or changes size (e.g. a community enrolled at
+    runtime). ``clear`` drops them all after other in-place changes.
+    """
+
+    def __init__(self, app):
+        """Constructor."""
+        self.app = app
+        self._lookups = {}
+
+    def clear(self):
+        """Drop the structures, they are rebuilt on next use."""
+        self._lookups.clear()
+
+    def _get(self, config_key, default, build):
+        """Return the structure built from a config value, cached."""
+        value = self.app.config.get(config_key, default)
+        cached = self._lookups.get(config_key)
+        if cached is None or cached[0] is not value or cached[1] != len(value):
+            # the value is kept, its id is not reused while cached
+            cached = (value, len(value), build(value))
+            self._lookups[config_key] = cached
+        return cached[2]
+
+    @staticmethod
+    def _build_committee_approval(communities):
+        """Return the committee report-number prefixes and their pattern."""
+        prefixes = frozenset(
+            cfg.get("report_number", {}).get("prefix")
+            for cfg in communities.values()
+            if cfg.get("report_number", {}).get("prefix")
+        )
+        pattern = None
+        if prefixes:
+            alternation = "|".join(re.escape(p) for p in sorted(prefixes))
+            # Prefix then a digit (the year), not another word like DRAFT.
+            pattern = re.compile(rf"(?:{alternation})-\d")
+        return prefixes, tuple(prefixes), pattern
+
+    def _committee_approval(self):
+        """Return the committee report-number prefixes and their pattern."""
+        return self._get(
+            "CDS_COMMITTEE_APPROVAL_COMMUNITIES",
+            {},
+            self._build_committee_approval,
+        )
+
+    @property
+    def committee_approval_prefixes(self):
+        """Report-number prefixes of the committee approval communities."""
+        return self._committee_approval()[0]
+
+    def has_committee_approval_prefix(self, value):
+        """Return True if the value starts with a committee report-number prefix."""
+        _, prefixes, _ = self._committee_approval()
+        return value.startswith(prefixes)
+
+    def matches_committee_report_number(self, value):
+        """Return True if the value is a committee prefix followed by the year."""
+        _, _, pattern = self._committee_approval()
+        return pattern is not None and pattern.match(value) is not None
+
+    def is_clc_sync_allowed(self, resource_type):
+        """Return True if records of the resource type can be synced with CLC."""
+        allowed = self._get("CLC_SYNC_ALLOWED_RESOURCE_TYPES", [], tuple)
+        return resource_type.startswith(allowed)
+
+
+current_config_lookups = LocalProxy(
+    lambda: current_app.extensions["cds-rdm"].config_lookups
+)
+"""Proxy for the config lookups of the current application."""
@@ -7,6 +7,12 @@
 
 """CDS-RDM module."""
 
+from invenio_records.signals import (
+    after_record_delete,
+    after_record_insert,
+    after_record_update,
+)
+
 from cds_rdm.clc_sync.resources.config import CLCSyncResourceConfig
 from cds_rdm.clc_sync.resources.resource import CLCSyncResource
 from cds_rdm.clc_sync.resources.utils import get_clc_sync_entry
@@ -16,9 +22,14 @@ from cds_rdm.inspire_harvester.reports.download.resources import (
     HarvesterDownloadResource,
     HarvesterDownloadResourceConfig,
 )
+from cds_rdm.inspire_harvester.transform.mappers.funding import (
+    clear_funding_resolutions,
+)
+from cds_rdm.inspire_harvester.transform.vocabularies import clear_vocabulary_cache
 from cds_rdm.requests.committee_approval_state import get_committee_approval_state
 
 from . import config
+from .config_lookups import ConfigLookups
 from .utils import evaluate_permissions
 from .views import get_linked_records_search_query
 
@@ -39,6 +50,7 @@ class CDS_RDM_App(object):
 
     def init_app(self, app):
         """Flask application initialization."""
+        self.config_lookups = ConfigLookups(app)
         self.init_services(app)
         self.init_resources(app)
         app.jinja_env.globals["get_clc_sync_entry"] = get_clc_sync_entry
@@ -50,8 +62,15 @@ class CDS_RDM_App(object):
         app.jinja_env.filters["get_linked_records_search_query"] = (
             get_linked_records_search_query
         )
+        self.init_signals(app)
         return app
 
+    def init_signals(self, app):
+        """Connect the signal receivers."""
+        for signal in (after_record_insert, after_record_update, after_record_delete):
+            signal.connect(clear_vocabulary_cache)
+            signal.connect(clear_funding_resolutions)
+
     def init_services(self, app):
         """Initialize the services for banners."""
         self.clc_sync_service = CLCSyncService(config=CLCSyncServiceConfig)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE harvester data stream."""
+
+from flask import current_app
+from invenio_jobs.errors import TaskExecutionPartialError
+from invenio_vocabularies.datastreams import DataStream
+from invenio_vocabularies.datastreams.factories import (
+    ReaderFactory,
+    TransformerFactory,
+    WriterFactory,
+)
+
+from .transform.mappers.funding import (
+    current_funding_resolutions,
+    resolve_funding_entries,
+)
+from .transform.vocabularies import (
+    collect_vocabulary_terms,
+    current_vocabulary_terms,
+    resolve_vocabulary_terms,
+)
+
+
+class InspireDataStream(DataStream):
+    """Data stream preparing the transformation of each batch at once.
+
+    The vocabulary terms and funding entries looked up by the mappers are
+    resolved for the whole batch before it is transformed. A single transformer with an
+    ``apply_many`` method (see ``InspirePoolTransformer``) transforms all
+    entries of a batch before they are processed one by one as usual.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Constructor."""
+        super().__init__(*args, **kwargs)
+        self._transformed = {}
+
+    @classmethod
+    def create(cls, config):
+        """Create a data stream from a ``process_datastream`` config."""
+        return cls(
+            readers=[ReaderFactory.create(c) for c in config["readers"]],
+            writers=[WriterFactory.create(c) for c in config["writers"]],
+            transformers=[
+                TransformerFactory.create(c) for c in config.get("transformers") or []
+            ],
+            batch_size=config.get("batch_size", 1000),
+            run_subtasks=config.get("run_subtasks", True),
+            write_many=config.get("write_many", False),
+        )
+
+    def _batch_transformer(self):
+        """Return the transformer applied to whole batches, if any."""
+        if len(self._transformers) == 1 and hasattr(
+            self._transformers[0], "apply_many"
+        ):
+            return self._transformers[0]
+        return None
+
+    def _prefetch_vocabularies(self, src_records):
+        """Resolve the vocabulary terms looked up by the mappers for the records."""
+        terms = collect_vocabulary_terms(src_records)
+        resolved = resolve_vocabulary_terms(terms, current_app.logger)
+        current_app.logger.info(
+            f"Prefetched {len(resolved)} vocabulary terms of "
+            f"{sum(len(t) for t in terms.values())} for the batch."
+        )
+        return resolved
+
+    def process_batch(self, batch):
+        """Process a batch of entries."""
+        entries = [entry for entry in batch if not entry.errors]
+        src_records = [e.entry for e in entries if isinstance(e.entry, dict)]
+        vocabulary_terms = self._prefetch_vocabularies(src_records)
+        funding_resolutions = resolve_funding_entries(src_records, current_app.logger)
+        token = current_vocabulary_terms.set(vocabulary_terms)
+        funding_token = current_funding_resolutions.set(funding_resolutions)
+        try:
+            transformer = self._batch_transformer()
+            if transformer:
+                self._transformed = {
+                    id(entry): transformed
+                    for entry, transformed in zip(
+                        entries, transformer.apply_many(entries)
+                    )
+                }
+            yield from super().process_batch(batch)
+        finally:
+            self._transformed = {}
+            current_funding_resolutions.reset(funding_token)
+            current_vocabulary_terms.reset(token)
+
+    def transform(self, stream_entry, *args, **kwargs):
+        """Apply the transformations to an stream_entry, unless already done."""
+        transformed = self._transformed.pop(id(stream_entry), None)
+        if transformed is not None:
+            return transformed
+        return super().transform(stream_entry, *args, **kwargs)
+
+    def process(self, *args, **kwargs):
+        """Iterates over the entries, then releases the transformers."""
+        try:
+            yield from super().process(*args, **kwargs)
+        finally:
+            for transformer in self._transformers:
+                if hasattr(transformer, "close"):
+                    transformer.close()
+
+
+def process_inspire_datastream(config):
+    """Process an INSPIRE harvest data stream from config.
+
+    Same as ``process_datastream``, with an ``InspireDataStream``.
+    """
+    ds = InspireDataStream.create(config)
+    entries_with_errors = 0
+    for result in ds.process():
+        if result.errors:
+            current_app.logger.warning(
+                "Skipped entry with errors: %s",
+                result.errors,
+            )
+            entries_with_errors += 1
+
+    if entries_with_errors:
+        raise TaskExecutionPartialError(
+            message=f"Task execution partially succeeded with {entries_with_errors} entries with errors.",
+            errored_entries_count=entries_with_errors,
+        )
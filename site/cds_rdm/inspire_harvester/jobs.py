@@ -7,17 +7,27 @@
 
 """Jobs module."""
 
-from datetime import datetime
+import os
+from datetime import datetime, timezone
 
+from flask import current_app
 from invenio_i18n import gettext as _
 from invenio_jobs.jobs import PredefinedArgsSchema
 from invenio_vocabularies.jobs import ProcessDataStreamJob
-from marshmallow import ValidationError, fields, validate, validates_schema
+from marshmallow import (
+    ValidationError,
+    fields,
+    validate,
+    validates,
+    validates_schema,
+)
 
+from cds_rdm.inspire_harvester.tasks import process_inspire_harvest
 from cds_rdm.inspire_harvester.transform.resource_types import (
     ALL_DOCUMENT_TYPES,
     INSPIRE_DOCUMENT_TYPE_MAPPING,
 )
+from cds_rdm.inspire_harvester.utils import parse_inspire_ids
 
 DOCUMENT_TYPE_CHOICES = (
     ALL_DOCUMENT_TYPES,
@@ -52,7 +62,15 @@ class InspireArgsSchema(PredefinedArgsSchema):
         metadata={"description": _("YYYY-MM-DD format. Harvest by exact date.")},
     )
 
-    inspire_id = fields.String(allow_none=True)
+    inspire_id = fields.String(
+        allow_none=True,
+        metadata={
+            "description": _(
+                "One or several INSPIRE record IDs, separated by commas or spaces. "
+                "A list of IDs is harvested in a single run."
+            )
+        },
+    )
 
     document_type = fields.String(
         load_default=ALL_DOCUMENT_TYPES,
@@ -67,12 +85,63 @@ class InspireArgsSchema(PredefinedArgsSchema):
         },
     )
 
+    shard_days = fields.Integer(
+        allow_none=True,
+        validate=validate.Range(min=1),
+        metadata={
+            "title": _("Shard by days"),
+            "description": _(
+                "Split the date range into windows of this many days, harvested in parallel."
+            ),
+        },
+    )
+
+    shard_size = fields.Integer(
+        allow_none=True,
+        validate=validate.Range(min=1),
+        metadata={
+            "title": _("Shard by record count"),
+            "description": _(
+                "Split the date range into windows of about this many records, harvested in parallel."
+            ),
+        },
+    )
+
+    resume = fields.Boolean(
+        load_default=False,
+        metadata={
+            "title": _("Resume"),
+            "description": _(
+                "Continue an interrupted harvest with the same arguments from its last checkpoint."
+            ),
+        },
+    )
+
+    incremental = fields.Boolean(
+        load_default=False,
+        metadata={
+            "title": _("Incremental (OAI-PMH)"),
+            "description": _(
+                "Harvest the records changed since the last incremental run, listed through OAI-PMH. "
+                "'Since' is only used by the first incremental run."
+            ),
+        },
+    )
+
     job_arg_schema = fields.String(
         metadata={"type": "hidden"},
         dump_default="InspireArgsSchema",
         load_default="InspireArgsSchema",
     )
 
+    @validates("inspire_id")
+    def validate_inspire_id(self, value, **kwargs):
+        """Ensure that the INSPIRE ids are numeric."""
+        try:
+            parse_inspire_ids(value)
+        except ValueError as e:
+            raise ValidationError(str(e))
+
     @validates_schema
     def validate_date_range(self, data, **kwargs):
         """Ensure that since <= until."""
@@ -125,6 +194,40 @@ class InspireArgsSchema(PredefinedArgsSchema):
                 )
             )
 
+    @validates_schema
+    def validate_sharding(self, data, **kwargs):
+        """Ensures that sharding is only requested over a date range."""
+        shard_days = data.get("shard_days")
+        shard_size = data.get("shard_size")
+        if not (shard_days or shard_size):
+            return
+
+        if shard_days and shard_size:
+            raise ValidationError(
+                _("Please specify either 'Shard by days' or 'Shard by record count'.")
+            )
+        if data.get("inspire_id") or data.get("on_date") or not data.get("since"):
+            raise ValidationError(
+                _(
+                    "Sharding is only supported when harvesting a date range. "
+                    "Please specify the 'Since' parameter and no 'Inspire_id' or 'On' values."
+                )
+            )
+
+    @validates_schema
+    def validate_incremental(self, data, **kwargs):
+        """Ensures that incremental harvests are not restricted to ids or dates."""
+        if not data.get("incremental"):
+            return
+
+        restrictions = ("inspire_id", "on_date", "until", "shard_days", "shard_size")
+        if any(data.get(arg) for arg in restrictions):
+            raise ValidationError(
+                _(
+                    "Incremental harvests only support the 'Since' and 'Document type' parameters."
+                )
+            )
+
 
 class ProcessInspireHarvesterJob(ProcessDataStreamJob):
     """Process INSPIRE to CDS harvester registered task."""
@@ -133,6 +236,7 @@ class ProcessInspireHarvesterJob(ProcessDataStreamJob):
     title = "Inspire harvester"
     id = "process_inspire"
     arguments_schema = InspireArgsSchema
+    task = process_inspire_harvest
 
     @classmethod
     def build_task_arguments(
@@ -143,6 +247,10 @@ class ProcessInspireHarvesterJob(ProcessDataStreamJob):
         until=None,
         on_date=None,
         document_type=ALL_DOCUMENT_TYPES,
+        shard_days=None,
+        shard_size=None,
+        resume=False,
+        incremental=False,
         **kwargs,
     ):
         """Build task arguments."""
@@ -154,16 +262,69 @@ class ProcessInspireHarvesterJob(ProcessDataStreamJob):
             "on_date": on_date.isoformat() if on_date else None,
             "inspire_id": inspire_id,
             "document_type": document_type,
+            "resume": resume,
         }
         # validate args
-        InspireArgsSchema().load(data=reader_args)
+        InspireArgsSchema().load(
+            data={
+                **reader_args,
+                "shard_days": shard_days,
+                "shard_size": shard_size,
+                "incremental": incremental,
+            }
+        )
+        reader_args["prefetch_pages"] = current_app.config[
+            "INSPIRE_HARVESTER_PREFETCH_PAGES"
+        ]
+        reader_args["stream_pages"] = current_app.config[
+            "INSPIRE_HARVESTER_STREAM_PAGES"
+        ]
+        reader_args["project_fields"] = current_app.config[
+            "INSPIRE_HARVESTER_PROJECT_FIELDS"
+        ]
+        reader_args["adaptive_page_size"] = current_app.config[
+            "INSPIRE_HARVESTER_ADAPTIVE_PAGE_SIZE"
+        ]
+        # a list of ids is explicitly asked to be harvested again
+        reader_args["skip_unchanged"] = (
+            current_app.config["INSPIRE_HARVESTER_SKIP_UNCHANGED"] and not inspire_id
+        )
+        reader_args["retries"] = current_app.config["INSPIRE_HARVESTER_RETRIES"]
+        reader_args["retry_backoff"] = current_app.config[
+            "INSPIRE_HARVESTER_RETRY_BACKOFF"
+        ]
+        reader_args["rate_limit"] = current_app.config["INSPIRE_HARVESTER_RATE_LIMIT"]
+        batch_size = 100
+        reader_type = "inspire-http-reader"
+        if incremental:
+            reader_type = "inspire-oai-reader"
+            for arg in ("until", "on_date", "inspire_id", "resume"):
+                reader_args.pop(arg)
+            reader_args["origin"] = current_app.config["INSPIRE_HARVESTER_OAI_URL"]
+            reader_args["datestamp_key"] = str(job_obj.id)
+        else:
+            # checkpoint the reader position after each dispatched batch
+            reader_args["checkpoint_key"] = str(job_obj.id)
+            reader_args["checkpoint_every"] = batch_size
+        capture_dir = current_app.config["INSPIRE_HARVESTER_CAPTURE_DIR"]
+        if capture_dir:
+            run_dir = f"{job_obj.id}-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}"
+            reader_args["capture_dir"] = os.path.join(capture_dir, run_dir)
+
+        transformer = {"type": "inspire-json-transformer"}
+        transform_workers = current_app.config["INSPIRE_HARVESTER_TRANSFORM_WORKERS"]
+        if transform_workers:
+            transformer = {
+                "type": "inspire-pool-transformer",
+                "args": {"transformer": transformer, "workers": transform_workers},
+            }
 
-        return {
+        task_arguments = {
             "config": {
                 "readers": [
                     {
                         "args": reader_args,
-                        "type": "inspire-http-reader",
+                        "type": reader_type,
                     },
                 ],
                 "writers": [
@@ -176,8 +337,11 @@ class ProcessInspireHarvesterJob(ProcessDataStreamJob):
                         },
                     }
                 ],
-                "batch_size": 100,
+                "batch_size": batch_size,
                 "write_many": False,
-                "transformers": [{"type": "inspire-json-transformer"}],
+                "transformers": [transformer],
             }
         }
+        if shard_days or shard_size:
+            task_arguments["sharding"] = {"days": shard_days, "size": shard_size}
+        return task_arguments
@@ -0,0 +1,432 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE harvester models."""
+
+import enum
+
+from invenio_db import db
+from invenio_db.shared import Timestamp
+from sqlalchemy import or_, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy_utils import ChoiceType
+from sqlalchemy_utils.types import UUIDType
+
+from cds_rdm.inspire_harvester.transform.timing import merge_timings
+from cds_rdm.inspire_harvester.transform.vocabularies import merge_cache_stats
+from cds_rdm.inspire_harvester.utils import chunked
+
+
+class InspireHarvesterCheckpoint(db.Model, Timestamp):
+    """Reader position of an INSPIRE harvest, used to resume interrupted runs."""
+
+    __tablename__ = "cds_inspire_harvester_checkpoint"
+
+    key = db.Column(
+        db.String(255),
+        primary_key=True,
+        comment="Identifier of the harvest (job and date window)",
+    )
+
+    query_url = db.Column(
+        db.Text,
+        nullable=False,
+        comment="First page URL of the harvest query",
+    )
+
+    url = db.Column(
+        db.Text,
+        nullable=False,
+        comment="URL of the page to resume from",
+    )
+
+    skip = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        comment="Number of hits of the page already processed",
+    )
+
+    @classmethod
+    def get(cls, key):
+        """Get the checkpoint of a harvest, or None."""
+        return db.session.get(cls, key)
+
+    @classmethod
+    def save(cls, key, query_url, url, skip):
+        """Create or update the checkpoint of a harvest."""
+        with db.session.begin_nested():
+            checkpoint = db.session.get(cls, key)
+            if checkpoint is None:
+                checkpoint = cls(key=key)
+                db.session.add(checkpoint)
+            checkpoint.query_url = query_url
+            checkpoint.url = url
+            checkpoint.skip = skip
+
+        return checkpoint
+
+    @classmethod
+    def delete(cls, key):
+        """Delete the checkpoint of a harvest, if any."""
+        with db.session.begin_nested():
+            db.session.query(cls).filter_by(key=key).delete()
+
+
+class SourceHashOutcomeEnum(enum.Enum):
+    """Outcome of the last write of an INSPIRE record."""
+
+    SUCCESS = "S"
+    FAILED = "F"
+
+
+class InspireHarvesterSourceHash(db.Model, Timestamp):
+    """Hash of the mapped INSPIRE source of the last written record version."""
+
+    __tablename__ = "cds_inspire_harvester_source_hash"
+
+    inspire_id = db.Column(
+        db.String(255),
+        primary_key=True,
+        comment="The record id in INSPIRE",
+    )
+
+    source_hash = db.Column(
+        db.String(64),
+        nullable=False,
+        comment="Hash of the INSPIRE metadata read by the mappers",
+    )
+
+    outcome = db.Column(
+        ChoiceType(SourceHashOutcomeEnum, impl=db.String(1)),
+        nullable=False,
+        comment="Outcome of the last write",
+    )
+
+    record_pid = db.Column(
+        db.String(255),
+        nullable=True,
+        comment="The record id in CDS",
+    )
+
+    @classmethod
+    def is_unchanged(cls, inspire_id, source_hash):
+        """Check if the record was successfully written with the same source."""
+        entry = db.session.get(cls, str(inspire_id))
+        return (
+            entry is not None
+            and entry.source_hash == source_hash
+            and entry.outcome == SourceHashOutcomeEnum.SUCCESS
+        )
+
+    @classmethod
+    def save(cls, inspire_id, source_hash, outcome, record_pid=None):
+        """Create or update the source hash of a record."""
+        with db.session.begin_nested():
+            entry = db.session.get(cls, str(inspire_id))
+            if entry is None:
+                entry = cls(inspire_id=str(inspire_id))
+                db.session.add(entry)
+            entry.source_hash = source_hash
+            entry.outcome = outcome
+            if record_pid:
+                entry.record_pid = record_pid
+
+        return entry
+
+
+class InspireHarvesterDatestamp(db.Model, Timestamp):
+    """OAI-PMH datestamp of the last complete incremental INSPIRE harvest."""
+
+    __tablename__ = "cds_inspire_harvester_datestamp"
+
+    key = db.Column(
+        db.String(255),
+        primary_key=True,
+        comment="Identifier of the incremental harvest (job)",
+    )
+
+    datestamp = db.Column(
+        db.String(32),
+        nullable=True,
+        comment="OAI-PMH response date of the last processed harvest",
+    )
+
+    pending_datestamp = db.Column(
+        db.String(32),
+        nullable=True,
+        comment="OAI-PMH response date of the harvest being processed",
+    )
+
+    pending_run_id = db.Column(
+        UUIDType,
+        nullable=True,
+        comment="Job run that must succeed to commit the pending datestamp",
+    )
+
+    @classmethod
+    def get_datestamp(cls, key):
+        """Get the datestamp to harvest from, or None."""
+        entry = db.session.get(cls, key)
+        return entry.datestamp if entry else None
+
+    @classmethod
+    def save_pending(cls, key, datestamp):
+        """Store the datestamp of a harvest until its records are processed."""
+        with db.session.begin_nested():
+            entry = db.session.get(cls, key)
+            if entry is None:
+                entry = cls(key=key)
+                db.session.add(entry)
+            entry.pending_datestamp = datestamp
+            entry.pending_run_id = None
+
+        return entry
+
+    @classmethod
+    def get_pending_run_id(cls, key):
+        """Get the job run that processed the pending datestamp, or None."""
+        entry = db.session.get(cls, key)
+        return entry.pending_run_id if entry else None
+
+    @classmethod
+    def set_pending_run_id(cls, key, run_id):
+        """Store the job run whose writes must succeed to commit the datestamp."""
+        with db.session.begin_nested():
+            entry = db.session.get(cls, key)
+            if entry is None or entry.pending_datestamp is None:
+                return
+            entry.pending_run_id = run_id
+
+    @classmethod
+    def commit_pending(cls, key):
+        """Make the datestamp of a processed harvest the start of the next one."""
+        with db.session.begin_nested():
+            entry = db.session.get(cls, key)
+            if entry is None or entry.pending_datestamp is None:
+                return
+            entry.datestamp = entry.pending_datestamp
+            entry.pending_datestamp = None
+            entry.pending_run_id = None
+
+
+class InspireHarvesterRunStats(db.Model, Timestamp):
+    """Statistics of an INSPIRE harvester run, shown in its report."""
+
+    __tablename__ = "cds_inspire_harvester_run_stats"
+
+    run_id = db.Column(
+        UUIDType,
+        primary_key=True,
+        comment="The harvester job run",
+    )
+
+    mapper_timings = db.Column(
+        db.JSON().with_variant(
+            postgresql.JSONB(none_as_null=True),
+            "postgresql",
+        ),
+        default=lambda: dict(),
+        nullable=True,
+        comment="Calls and seconds spent per mapper and resource type.",
+    )
+
+    vocabulary_cache = db.Column(
+        db.JSON().with_variant(
+            postgresql.JSONB(none_as_null=True),
+            "postgresql",
+        ),
+        default=lambda: dict(),
+        nullable=True,
+        comment="Vocabulary cache hits and misses per vocabulary type.",
+    )
+
+    skipped_count = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        comment="Number of records skipped as unchanged.",
+    )
+
+    duplicate_count = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0,
+        comment="Number of records dropped as repeated across result pages.",
+    )
+
+    @classmethod
+    def add_mapper_timings(cls, run_id, timings):
+        """Add the mapper timings of a harvest to the ones of its run."""
+        with db.session.begin_nested():
+            stats = (
+                db.session.query(cls).filter_by(run_id=run_id).with_for_update().first()
+            )
+            if stats is None:
+                stats = cls(run_id=run_id, mapper_timings={})
+                db.session.add(stats)
+            stats.mapper_timings = merge_timings(stats.mapper_timings or {}, timings)
+
+        return stats
+
+    @classmethod
+    def get_mapper_timings(cls, run_id):
+        """Get the mapper timings of a run."""
+        stats = db.session.get(cls, run_id)
+        return stats.mapper_timings if stats and stats.mapper_timings else {}
+
+    @classmethod
+    def add_vocabulary_cache_stats(cls, run_id, cache_stats):
+        """Add the vocabulary cache counts of a harvest to the ones of its run."""
+        with db.session.begin_nested():
+            stats = (
+                db.session.query(cls).filter_by(run_id=run_id).with_for_update().first()
+            )
+            if stats is None:
+                stats = cls(run_id=run_id, vocabulary_cache={})
+                db.session.add(stats)
+            stats.vocabulary_cache = merge_cache_stats(
+                stats.vocabulary_cache or {}, cache_stats
+            )
+
+        return stats
+
+    @classmethod
+    def get_vocabulary_cache_stats(cls, run_id):
+        """Get the vocabulary cache hits and misses of a run."""
+        stats = db.session.get(cls, run_id)
+        return stats.vocabulary_cache if stats and stats.vocabulary_cache else {}
+
+    @classmethod
+    def add_skipped_count(cls, run_id, count):
+        """Add the unchanged records skipped by a harvest to the ones of its run."""
+        with db.session.begin_nested():
+            stats = (
+                db.session.query(cls).filter_by(run_id=run_id).with_for_update().first()
+            )
+            if stats is None:
+                stats = cls(run_id=run_id, skipped_count=0)
+                db.session.add(stats)
+            stats.skipped_count = (stats.skipped_count or 0) + count
+
+        return stats
+
+    @classmethod
+    def get_skipped_count(cls, run_id):
+        """Get the number of unchanged records skipped by a run."""
+        stats = db.session.get(cls, run_id)
+        return (stats.skipped_count or 0) if stats else 0
+
+    @classmethod
+    def add_duplicate_count(cls, run_id, count):
+        """Add the repeated records dropped by a harvest to the ones of its run."""
+        with db.session.begin_nested():
+            stats = (
+                db.session.query(cls).filter_by(run_id=run_id).with_for_update().first()
+            )
+            if stats is None:
+                stats = cls(run_id=run_id, skipped_count=0, duplicate_count=0)
+                db.session.add(stats)
+            stats.duplicate_count = (stats.duplicate_count or 0) + count
+
+        return stats
+
+    @classmethod
+    def get_duplicate_count(cls, run_id):
+        """Get the number of repeated records dropped by a run."""
+        stats = db.session.get(cls, run_id)
+        return (stats.duplicate_count or 0) if stats else 0
+
+
+class InspireHarvesterFundingResolution(db.Model, Timestamp):
+    """Funder and award resolved for an INSPIRE funding entry."""
+
+    __tablename__ = "cds_inspire_harvester_funding_resolution"
+
+    agency = db.Column(
+        db.Text,
+        primary_key=True,
+        comment="Normalized INSPIRE agency, empty if none",
+    )
+
+    grant_number = db.Column(
+        db.Text,
+        primary_key=True,
+        index=True,
+        comment="INSPIRE grant or project number, empty if none",
+    )
+
+    funder_id = db.Column(
+        db.String(255),
+        nullable=True,
+        index=True,
+        comment="The resolved funder, if any",
+    )
+
+    award_id = db.Column(
+        db.String(255),
+        nullable=True,
+        index=True,
+        comment="The resolved award, if any",
+    )
+
+    @classmethod
+    def get_many(cls, keys, chunk_size=500):
+        """Get the resolutions of ``(agency, grant_number)`` keys.
+
+        Returns ``{key: (funder_id, award_id)}`` for the resolved keys.
+        """
+        resolutions = {}
+        for chunk in chunked(list(keys), chunk_size):
+            rows = db.session.query(cls).filter(
+                tuple_(cls.agency, cls.grant_number).in_(chunk)
+            )
+            for row in rows:
+                resolutions[(row.agency, row.grant_number)] = (
+                    row.funder_id,
+                    row.award_id,
+                )
+        return resolutions
+
+    @classmethod
+    def save_many(cls, resolutions):
+        """Create or update the resolutions of ``(agency, grant_number)`` keys."""
+        with db.session.begin_nested():
+            for (agency, grant_number), (funder_id, award_id) in resolutions.items():
+                db.session.merge(
+                    cls(
+                        agency=agency,
+                        grant_number=grant_number,
+                        funder_id=funder_id,
+                        award_id=award_id,
+                    )
+                )
+
+    @classmethod
+    def invalidate_funder(cls, funder_id, agencies):
+        """Delete the resolutions a change of the funder may affect.
+
+        These are the ones pointing to it and the ones of the agencies matching
+        its names. Agencies only found by a fuzzy search are not covered.
+        """
+        condition = cls.funder_id == funder_id
+        if agencies:
+            condition = or_(condition, cls.agency.in_(agencies))
+        with db.session.begin_nested():
+            db.session.query(cls).filter(condition).delete(synchronize_session=False)
+
+    @classmethod
+    def invalidate_award(cls, award_id, grant_number):
+        """Delete the resolutions a change of the award may affect.
+
+        These are the ones pointing to it and the ones of its grant number.
+        """
+        condition = cls.award_id == award_id
+        if grant_number:
+            condition = or_(condition, cls.grant_number == grant_number)
+        with db.session.begin_nested():
+            db.session.query(cls).filter(condition).delete(synchronize_session=False)
@@ -6,14 +6,455 @@
 # the terms of the MIT License; see LICENSE file for more details.
 
 """Reader component."""
-from urllib.parse import urlencode
+import gzip
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
 
 import requests
 from flask import current_app
+from invenio_db import db
 from invenio_vocabularies.datastreams.errors import ReaderError
 from invenio_vocabularies.datastreams.readers import BaseReader
 
+from cds_rdm.inspire_harvester.models import (
+    InspireHarvesterCheckpoint,
+    InspireHarvesterDatestamp,
+    InspireHarvesterSourceHash,
+)
+from cds_rdm.inspire_harvester.transform.config import (
+    PIPELINE_SOURCE_FIELDS,
+    mapper_policy,
+)
 from cds_rdm.inspire_harvester.transform.resource_types import ALL_DOCUMENT_TYPES
+from cds_rdm.inspire_harvester.utils import (
+    chunked,
+    parse_inspire_ids,
+    read_inspire_ids,
+    source_hash,
+)
+
+# Extras dependencies
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# header set to include additional data (external file URLs and more detailed metadata
+INSPIRE_HEADERS = {"Accept": "application/vnd+inspire.record.expanded+json"}
+
+CAPTURE_FILE_SUFFIX = ".jsonl.gz"
+
+# OAI set of the INSPIRE records marked for CDS
+INSPIRE_OAI_SET = "ForCDS"
+
+INSPIRE_OAI_URL = "https://inspirehep.net/api/oai2d"
+OAI_NAMESPACE = {"oai": "http://www.openarchives.org/OAI/2.0/"}
+
+# transient INSPIRE responses, worth retrying
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# ids of the unchanged records skipped by the harvest being processed
+current_skipped_records = ContextVar("current_skipped_records", default=None)
+
+# times each INSPIRE id was dropped as a repeat by the harvest being processed
+current_duplicate_records = ContextVar("current_duplicate_records", default=None)
+
+
+def capture_records(path, records):
+    """Yields the records while writing them to a gzip compressed JSON Lines file.
+
+    The file only appears under ``path`` once all records have been consumed.
+    """
+    tmp_path = f"{path}.tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fp:
+        for record in records:
+            fp.write(json.dumps(record))
+            fp.write("\n")
+            yield record
+    # only complete files are picked up by the replay reader
+    os.replace(tmp_path, path)
+
+
+class StreamedPage:
+    """INSPIRE result page decoded incrementally from the response stream.
+
+    Hits are built one at a time, so the whole page is never held in memory.
+    ``total`` and ``next_url`` are only known once the hits have been consumed,
+    as they follow them in the response body.
+    """
+
+    HIT_PREFIX = "hits.hits.item"
+
+    def __init__(self, response):
+        """Constructor."""
+        # let urllib3 decompress the body
+        response.raw.decode_content = True
+        self._events = ijson.parse(response.raw, use_float=True)
+        self.total = None
+        self.next_url = None
+
+    def hits(self):
+        """Yields the hits of the page."""
+        builder = None
+        for prefix, event, value in self._events:
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == self.HIT_PREFIX and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif prefix == self.HIT_PREFIX and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix == "hits.total" and event == "number":
+                self.total = value
+            elif prefix == "links.next" and event == "string":
+                self.next_url = value
+
+    def consume(self):
+        """Reads the rest of the page, e.g. to get ``links.next``."""
+        for _ in self.hits():
+            pass
+
+
+class SeenIds:
+    """Compact set of numeric INSPIRE ids, backed by a bitmap.
+
+    One bit per control number: the ~3 million INSPIRE literature records fit
+    in less than 400 kB, whatever the number of records read.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._bits = bytearray()
+
+    def add(self, inspire_id):
+        """Adds the id, returns ``False`` if it was already in the set."""
+        index, bit = divmod(int(inspire_id), 8)
+        if index >= len(self._bits):
+            # grow geometrically, to keep appends amortized
+            self._bits.extend(bytes(max(index + 1 - len(self._bits), len(self._bits))))
+        mask = 1 << bit
+        if self._bits[index] & mask:
+            return False
+        self._bits[index] |= mask
+        return True
+
+
+def in_harvest_scope(metadata, document_type=ALL_DOCUMENT_TYPES):
+    """Checks if an INSPIRE record matches the filters of the harvest query."""
+    if INSPIRE_OAI_SET not in metadata.get("_oai", {}).get("sets", []):
+        return False
+    if document_type and document_type != ALL_DOCUMENT_TYPES:
+        return document_type in metadata.get("document_type", [])
+    return True
+
+
+def with_query_params(url, **params):
+    """Returns the URL with the given query parameters set."""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query, keep_blank_values=True)
+    query.update({key: [str(value)] for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+
+class TokenBucket:
+    """Client-side rate limit of ``rate`` requests per second.
+
+    Up to ``burst`` requests can be made at once, after which requests are
+    spread evenly. The bucket is thread safe, so it can be shared by the
+    prefetch threads and the readers of the same process.
+    """
+
+    def __init__(self, rate, burst=1):
+        """Constructor."""
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a request can be made."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+@lru_cache(maxsize=None)
+def rate_limiter(rate):
+    """Returns the token bucket of the process for the given rate."""
+    return TokenBucket(rate)
+
+
+def retry_after_seconds(response):
+    """Returns the delay asked by the ``Retry-After`` header, if any."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class RetryPolicy:
+    """Retries INSPIRE requests that fail with a transient error.
+
+    Connection errors, timeouts and the ``RETRY_STATUS_CODES`` responses are
+    retried up to ``retries`` times, waiting with an exponential backoff and
+    jitter, or for the delay given by the ``Retry-After`` header. When a
+    ``rate_limit`` is set, every attempt first takes a token of the bucket.
+    """
+
+    def __init__(
+        self,
+        retries=0,
+        backoff=1,
+        max_backoff=60,
+        rate_limit=None,
+        logger=None,
+    ):
+        """Constructor."""
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limit = rate_limit
+        self._logger = logger
+
+    def delay(self, attempt, response=None):
+        """Returns the seconds to wait before the given retry attempt."""
+        if response is not None:
+            retry_after = retry_after_seconds(response)
+            if retry_after is not None:
+                return retry_after
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+        return random.uniform(delay / 2, delay)
+
+    def get(self, get, url, **kwargs):
+        """Send the request with ``get``, retrying transient errors."""
+        attempt = 0
+        while True:
+            if self.rate_limit:
+                self.rate_limit.acquire()
+            try:
+                response = get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.retries:
+                    raise
+                reason, response = str(e), None
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.retries
+                ):
+                    return response
+                reason = f"status code {response.status_code}"
+                response.close()
+
+            delay = self.delay(attempt, response)
+            attempt += 1
+            if self._logger:
+                self._logger.warning(
+                    f"INSPIRE request failed ({reason}), retrying in {delay:.1f}s "
+                    f"(attempt {attempt} of {self.retries}). See URL: {url}."
+                )
+            time.sleep(delay)
+
+
+def build_retry_policy(retries=0, backoff=1, rate_limit=None):
+    """Returns the retry policy of the INSPIRE requests of a reader."""
+    return RetryPolicy(
+        retries=retries or 0,
+        backoff=backoff,
+        rate_limit=rate_limiter(rate_limit) if rate_limit else None,
+        logger=current_app.logger,
+    )
+
+
+class AdaptivePageSize:
+    """Adapts the page size of an INSPIRE query to the observed responses.
+
+    The size is halved when a page is slower than ``target_seconds`` or larger
+    than ``max_bytes``, and doubled when a page is well below both. Sizes only
+    change when the number of records already read is a multiple of the new
+    size, so that the page number keeps pointing at the next unread record.
+    """
+
+    def __init__(
+        self,
+        size=64,
+        min_size=8,
+        max_size=256,
+        target_seconds=5,
+        max_bytes=16 * 1024 * 1024,
+        logger=None,
+    ):
+        """Constructor."""
+        self.size = size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self._logger = logger
+
+    def _new_size(self, size, offset, seconds, nbytes):
+        """Returns the size of the next page."""
+        if seconds > self.target_seconds or nbytes > self.max_bytes:
+            new_size = max(size // 2, self.min_size)
+        elif seconds < self.target_seconds / 2 and nbytes < self.max_bytes / 2:
+            new_size = min(size * 2, self.max_size)
+        else:
+            return size
+        return new_size if offset % new_size == 0 else size
+
+    def next_url(self, url, next_url, seconds, nbytes):
+        """Returns the URL of the next page, resized after the page at ``url``."""
+        if not next_url:
+            return next_url
+        query = parse_qs(urlsplit(url).query)
+        page = int(query.get("page", [1])[0])
+        size = int(query.get("size", [self.size])[0])
+        offset = page * size
+
+        new_size = self._new_size(size, offset, seconds, nbytes)
+        if new_size == size:
+            return next_url
+        if self._logger:
+            self._logger.info(
+                f"Changing INSPIRE page size from {size} to {new_size} "
+                f"(last page: {seconds:.1f}s, {nbytes} bytes)."
+            )
+        return with_query_params(next_url, page=offset // new_size + 1, size=new_size)
+
+
+class PagePrefetcher:
+    """Fetch INSPIRE result pages ahead of the consumer on a background thread.
+
+    Pages are requested through a single keep-alive session and handed over
+    through a bounded queue, so at most ``size`` pages are held in memory while
+    the current one is transformed and written.
+    """
+
+    _SENTINEL = object()
+
+    def __init__(
+        self,
+        session,
+        url,
+        headers=INSPIRE_HEADERS,
+        size=1,
+        logger=None,
+        page_size=None,
+        retry_policy=None,
+    ):
+        """Constructor."""
+        self._session = session
+        self._page_size = page_size
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._headers = headers
+        self._logger = logger
+        self._queue = queue.Queue(maxsize=max(size, 1))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(url,), name="inspire-prefetch", daemon=True
+        )
+
+    def _put(self, item):
+        """Block until the item is queued or the prefetcher is closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, url):
+        """Fetch pages following ``links.next`` until exhausted or closed."""
+        while url and not self._stop.is_set():
+            if self._logger:
+                self._logger.info(f"Prefetching URL: {url}.")
+            try:
+                start = time.monotonic()
+                response = self._retry_policy.get(
+                    self._session.get, url, headers=self._headers
+                )
+                data = response.json() if response.status_code == 200 else None
+                seconds = time.monotonic() - start
+            except Exception as e:
+                self._put((url, None, e))
+                return
+            if not self._put((url, response, data)):
+                return
+            if response.status_code != 200:
+                return
+            next_url = data.get("links", {}).get("next")
+            if self._page_size:
+                next_url = self._page_size.next_url(
+                    url, next_url, seconds, len(response.content)
+                )
+            url = next_url
+        self._put(self._SENTINEL)
+
+    def __iter__(self):
+        """Yield ``(url, response, data)`` tuples in page order."""
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is self._SENTINEL:
+                    return
+                error = item[2]
+                if isinstance(error, Exception):
+                    raise error
+                yield item
+        finally:
+            self.close()
+
+    def _drain(self):
+        """Drop any page still queued."""
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+    def close(self):
+        """Stop the background thread and drop any page still queued.
+
+        Waits for the request in flight, if any, so that the session can be
+        closed once this returns.
+        """
+        self._stop.set()
+        self._drain()
+        if self._thread.is_alive():
+            self._thread.join()
+        # a page fetched while stopping
+        self._drain()
 
 
 class InspireHTTPReader(BaseReader):
@@ -28,61 +469,307 @@ class InspireHTTPReader(BaseReader):
         on_date=None,
         inspire_id=None,
         document_type=ALL_DOCUMENT_TYPES,
+        inspire_ids_file=None,
+        id_chunk_size=50,
+        prefetch_pages=0,
+        checkpoint_key=None,
+        checkpoint_every=0,
+        resume=False,
+        capture_dir=None,
+        stream_pages=False,
+        project_fields=False,
+        adaptive_page_size=False,
+        skip_unchanged=False,
+        retries=0,
+        retry_backoff=1,
+        rate_limit=None,
         *args,
         **kwargs,
     ):
-        """Constructor."""
+        """Constructor.
+
+        :param inspire_id: an INSPIRE id, or a list of ids given as a list or as
+            a comma or whitespace separated string.
+        :param inspire_ids_file: path of a text file listing the INSPIRE ids to
+            harvest, in addition to ``inspire_id``.
+        :param id_chunk_size: number of INSPIRE ids requested per query when
+            harvesting a list of ids.
+        :param prefetch_pages: number of result pages fetched ahead on a
+            background thread over a keep-alive session. ``0`` fetches pages
+            one at a time, after the previous page has been consumed.
+        :param checkpoint_key: when set, the reader position is persisted under
+            this key every ``checkpoint_every`` records, i.e. once the datastream
+            has processed the batch of records read so far. With an async writer
+            that is once their writes are dispatched, not done: a resumed
+            harvest does not retry the writes of the records before its
+            checkpoint, whose failures are reported on their own task runs.
+        :param resume: continue from the persisted checkpoint of the same query,
+            instead of starting from the first page.
+        :param capture_dir: when set, the hits of every fetched page are written
+            to a compressed JSON Lines file in this directory, to be read back by
+            the ``inspire-replay-reader``.
+        :param stream_pages: decode each page incrementally from the response
+            stream (requires the ``ijson`` extra), yielding hits without loading
+            the whole page in memory. Pages are then fetched one at a time,
+            regardless of ``prefetch_pages``.
+        :param project_fields: only request the INSPIRE metadata keys read by the
+            mappers of the mapper policy and the rest of the pipeline.
+        :param adaptive_page_size: adapt the page size to the observed response
+            time and size, instead of using the INSPIRE default size. Not used
+            with ``stream_pages``.
+        :param skip_unchanged: do not send to the transformer the records whose
+            mapped INSPIRE metadata has not changed since they were last written
+            successfully.
+        :param retries: number of times a request failing with a connection
+            error, a timeout or a transient status code (429, 5xx) is retried.
+        :param retry_backoff: seconds to wait before the first retry, doubled
+            on each following one. ``Retry-After`` headers take precedence.
+        :param rate_limit: maximum number of requests per second sent to
+            INSPIRE, shared by all the readers of the process.
+        """
         self._since = since
         self._until = until
         self._on_date = on_date
-        self._inspire_id = inspire_id
+        self._inspire_ids = parse_inspire_ids(inspire_id)
+        if inspire_ids_file:
+            self._inspire_ids = list(
+                dict.fromkeys(self._inspire_ids + read_inspire_ids(inspire_ids_file))
+            )
+        self._id_chunk_size = id_chunk_size
+        self._read_count = 0
+        self._seen_ids = SeenIds()
+        self._duplicate_count = 0
         self._document_type = document_type
+        self._prefetch_pages = prefetch_pages or 0
+        self._checkpoint_key = checkpoint_key
+        self._checkpoint_every = checkpoint_every or 0
+        self._resume = resume
+        self._capture_dir = capture_dir
+        self._stream_pages = stream_pages
+        self._project_fields = project_fields
+        self._adaptive_page_size = adaptive_page_size
+        self._skip_unchanged = skip_unchanged
+        self._retries = retries or 0
+        self._retry_backoff = retry_backoff
+        self._rate_limit = rate_limit
+        if stream_pages and ijson is None:
+            raise ReaderError(
+                "Streaming INSPIRE pages requires the ijson package, "
+                "installed with the ijson extra."
+            )
 
         super().__init__(origin, mode, *args, **kwargs)
 
-    def _iter(self, url, *args, **kwargs):
-        """Yields HTTP response."""
-        # header set to include additional data (external file URLs and more detailed metadata
-        headers = {"Accept": "application/vnd+inspire.record.expanded+json"}
-        initial_url = url
+    def _page_size(self):
+        """Returns the page size adapter, if enabled."""
+        if not self._adaptive_page_size:
+            return None
+        return AdaptivePageSize(logger=current_app.logger)
+
+    def _retry_policy(self):
+        """Returns the retry policy of the reader requests."""
+        return build_retry_policy(self._retries, self._retry_backoff, self._rate_limit)
 
+    def _serial_pages(self, url):
+        """Yields ``(url, response, data)`` fetching each page on demand."""
+        page_size = self._page_size()
+        retry_policy = self._retry_policy()
         while url:  # Continue until there is no "next" link
             current_app.logger.info(f"Querying URL: {url}.")
-            response = requests.get(url, headers=headers)
+            start = time.monotonic()
+            response = retry_policy.get(requests.get, url, headers=INSPIRE_HEADERS)
+            if response.status_code != 200:
+                yield url, response, None
+                return
             data = response.json()
+            seconds = time.monotonic() - start
+            yield url, response, data
+            # Get the next page URL if available
+            next_url = data.get("links", {}).get("next")
+            if page_size:
+                next_url = page_size.next_url(
+                    url, next_url, seconds, len(response.content)
+                )
+            url = next_url
+
+    def _prefetched_pages(self, url):
+        """Yields ``(url, response, data)`` fetched ahead on a keep-alive session."""
+        with requests.Session() as session:
+            prefetcher = PagePrefetcher(
+                session,
+                url,
+                size=self._prefetch_pages,
+                logger=current_app.logger,
+                page_size=self._page_size(),
+                retry_policy=self._retry_policy(),
+            )
+            try:
+                yield from prefetcher
+            finally:
+                # the background request must not outlive the session
+                prefetcher.close()
+
+    def _streamed_pages(self, url):
+        """Yields ``(url, response, page)`` decoding each page while it is read."""
+        retry_policy = self._retry_policy()
+        with requests.Session() as session:
+            while url:
+                current_app.logger.info(f"Querying URL: {url}.")
+                response = retry_policy.get(
+                    session.get, url, headers=INSPIRE_HEADERS, stream=True
+                )
+                with response:
+                    if response.status_code != 200:
+                        yield url, response, None
+                        return
+                    page = StreamedPage(response)
+                    yield url, response, page
+                    page.consume()
+                url = page.next_url
+
+    def _pages(self, url):
+        """Yields the result pages of the query starting at ``url``."""
+        if self._stream_pages:
+            return self._streamed_pages(url)
+        if self._prefetch_pages > 0:
+            return self._prefetched_pages(url)
+        return self._serial_pages(url)
+
+    def _save_checkpoint(self, query_url, url, skip):
+        """Persists the reader position, committed right away to survive a crash."""
+        InspireHarvesterCheckpoint.save(self._checkpoint_key, query_url, url, skip)
+        db.session.commit()
+        current_app.logger.debug(f"Checkpoint saved at URL: {url} (skip {skip}).")
+
+    def _start_position(self, query_urls):
+        """Returns the query index, page URL and number of hits to start reading from."""
+        if not self._checkpoint_key:
+            return 0, query_urls[0], 0
+
+        checkpoint = InspireHarvesterCheckpoint.get(self._checkpoint_key)
+        if checkpoint is None:
+            return 0, query_urls[0], 0
+        if self._resume and checkpoint.query_url in query_urls:
+            current_app.logger.info(
+                f"Resuming harvest from checkpoint. URL: {checkpoint.url}, "
+                f"already processed hits on that page: {checkpoint.skip}."
+            )
+            index = query_urls.index(checkpoint.query_url)
+            return index, checkpoint.url, checkpoint.skip
+        if self._resume:
+            current_app.logger.warning(
+                "Checkpoint does not match the harvest query, starting from the first page."
+            )
+        InspireHarvesterCheckpoint.delete(self._checkpoint_key)
+        db.session.commit()
+        return 0, query_urls[0], 0
+
+    def _capture(self, query_url, page_number, hits):
+        """Yields the hits of a page while writing them to the capture directory."""
+        os.makedirs(self._capture_dir, exist_ok=True)
+        # prefix with the query, so that date windows can share a directory
+        query_hash = hashlib.sha1(query_url.encode("utf-8")).hexdigest()[:12]
+        path = os.path.join(
+            self._capture_dir, f"{query_hash}-{page_number:06d}{CAPTURE_FILE_SUFFIX}"
+        )
+        current_app.logger.debug(f"Capturing hits to {path}.")
+        return capture_records(path, hits)
+
+    def _log_total(self, url, initial_url, total):
+        """Logs the number of records found by the query."""
+        if total == 0:
+            current_app.logger.warning(
+                f"No results found when querying INSPIRE. See URL: {url}."
+            )
+        elif url == initial_url:
+            current_app.logger.info(f"Records found: {total}.")
+
+    def _is_unchanged(self, inspire_record):
+        """Checks if the record was already written from the same source."""
+        return InspireHarvesterSourceHash.is_unchanged(
+            inspire_record["id"], source_hash(inspire_record)
+        )
+
+    def _mark_duplicate(self, inspire_id):
+        """Records a repeated record dropped by the current harvest."""
+        self._duplicate_count += 1
+        duplicates = current_duplicate_records.get()
+        if duplicates is not None:
+            duplicates[str(inspire_id)] += 1
+
+    def _mark_skipped(self, inspire_ids):
+        """Records the unchanged records skipped by the current harvest."""
+        current_app.logger.info(
+            f"Skipped {len(inspire_ids)} unchanged INSPIRE records."
+        )
+        skipped = current_skipped_records.get()
+        if skipped is not None:
+            skipped.update(inspire_ids)
+
+    def _iter(self, url, skip=0, query_url=None, *args, **kwargs):
+        """Yields HTTP response."""
+        initial_url = url
+
+        for page_number, (url, response, data) in enumerate(self._pages(url)):
             if response.status_code == 200:
                 current_app.logger.debug("Request response is successful (200).")
-                total = data["hits"]["total"]
-                hits = data["hits"]["hits"]
+                streamed = isinstance(data, StreamedPage)
+                if streamed:
+                    hits = data.hits()
+                else:
+                    hits = data["hits"]["hits"]
+                    self._log_total(url, initial_url, data["hits"]["total"])
+                if self._capture_dir:
+                    hits = self._capture(query_url or initial_url, page_number, hits)
 
-                if total == 0:
-                    current_app.logger.warning(
-                        f"No results found when querying INSPIRE. See URL: {url}."
-                    )
-                elif url == initial_url:
-                    current_app.logger.info(f"Records found: {total}.")
-
-                for inspire_record in hits:
+                unchanged_ids = []
+                for position, inspire_record in enumerate(hits):
+                    if position < skip:
+                        continue
+                    if not self._seen_ids.add(inspire_record["id"]):
+                        # pages over a moving ``du`` window can repeat records
+                        self._mark_duplicate(inspire_record["id"])
+                        current_app.logger.debug(
+                            f"Dropping duplicated INSPIRE record #{inspire_record['id']}."
+                        )
+                        continue
+                    if self._skip_unchanged and self._is_unchanged(inspire_record):
+                        unchanged_ids.append(str(inspire_record["id"]))
+                        continue
                     current_app.logger.debug(
                         f"Sending INSPIRE record #{inspire_record['id']} to transformer."
                     )
                     yield inspire_record
+                    # the datastream asks for the next record only once the
+                    # current batch has been transformed and handed to its
+                    # writer; with the async writer, its writes are dispatched
+                    # to Celery and may still be pending or fail afterwards
+                    self._read_count += 1
+                    if (
+                        self._checkpoint_key
+                        and self._checkpoint_every
+                        and self._read_count % self._checkpoint_every == 0
+                    ):
+                        self._save_checkpoint(query_url or initial_url, url, position + 1)
+                if unchanged_ids:
+                    self._mark_skipped(unchanged_ids)
+                if streamed:
+                    self._log_total(url, initial_url, data.total)
+                skip = 0
             else:
                 error_message = f"Error occurred while getting JSON data from INSPIRE. See URL: {url}. Error message: {response.text}. Status code: {response.status_code}"
                 current_app.logger.error(error_message)
                 raise ReaderError(error_message)
 
-            # Get the next page URL if available
-            url = data.get("links", {}).get("next")
-
-    def read(self, item=None, *args, **kwargs):
-        """Builds a query depending on the input data."""
-        current_app.logger.info("Start reading data from INSPIRE.")
+    def _build_url(self, inspire_ids=None, **extra_params):
+        """Builds the search URL depending on the input data.
 
+        :param inspire_ids: the INSPIRE ids to query, by default all the ids
+            given to the reader.
+        """
+        inspire_ids = inspire_ids or self._inspire_ids
         # Fetch all document types marked for CDS via the OAI set
-        oai_set = "ForCDS"
-
-        q = f"_oai.sets:{oai_set}"
+        q = f"_oai.sets:{INSPIRE_OAI_SET}"
         if self._document_type and self._document_type != ALL_DOCUMENT_TYPES:
             q += f' AND document_type:"{self._document_type}"'
 
@@ -95,12 +782,18 @@ class InspireHTTPReader(BaseReader):
             f"Harvesting INSPIRE scope: {document_type_scope}."
         )
 
-        if self._inspire_id:
+        if len(inspire_ids) == 1:
             # get by INSPIRE id
             current_app.logger.info(
-                f"Fetching records by ID {self._inspire_id} from INSPIRE."
+                f"Fetching records by ID {inspire_ids[0]} from INSPIRE."
+            )
+            query_params = {"q": f"{q} AND id:{inspire_ids[0]}"}
+        elif inspire_ids:
+            # get by a list of INSPIRE ids
+            current_app.logger.info(
+                f"Fetching {len(inspire_ids)} records by ID from INSPIRE."
             )
-            query_params = {"q": f"{q} AND id:{self._inspire_id}"}
+            query_params = {"q": f"{q} AND id:({' OR '.join(inspire_ids)})"}
         elif self._on_date:
             # get by the exact date
             current_app.logger.info(
@@ -120,6 +813,7 @@ class InspireHTTPReader(BaseReader):
             )
             query_params = {"q": f"{q} AND du >= {self._since}"}
 
+        query_params.update(extra_params)
         base_url = "https://inspirehep.net/api/literature"
         encoded_query = urlencode(query_params)
         url = f"{base_url}?{encoded_query}"
@@ -127,4 +821,342 @@ class InspireHTTPReader(BaseReader):
         current_app.logger.info(
             f"Resulting query: {query_params['q']}. URL for harvesting data from INSPIRE: {url}."
         )
-        yield from self._iter(url=url, *args, **kwargs)
+        return url
+
+    def count(self):
+        """Returns the number of INSPIRE records matching the query.
+
+        Probes the search with a single-hit page, so only the total is
+        transferred.
+        """
+        url = self._build_url(size=1)
+        response = self._retry_policy().get(
+            requests.get, url, headers=INSPIRE_HEADERS
+        )
+        if response.status_code != 200:
+            error_message = f"Error occurred while counting INSPIRE records. See URL: {url}. Error message: {response.text}. Status code: {response.status_code}"
+            current_app.logger.error(error_message)
+            raise ReaderError(error_message)
+        return response.json()["hits"]["total"]
+
+    def _read_params(self):
+        """Returns the extra query parameters of the harvest query."""
+        params = {}
+        if self._project_fields:
+            fields = mapper_policy.source_fields() | set(PIPELINE_SOURCE_FIELDS)
+            params["fields"] = ",".join(sorted(fields))
+        if self._adaptive_page_size and not self._stream_pages:
+            params["size"] = AdaptivePageSize().size
+        return params
+
+    def _query_urls(self):
+        """Returns the URLs of the harvest queries, one per chunk of INSPIRE ids."""
+        params = self._read_params()
+        if len(self._inspire_ids) <= 1:
+            return [self._build_url(**params)]
+        return [
+            self._build_url(inspire_ids=inspire_ids, **params)
+            for inspire_ids in chunked(self._inspire_ids, self._id_chunk_size)
+        ]
+
+    def _warn_missing(self, inspire_ids, records):
+        """Yields the records, then logs the requested INSPIRE ids not found."""
+        found = set()
+        for record in records:
+            found.add(str(record["id"]))
+            yield record
+        missing = [inspire_id for inspire_id in inspire_ids if inspire_id not in found]
+        if missing:
+            current_app.logger.warning(
+                f"INSPIRE records not found or not marked for CDS: {', '.join(missing)}."
+            )
+
+    def read(self, item=None, *args, **kwargs):
+        """Reads the records matching the input data from INSPIRE."""
+        current_app.logger.info("Start reading data from INSPIRE.")
+        query_urls = self._query_urls()
+        id_chunks = list(chunked(self._inspire_ids, self._id_chunk_size))
+        index, start_url, start_skip = self._start_position(query_urls)
+        self._read_count = 0
+        self._seen_ids = SeenIds()
+        self._duplicate_count = 0
+        for position, query_url in enumerate(query_urls[index:], start=index):
+            url, skip = (start_url, start_skip) if position == index else (query_url, 0)
+            records = self._iter(
+                url=url, skip=skip, query_url=query_url, *args, **kwargs
+            )
+            # only queries read from their first hit tell which ids are missing
+            if len(self._inspire_ids) > 1 and url == query_url and not skip:
+                records = self._warn_missing(id_chunks[position], records)
+            yield from records
+
+        if self._duplicate_count:
+            current_app.logger.warning(
+                f"Suppressed {self._duplicate_count} duplicated INSPIRE records "
+                "returned by the paginated search."
+            )
+
+
+class InspireOAIReader(BaseReader):
+    """Reads the INSPIRE records changed since the last incremental harvest.
+
+    The identifiers of the records of the OAI-PMH set changed since ``since``
+    are listed with ``ListIdentifiers``, following the resumption tokens, and
+    each page of identifiers is then fetched as JSON from the search API with
+    the ``inspire-http-reader``. INSPIRE does not serve its JSON format over
+    OAI-PMH, hence ``ListIdentifiers`` rather than ``ListRecords``.
+
+    When a ``datestamp_key`` is given, the response date of the listing is
+    persisted under it once the harvest is processed and its records written
+    without errors, and used as ``from`` of the next harvest. The origin is
+    the OAI-PMH endpoint, which allows to use a local stand-in.
+    """
+
+    def __init__(
+        self,
+        origin=INSPIRE_OAI_URL,
+        mode="r",
+        since=None,
+        document_type=ALL_DOCUMENT_TYPES,
+        set_spec=INSPIRE_OAI_SET,
+        metadata_prefix="marcxml",
+        datestamp_key=None,
+        id_chunk_size=50,
+        retries=0,
+        retry_backoff=1,
+        rate_limit=None,
+        **fetch_args,
+    ):
+        """Constructor.
+
+        :param since: harvest the records changed since this date, when no
+            datestamp was persisted under ``datestamp_key`` yet.
+        :param fetch_args: arguments of the ``inspire-http-reader`` used to fetch
+            the listed records.
+        """
+        self._since = since
+        self._document_type = document_type
+        self._set_spec = set_spec
+        self._metadata_prefix = metadata_prefix
+        self._datestamp_key = datestamp_key
+        self._id_chunk_size = id_chunk_size
+        self._retry_args = {
+            "retries": retries,
+            "retry_backoff": retry_backoff,
+            "rate_limit": rate_limit,
+        }
+        self._fetch_args = fetch_args
+        self.response_date = None
+        super().__init__(origin, mode)
+
+    def _from(self):
+        """Returns the lower bound of the datestamps to harvest."""
+        if self._datestamp_key:
+            datestamp = InspireHarvesterDatestamp.get_datestamp(self._datestamp_key)
+            if datestamp:
+                return datestamp
+        if not self._since or len(self._since) == len("YYYY-MM-DD"):
+            return self._since
+        since = datetime.fromisoformat(self._since)
+        if since.tzinfo:
+            since = since.astimezone(timezone.utc)
+        return since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _parse(self, url, response):
+        """Returns the parsed OAI-PMH response, raising on OAI-PMH errors."""
+        if response.status_code != 200:
+            error_message = f"Error occurred while listing INSPIRE records. See URL: {url}. Error message: {response.text}. Status code: {response.status_code}"
+            current_app.logger.error(error_message)
+            raise ReaderError(error_message)
+        try:
+            root = ET.fromstring(response.content)
+        except ET.ParseError as err:
+            raise ReaderError(f"Cannot parse OAI-PMH response. See URL: {url}: {err}")
+        error = root.find("oai:error", OAI_NAMESPACE)
+        if error is not None and error.get("code") != "noRecordsMatch":
+            error_message = f"OAI-PMH error {error.get('code')}: {error.text}. See URL: {url}."
+            current_app.logger.error(error_message)
+            raise ReaderError(error_message)
+        return root
+
+    def _identifier_pages(self, origin):
+        """Yields the INSPIRE ids of each ``ListIdentifiers`` page."""
+        retry_policy = build_retry_policy(
+            self._retry_args["retries"],
+            self._retry_args["retry_backoff"],
+            self._retry_args["rate_limit"],
+        )
+        seen_ids = SeenIds()
+        params = {
+            "verb": "ListIdentifiers",
+            "metadataPrefix": self._metadata_prefix,
+            "set": self._set_spec,
+        }
+        since = self._from()
+        if since:
+            params["from"] = since
+        current_app.logger.info(
+            f"Listing INSPIRE records of the set {self._set_spec} changed since {since}."
+        )
+
+        while params:
+            url = f"{origin}?{urlencode(params)}"
+            current_app.logger.info(f"Querying URL: {url}.")
+            root = self._parse(url, retry_policy.get(requests.get, url))
+            if self.response_date is None:
+                self.response_date = root.findtext("oai:responseDate", None, OAI_NAMESPACE)
+
+            inspire_ids = []
+            for header in root.iterfind(".//oai:header", OAI_NAMESPACE):
+                identifier = header.findtext("oai:identifier", "", OAI_NAMESPACE)
+                if header.get("status") == "deleted":
+                    current_app.logger.info(f"Skipping deleted record {identifier}.")
+                    continue
+                inspire_id = identifier.rsplit(":", 1)[-1]
+                # records changed during the listing can be listed twice
+                if seen_ids.add(inspire_id):
+                    inspire_ids.append(inspire_id)
+            yield inspire_ids
+
+            token = root.findtext(".//oai:resumptionToken", None, OAI_NAMESPACE)
+            params = (
+                {"verb": "ListIdentifiers", "resumptionToken": token} if token else None
+            )
+
+    def read(self, item=None, *args, **kwargs):
+        """Reads the INSPIRE records changed since the last harvest."""
+        origin = item or self._origin
+        for inspire_ids in self._identifier_pages(origin):
+            if not inspire_ids:
+                continue
+            reader = InspireHTTPReader(
+                inspire_id=inspire_ids,
+                id_chunk_size=self._id_chunk_size,
+                **self._retry_args,
+                **self._fetch_args,
+            )
+            for record in reader.read():
+                # the set is already filtered by the listing and the query
+                if self._document_type in (None, ALL_DOCUMENT_TYPES) or (
+                    self._document_type in record["metadata"].get("document_type", [])
+                ):
+                    yield record
+
+        if self._datestamp_key and self.response_date:
+            # committed as the next ``from`` once the records are processed
+            InspireHarvesterDatestamp.save_pending(
+                self._datestamp_key, self.response_date
+            )
+            db.session.commit()
+
+
+class InspireReplayReader(BaseReader):
+    """Reads INSPIRE records back from the pages captured by the HTTP reader.
+
+    The origin is a capture directory, whose files are read in name order, or
+    a single capture file.
+    """
+
+    def _iter(self, fp, *args, **kwargs):
+        """Yields the records of a capture file."""
+        for idx, line in enumerate(fp):
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as err:
+                raise ReaderError(
+                    f"Cannot decode JSON line {fp.name}:{idx}: {str(err)}"
+                )
+
+    def _files(self, origin):
+        """Returns the capture files to read, in order."""
+        path = Path(origin)
+        if path.is_dir():
+            return sorted(path.glob(f"*{CAPTURE_FILE_SUFFIX}"))
+        return [path]
+
+    def read(self, item=None, *args, **kwargs):
+        """Reads the records of the capture files."""
+        origin = item or self._origin
+        files = self._files(origin)
+        current_app.logger.info(
+            f"Replaying INSPIRE records from {len(files)} captured pages in {origin}."
+        )
+        for path in files:
+            with gzip.open(path, "rt", encoding="utf-8") as fp:
+                yield from self._iter(fp, *args, **kwargs)
+
+
+class InspireDumpReader(BaseReader):
+    """Reads INSPIRE records from literature dump files, for bulk backfills.
+
+    The origin is a JSON Lines file, optionally gzip compressed, or a directory
+    of such files, read in name order. Each line holds either a record as
+    returned by the INSPIRE API, or the bare record metadata. Records are read
+    one line at a time, and only the ones marked for CDS (and of the given
+    document type) are yielded, as with the ``inspire-http-reader``.
+    """
+
+    DUMP_FILE_PATTERNS = ("*.jsonl", "*.jsonl.gz")
+
+    def __init__(
+        self, origin=None, mode="r", document_type=ALL_DOCUMENT_TYPES, *args, **kwargs
+    ):
+        """Constructor."""
+        self._document_type = document_type
+        super().__init__(origin, mode, *args, **kwargs)
+
+    def _entry(self, record):
+        """Returns the record in the INSPIRE API format."""
+        if "metadata" in record:
+            return record
+        return {
+            "id": str(record["control_number"]),
+            "created": record.get("legacy_creation_date"),
+            "metadata": record,
+        }
+
+    def _iter(self, fp, *args, **kwargs):
+        """Yields the records of a dump file that are in the harvest scope."""
+        read_count = 0
+        yield_count = 0
+        for idx, line in enumerate(fp):
+            if not line.strip():
+                continue
+            try:
+                entry = self._entry(json.loads(line))
+            except (json.JSONDecodeError, KeyError) as err:
+                raise ReaderError(f"Cannot read INSPIRE record {fp.name}:{idx}: {err}")
+            read_count += 1
+            if in_harvest_scope(entry["metadata"], self._document_type):
+                yield_count += 1
+                yield entry
+        current_app.logger.info(
+            f"Read {read_count} INSPIRE records from {fp.name}, "
+            f"{yield_count} of them in the harvest scope."
+        )
+
+    def _files(self, origin):
+        """Returns the dump files to read, in order."""
+        path = Path(origin)
+        if path.is_dir():
+            return sorted(
+                file for pattern in self.DUMP_FILE_PATTERNS for file in path.glob(pattern)
+            )
+        return [path]
+
+    def _open(self, path):
+        """Opens a dump file, decompressing it on the fly if needed."""
+        if path.suffix == ".gz":
+            return gzip.open(path, "rt", encoding="utf-8")
+        return open(path, encoding="utf-8")
+
+    def read(self, item=None, *args, **kwargs):
+        """Reads the records of the dump files."""
+        origin = item or self._origin
+        files = self._files(origin)
+        current_app.logger.info(
+            f"Reading INSPIRE records from {len(files)} dump files in {origin}."
+        )
+        for path in files:
+            with self._open(path) as fp:
+                yield from self._iter(fp, *args, **kwargs)
@@ -13,6 +13,7 @@ from flask import Response, request
 from flask_resources import HTTPJSONException, Resource, route
 
 from cds_rdm.administration.permissions import curators_permission
+from cds_rdm.inspire_harvester.models import InspireHarvesterRunStats
 from cds_rdm.inspire_harvester.reports.runs.logs import (
     HarvesterRunError,
     fetch_harvester_run_logs,
@@ -20,6 +21,8 @@ from cds_rdm.inspire_harvester.reports.runs.logs import (
     plain_text_log,
     resolve_harvester_run,
 )
+from cds_rdm.inspire_harvester.transform.timing import timing_rows
+from cds_rdm.inspire_harvester.transform.vocabularies import cache_stats_rows
 
 
 class HarvesterDownloadResource(Resource):
@@ -50,7 +53,20 @@ class HarvesterDownloadResource(Resource):
         hits, total = fetch_harvester_run_logs(run)
         grouped_issues, other_lines, error_count, warning_count = group_log_hits(hits)
         logs = plain_text_log(
-            run, grouped_issues, other_lines, total, error_count, warning_count
+            run,
+            grouped_issues,
+            other_lines,
+            total,
+            error_count,
+            warning_count,
+            unchanged_count=InspireHarvesterRunStats.get_skipped_count(run.id),
+            duplicate_count=InspireHarvesterRunStats.get_duplicate_count(run.id),
+            mapper_timings=timing_rows(
+                InspireHarvesterRunStats.get_mapper_timings(run.id)
+            ),
+            vocabulary_cache=cache_stats_rows(
+                InspireHarvesterRunStats.get_vocabulary_cache_stats(run.id)
+            ),
         )
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
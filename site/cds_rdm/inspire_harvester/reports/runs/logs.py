@@ -25,6 +25,9 @@ from invenio_i18n import gettext as _
 from invenio_jobs.models import Run
 from invenio_jobs.proxies import current_jobs_logs_service
 
+from cds_rdm.inspire_harvester.models import InspireHarvesterRunStats
+from cds_rdm.inspire_harvester.transform.timing import timing_rows
+from cds_rdm.inspire_harvester.transform.vocabularies import cache_stats_rows
 from cds_rdm.utils import compact_text
 
 INSPIRE_HARVESTER_TASK = "process_inspire"
@@ -392,7 +395,18 @@ def group_log_hits(hits, max_examples=5):
     return grouped_issues, other_lines, error_count, warning_count
 
 
-def plain_text_log(run, grouped_issues, other_lines, total, error_count, warning_count):
+def plain_text_log(
+    run,
+    grouped_issues,
+    other_lines,
+    total,
+    error_count,
+    warning_count,
+    unchanged_count=0,
+    duplicate_count=0,
+    mapper_timings=None,
+    vocabulary_cache=None,
+):
     """Build the plain-text log file content."""
     max_results = current_app.config.get("JOBS_LOGS_MAX_RESULTS", 2000)
     status = getattr(run.status, "name", str(run.status))
@@ -420,6 +434,14 @@ def plain_text_log(run, grouped_issues, other_lines, total, error_count, warning
         summary.append(
             _("%(count)s warning(s) found in logs below", count=warning_count)
         )
+    if unchanged_count:
+        summary.append(
+            _("%(count)s unchanged record(s) skipped", count=unchanged_count)
+        )
+    if duplicate_count:
+        summary.append(
+            _("%(count)s duplicated record(s) dropped", count=duplicate_count)
+        )
     if summary:
         header.append("")
         header.extend(summary)
@@ -452,6 +474,24 @@ def plain_text_log(run, grouped_issues, other_lines, total, error_count, warning
             for entry in other_lines
         )
 
+    if mapper_timings:
+        body.append("")
+        body.append("Mapper timings (seconds)")
+        body.extend(
+            f"{row['mapper']} [{row['resource_type']}] calls={row['count']} "
+            f"total={row['total']:.3f} mean={row['mean']:.4f} max={row['max']:.3f}"
+            for row in mapper_timings
+        )
+
+    if vocabulary_cache:
+        body.append("")
+        body.append("Vocabulary cache")
+        body.extend(
+            f"{row['vocabulary']} hits={row['hits']} misses={row['misses']} "
+            f"hit_rate={row['hit_rate']:.1%}"
+            for row in vocabulary_cache
+        )
+
     logs = "\n".join(header + body).rstrip()
     if not body:
         logs += "\n" + (run.message or "No logs available for this run.\n")
@@ -492,5 +532,13 @@ def report_context(run_id):
         "other_lines": other_lines,
         "error_count": error_count,
         "warning_count": warning_count,
+        "unchanged_count": InspireHarvesterRunStats.get_skipped_count(run.id),
+        "duplicate_count": InspireHarvesterRunStats.get_duplicate_count(run.id),
+        "mapper_timings": timing_rows(
+            InspireHarvesterRunStats.get_mapper_timings(run.id)
+        ),
+        "vocabulary_cache": cache_stats_rows(
+            InspireHarvesterRunStats.get_vocabulary_cache_stats(run.id)
+        ),
         "inspire_literature_url": INSPIRE_LITERATURE_URL,
     }
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE harvester Celery tasks."""
+
+import copy
+import math
+from collections import Counter
+from datetime import date
+
+from celery import shared_task
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_db import db
+from invenio_jobs.errors import TaskExecutionPartialError
+from invenio_jobs.logging.jobs import EMPTY_JOB_CTX, job_context
+from invenio_jobs.models import Run, RunStatusEnum
+from invenio_jobs.proxies import current_runs_service
+
+from .datastream import process_inspire_datastream
+from .models import (
+    InspireHarvesterCheckpoint,
+    InspireHarvesterDatestamp,
+    InspireHarvesterRunStats,
+)
+from .reader import (
+    InspireHTTPReader,
+    current_duplicate_records,
+    current_skipped_records,
+)
+from .transform.affiliations import (
+    current_affiliation_index,
+    current_affiliation_paths,
+    load_affiliation_index,
+)
+from .transform.timing import MapperTimings, current_mapper_timings, timing_rows
+from .transform.vocabularies import (
+    VocabularyCacheStats,
+    cache_stats_rows,
+    current_vocabulary_cache_stats,
+)
+from .utils import split_date_range
+
+
+def _as_date(value):
+    """Return the date part of an ISO date or datetime string."""
+    return date.fromisoformat(value[:10])
+
+
+def _window_days(reader_args, since, until, sharding):
+    """Return the length in days of each harvest window."""
+    if sharding.get("days"):
+        return sharding["days"]
+
+    total = InspireHTTPReader(**reader_args).count()
+    windows = max(math.ceil(total / sharding["size"]), 1)
+    current_app.logger.info(
+        f"Records to harvest: {total}. Splitting the harvest into {windows} windows "
+        f"of ~{sharding['size']} records."
+    )
+    return math.ceil(((until - since).days + 1) / windows)
+
+
+def build_window_configs(config, sharding):
+    """Split a datastream config into one config per date window.
+
+    The first window keeps the original ``since`` value (which may carry a
+    time), the following ones start at midnight of the day after the previous
+    window. When no ``until`` is given the range ends today.
+    """
+    reader_args = config["readers"][0]["args"]
+    since = _as_date(reader_args["since"])
+    until = _as_date(reader_args["until"]) if reader_args.get("until") else date.today()
+    windows = split_date_range(
+        since, until, _window_days(reader_args, since, until, sharding)
+    )
+
+    window_configs = []
+    for index, (start, end) in enumerate(windows):
+        window_config = copy.deepcopy(config)
+        window_args = window_config["readers"][0]["args"]
+        if index > 0:
+            window_args["since"] = start.isoformat()
+        window_args["until"] = end.isoformat()
+        if window_args.get("checkpoint_key"):
+            window_args["checkpoint_key"] += f":{start.isoformat()}"
+        window_configs.append(window_config)
+    return window_configs
+
+
+def _clear_checkpoint(config):
+    """Delete the reader checkpoint once the harvest has been fully processed."""
+    checkpoint_key = config["readers"][0]["args"].get("checkpoint_key")
+    if checkpoint_key:
+        InspireHarvesterCheckpoint.delete(checkpoint_key)
+        db.session.commit()
+
+
+def _commit_datestamp(config, errored):
+    """Start the next incremental harvest from the datestamp of the processed one.
+
+    The datestamp stays pending when entries errored. In a job run, the records
+    are written by asynchronous tasks that may still fail: the run is stored
+    with the datestamp, which the next harvest commits if the run succeeded.
+    """
+    datestamp_key = config["readers"][0]["args"].get("datestamp_key")
+    if not datestamp_key or errored:
+        return
+    job_ctx = job_context.get()
+    if job_ctx is EMPTY_JOB_CTX or not job_ctx.get("run_id"):
+        InspireHarvesterDatestamp.commit_pending(datestamp_key)
+    else:
+        InspireHarvesterDatestamp.set_pending_run_id(datestamp_key, job_ctx["run_id"])
+    db.session.commit()
+
+
+def _commit_written_datestamp(config):
+    """Commit the pending datestamp of a previous run once its writes succeeded.
+
+    A run still writing, or with failed writes, leaves the datestamp pending:
+    the harvest then starts again from the last committed datestamp.
+    """
+    datestamp_key = config["readers"][0]["args"].get("datestamp_key")
+    if not datestamp_key:
+        return
+    run_id = InspireHarvesterDatestamp.get_pending_run_id(datestamp_key)
+    if run_id is None:
+        return
+    run = db.session.get(Run, run_id)
+    if run is not None and run.status == RunStatusEnum.SUCCESS:
+        InspireHarvesterDatestamp.commit_pending(datestamp_key)
+        db.session.commit()
+
+
+def _save_mapper_timings(timings):
+    """Log the slowest mappers and add the timings to the report of the run."""
+    rows = timing_rows(timings.as_dict())
+    if not rows:
+        return
+    slowest = ", ".join(
+        f"{row['mapper']} ({row['resource_type']}): {row['total']:.2f}s"
+        for row in rows[:5]
+    )
+    current_app.logger.info(f"Slowest mappers: {slowest}.")
+
+    job_ctx = job_context.get()
+    if job_ctx is EMPTY_JOB_CTX or not job_ctx.get("run_id"):
+        return
+    InspireHarvesterRunStats.add_mapper_timings(job_ctx["run_id"], timings.as_dict())
+    db.session.commit()
+
+
+def _save_vocabulary_cache_stats(cache_stats):
+    """Log the vocabulary cache hit rates and add the counts to the run report."""
+    rows = cache_stats_rows(cache_stats.as_dict())
+    if not rows:
+        return
+    hit_rates = ", ".join(
+        f"{row['vocabulary']}: {row['hit_rate']:.0%} of {row['hits'] + row['misses']}"
+        for row in rows
+    )
+    current_app.logger.info(f"Vocabulary cache hit rates: {hit_rates}.")
+
+    job_ctx = job_context.get()
+    if job_ctx is EMPTY_JOB_CTX or not job_ctx.get("run_id"):
+        return
+    InspireHarvesterRunStats.add_vocabulary_cache_stats(
+        job_ctx["run_id"], cache_stats.as_dict()
+    )
+    db.session.commit()
+
+
+def _save_skipped_count(skipped):
+    """Add the unchanged records skipped by a harvest to the run report."""
+    if not skipped:
+        return
+    job_ctx = job_context.get()
+    if job_ctx is EMPTY_JOB_CTX or not job_ctx.get("run_id"):
+        return
+    InspireHarvesterRunStats.add_skipped_count(job_ctx["run_id"], len(skipped))
+    db.session.commit()
+
+
+def _save_duplicate_count(duplicates):
+    """Add the repeated records dropped by a harvest to the run report."""
+    if not duplicates:
+        return
+    job_ctx = job_context.get()
+    if job_ctx is EMPTY_JOB_CTX or not job_ctx.get("run_id"):
+        return
+    InspireHarvesterRunStats.add_duplicate_count(
+        job_ctx["run_id"], sum(duplicates.values())
+    )
+    db.session.commit()
+
+
+def _log_affiliation_paths(affiliation_paths):
+    """Log how many affiliations were mapped by each path."""
+    if not affiliation_paths:
+        return
+    paths = ", ".join(
+        f"{path}: {count}" for path, count in affiliation_paths.most_common()
+    )
+    current_app.logger.info(f"Affiliations mapped by path: {paths}.")
+
+
+def _finish(
+    config,
+    timings,
+    cache_stats,
+    affiliation_paths,
+    skipped,
+    duplicates,
+    errored=False,
+):
+    """Clear the checkpoint of a processed harvest and store its statistics."""
+    _clear_checkpoint(config)
+    _commit_datestamp(config, errored)
+    _save_mapper_timings(timings)
+    _save_vocabulary_cache_stats(cache_stats)
+    _save_skipped_count(skipped)
+    _save_duplicate_count(duplicates)
+    _log_affiliation_paths(affiliation_paths)
+
+
+def _process(config):
+    """Process the datastream of a harvest and clear its checkpoint when done."""
+    timings = MapperTimings()
+    cache_stats = VocabularyCacheStats()
+    affiliation_paths = Counter()
+    affiliation_index = load_affiliation_index()
+    skipped = set()
+    duplicates = Counter()
+    token = current_mapper_timings.set(timings)
+    cache_token = current_vocabulary_cache_stats.set(cache_stats)
+    paths_token = current_affiliation_paths.set(affiliation_paths)
+    index_token = current_affiliation_index.set(affiliation_index)
+    skipped_token = current_skipped_records.set(skipped)
+    duplicates_token = current_duplicate_records.set(duplicates)
+    _commit_written_datestamp(config)
+    try:
+        process_inspire_datastream(config)
+    except TaskExecutionPartialError:
+        _finish(
+            config,
+            timings,
+            cache_stats,
+            affiliation_paths,
+            skipped,
+            duplicates,
+            errored=True,
+        )
+        raise
+    finally:
+        current_duplicate_records.reset(duplicates_token)
+        current_skipped_records.reset(skipped_token)
+        current_affiliation_index.reset(index_token)
+        current_affiliation_paths.reset(paths_token)
+        current_vocabulary_cache_stats.reset(cache_token)
+        current_mapper_timings.reset(token)
+    _finish(config, timings, cache_stats, affiliation_paths, skipped, duplicates)
+
+
+def _window_label(config):
+    """Return the date range of a window config, for logging."""
+    reader_args = config["readers"][0]["args"]
+    return f"{reader_args['since']} - {reader_args['until']}"
+
+
+@shared_task(ignore_result=True)
+def process_inspire_window(config, subtask_run_id=None):
+    """Harvest a single date window as a subtask of the parent run."""
+    job_ctx = job_context.get()
+    job_id = job_ctx.get("job_id", None) if job_ctx is not EMPTY_JOB_CTX else None
+    if subtask_run_id and job_id:
+        current_runs_service.start_processing_subtask(
+            system_identity, subtask_run_id, job_id=job_id
+        )
+
+    current_app.logger.info(f"Harvesting window {_window_label(config)}.")
+    success = True
+    errored_entries_count = 0
+    try:
+        _process(config)
+    except TaskExecutionPartialError as e:
+        errored_entries_count = e.errored_entries_count
+    except Exception as exc:
+        current_app.logger.error(
+            f"Error harvesting window {_window_label(config)}: {exc}", exc_info=True
+        )
+        success = False
+
+    if subtask_run_id and job_id:
+        current_runs_service.finalize_subtask(
+            system_identity,
+            subtask_run_id,
+            job_id,
+            success=success,
+            errored_entries_count=errored_entries_count,
+        )
+
+
+@shared_task(ignore_result=True)
+def process_inspire_harvest(config, sharding=None):
+    """Harvest INSPIRE records, optionally sharded into date windows.
+
+    Without ``sharding`` the whole query runs as a single datastream. Otherwise
+    the date range is split by ``sharding["days"]`` or into windows of about
+    ``sharding["size"]`` records, and each window runs in parallel as a subtask
+    of the current run, which aggregates their status. Outside of a job run the
+    windows are processed one after the other.
+    """
+    if not sharding:
+        return _process(config)
+
+    window_configs = build_window_configs(config, sharding)
+    current_app.logger.info(f"Harvest split into {len(window_configs)} windows.")
+
+    job_ctx = job_context.get()
+    if job_ctx is EMPTY_JOB_CTX:
+        errored_entries_count = 0
+        for window_config in window_configs:
+            try:
+                _process(window_config)
+            except TaskExecutionPartialError as e:
+                errored_entries_count += e.errored_entries_count
+        if errored_entries_count:
+            raise TaskExecutionPartialError(
+                message=f"Task execution partially succeeded with {errored_entries_count} entries with errors.",
+                errored_entries_count=errored_entries_count,
+            )
+        return
+
+    # create all subtasks before dispatching, so that the parent run is not
+    # finalized while windows are still being queued
+    subtask_run_ids = [
+        str(
+            current_runs_service.create_subtask_run(
+                system_identity,
+                parent_run_id=job_ctx["run_id"],
+                job_id=job_ctx["job_id"],
+                args=window_config["readers"][0]["args"],
+            ).id
+        )
+        for window_config in window_configs
+    ]
+    for window_config, subtask_run_id in zip(window_configs, subtask_run_ids):
+        process_inspire_window.delay(window_config, subtask_run_id)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE to CDS harvester legacy affiliation index module."""
+
+from contextvars import ContextVar
+
+from flask import current_app
+from idutils.normalizers import normalize_ror
+from invenio_db import db
+
+# legacy affiliation answers of the harvest being processed, as
+# ``{normalized name: (affiliation, path)}``
+current_affiliation_index = ContextVar("current_affiliation_index", default=None)
+
+# number of affiliations mapped by each path in the harvest being processed,
+# as a ``Counter``
+current_affiliation_paths = ContextVar("current_affiliation_paths", default=None)
+
+# affiliation mapping paths
+INSPIRE_ROR = "inspire_ror"
+LEGACY_CURATED = "legacy_curated"
+LEGACY_ROR = "legacy_ror"
+NAME = "name"
+
+
+def normalize_affiliation(name):
+    """Return the form of an affiliation name used for matching."""
+    return " ".join(name.split()).rstrip(".").strip().casefold()
+
+
+def _legacy_answer(ror_exact_match, curated_affiliation):
+    """Return the affiliation and path of a legacy mapping, or None."""
+    curated = curated_affiliation or {}
+    if curated.get("id"):
+        return {"id": normalize_ror(curated["id"])}, LEGACY_CURATED
+    if curated.get("name"):
+        return {"name": curated["name"]}, LEGACY_CURATED
+    if ror_exact_match:
+        return {"id": normalize_ror(ror_exact_match)}, LEGACY_ROR
+    return None
+
+
+def load_affiliation_index():
+    """Load the curated and ROR matched legacy affiliations, by normalized name.
+
+    Names normalized to the same form with different answers are left out.
+    Returns None if the mappings cannot be loaded.
+    """
+    from cds_rdm.legacy.models import CDSMigrationAffiliationMapping
+
+    index = {}
+    ambiguous = set()
+    try:
+        rows = db.session.query(
+            CDSMigrationAffiliationMapping.legacy_affiliation_input,
+            CDSMigrationAffiliationMapping.ror_exact_match,
+            CDSMigrationAffiliationMapping.curated_affiliation,
+        ).yield_per(1000)
+        for legacy_input, ror_exact_match, curated_affiliation in rows:
+            answer = _legacy_answer(ror_exact_match, curated_affiliation)
+            key = normalize_affiliation(legacy_input or "")
+            if not answer or not key or key in ambiguous:
+                continue
+            if key in index and index[key][0] != answer[0]:
+                del index[key]
+                ambiguous.add(key)
+                continue
+            index[key] = answer
+    except Exception as e:
+        current_app.logger.error(
+            f"Failed loading the legacy affiliation mappings. | details: error={e}"
+        )
+        return None
+
+    current_app.logger.info(f"Loaded {len(index)} legacy affiliation mappings.")
+    return index
+
+
+def legacy_affiliation(name):
+    """Return the affiliation and path of a name in the legacy index, or None."""
+    index = current_affiliation_index.get()
+    if not index:
+        return None
+    answer = index.get(normalize_affiliation(name))
+    if answer is None:
+        return None
+    affiliation, path = answer
+    return dict(affiliation), path
+
+
+def record_affiliation_path(path, count=1):
+    """Count affiliations mapped by a path, in an instrumented harvest."""
+    paths = current_affiliation_paths.get()
+    if paths is not None:
+        paths[path] += count
@@ -89,6 +89,25 @@ THESIS_MAPPERS = (
     ThesisProgrammesMapper(),
 )
 
+# INSPIRE metadata keys read outside of the mappers (CDS id lookup, resource
+# type detection, version split, error reporting)
+PIPELINE_SOURCE_FIELDS = (
+    "control_number",
+    "document_type",
+    "documents",
+    "dois",
+    "external_system_identifiers",
+    "persistent_identifiers",
+    "publication_info",
+)
+
+# Bump when the mapping changes, so that records skipped as unchanged since
+# their last harvest are transformed and written again. The hash only covers
+# the INSPIRE source: changes to the legacy affiliation mappings, the
+# vocabularies or the funding resolutions do not make a record changed, and
+# need a bump (or a harvest without skipping) to reach the written records.
+SOURCE_HASH_VERSION = 4
+
 inspire_mapper_policy = MapperPolicy(base=BASE_MAPPERS)
 
 mapper_policy = MapperPolicy(
@@ -53,6 +53,7 @@ class ArticleTitleMapper(MapperBase):
     """Title mapper."""
 
     id = "metadata.title"
+    source_fields = ("titles",)
 
     def map_value(self, src_record, ctx, logger):
         """Map title value."""
@@ -70,6 +71,7 @@ class ArticleDescriptionMapper(MapperBase):
     """Description mapper."""
 
     id = "metadata.description"
+    source_fields = ("abstracts",)
 
     def map_value(self, src_record, ctx, logger):
         """Mapping of abstracts."""
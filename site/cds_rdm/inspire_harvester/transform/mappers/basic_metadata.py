@@ -15,6 +15,7 @@ from edtf.parser.grammar import ParseException
 from flask import current_app
 
 from cds_rdm.inspire_harvester.transform.mappers.mapper import MapperBase
+from cds_rdm.inspire_harvester.transform.vocabularies import prefetched_vocabulary_id
 
 
 @dataclass(frozen=True)
@@ -33,6 +34,8 @@ class TitleMapper(MapperBase):
     """Title mapper."""
 
     id = "metadata.title"
+    source_fields = ("titles",)
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Map title value."""
@@ -50,6 +53,8 @@ class AdditionalTitlesMapper(MapperBase):
     """Additional titles mapper."""
 
     id = "metadata.additional_titles"
+    source_fields = ("titles",)
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Map additional titles."""
@@ -98,6 +103,8 @@ class PublisherMapper(MapperBase):
     """Publisher mapper."""
 
     id = "metadata.publisher"
+    source_fields = ("imprints", "dois")
+    depends_on_resource_type = False
 
     def validate(self, src, ctx):
         """Validate publisher data."""
@@ -135,6 +142,8 @@ class PublicationDateMapper(MapperBase):
     """Publication date mapper."""
 
     id = "metadata.publication_date"
+    source_fields = ("imprints", "publication_info")
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Transform publication date."""
@@ -164,6 +173,8 @@ class CopyrightMapper(MapperBase):
     """Copyright mapper."""
 
     id = "metadata.copyright"
+    source_fields = ("copyright",)
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Transform copyrights."""
@@ -199,11 +210,33 @@ class LicensesMapper(MapperBase):
     """Licenses mapper."""
 
     id = "metadata.rights"
+    source_fields = ("license",)
+    depends_on_resource_type = False
+
+    def _normalize(self, license_str):
+        """Return the licenses vocabulary id of a license name."""
+        return license_str.lower().strip().replace(" ", "-")
+
+    def _license_id(self, normalized, ctx, logger):
+        """Return the id of the license with the normalized id, or None."""
+        from cds_rdm.inspire_harvester.utils import get_vocabulary_id
+
+        prefetched, vocab_id = prefetched_vocabulary_id("licenses", normalized)
+        if prefetched:
+            # only an exact id match, the other prefetch fallbacks do not apply
+            return vocab_id if vocab_id == normalized else None
+        return get_vocabulary_id(normalized, "licenses", ctx, logger)
+
+    def vocabulary_terms(self, src_record):
+        """Return the licenses looked up by the mapper."""
+        src_metadata = src_record.get("metadata", {})
+        for lic in src_metadata.get("license", []):
+            license_str = lic.get("license", "")
+            if license_str:
+                yield "licenses", self._normalize(license_str)
 
     def map_value(self, src_record, ctx, logger):
         """Map license values to RDM rights vocabulary IDs."""
-        from cds_rdm.inspire_harvester.utils import search_vocabulary
-
         src_metadata = src_record.get("metadata", {})
         inspire_licenses = src_metadata.get("license", [])
         mapped = []
@@ -211,11 +244,9 @@ class LicensesMapper(MapperBase):
             license_str = lic.get("license", "")
             if not license_str:
                 continue
-            normalized = license_str.lower().strip().replace(" ", "-")
-            result = search_vocabulary(normalized, "licenses", ctx, logger)
-            if result and result.total == 1:
-                hit = list(result.hits)[0]
-                mapped.append({"id": hit["id"]})
+            license_id = self._license_id(self._normalize(license_str), ctx, logger)
+            if license_id:
+                mapped.append({"id": license_id})
             else:
                 logger.info(
                     f"License '{license_str}' not found in vocabulary, "
@@ -230,6 +261,8 @@ class DescriptionMapper(MapperBase):
     """Description mapper."""
 
     id = "metadata.description"
+    source_fields = ("abstracts",)
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Mapping of abstracts."""
@@ -248,6 +281,8 @@ class AdditionalDescriptionsMapper(MapperBase):
     """Additional descriptions mapper."""
 
     id = "metadata.additional_descriptions"
+    source_fields = ("abstracts", "book_series", "public_notes")
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Mapping of additional descriptions."""
@@ -294,6 +329,8 @@ class SubjectsMapper(MapperBase):
     """Subjects mapper."""
 
     id = "metadata.subjects"
+    source_fields = ("keywords",)
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Mapping of keywords to subjects."""
@@ -317,6 +354,8 @@ class LanguagesMapper(MapperBase):
     """Languages mapper."""
 
     id = "metadata.languages"
+    source_fields = ("languages",)
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Mapping and converting of languages."""
@@ -345,6 +384,8 @@ class WithdrawnMapper(MapperBase):
     """Reject withdrawn INSPIRE records."""
 
     id = "withdrawn"
+    source_fields = ("withdrawn",)
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Error if the INSPIRE withdrawn field is set."""
@@ -11,12 +11,20 @@ from dataclasses import dataclass
 
 from idutils.normalizers import normalize_ror
 
+from cds_rdm.inspire_harvester.transform.affiliations import (
+    INSPIRE_ROR,
+    NAME,
+    legacy_affiliation,
+    record_affiliation_path,
+)
 from cds_rdm.inspire_harvester.transform.mappers.mapper import MapperBase
 
 
 class CreatibutorsMapper(MapperBase):
     """Base class for mapping creatibutors (creators and contributors)."""
 
+    depends_on_resource_type = False
+
     def _transform_author_identifiers(self, author):
         """Transform ids of authors. Keeping only ORCID and CDS."""
         author_ids = author.get("ids", [])
@@ -39,11 +47,23 @@ class CreatibutorsMapper(MapperBase):
 
         return processed_identifiers
 
+    @staticmethod
+    def _name_affiliation(value):
+        """Map an affiliation name, to its ROR id if the legacy index has it."""
+        legacy = legacy_affiliation(value)
+        if legacy:
+            affiliation, path = legacy
+            record_affiliation_path(path)
+            return affiliation
+        record_affiliation_path(NAME)
+        return {"name": value.rstrip(".").strip()}
+
     def _transform_author_affiliations(self, author):
         """Transform affiliations.
 
         Complete ROR coverage is mapped in ROR order. Otherwise, identifiers
-        are matched by source position and non-ROR affiliations use free text.
+        are matched by source position and non-ROR affiliations are looked up
+        in the legacy affiliation index of the harvest, or use free text.
         """
         affiliations = author.get("affiliations", [])
         affiliations_identifiers = author.get("affiliations_identifiers", [])
@@ -55,6 +75,7 @@ class CreatibutorsMapper(MapperBase):
             if identifier.get("schema") == "ROR"
         ]
         if len(ror_ids) == len(affiliations):
+            record_affiliation_path(INSPIRE_ROR, len(ror_ids))
             return [{"id": ror_id} for ror_id in ror_ids]
 
         for i, affiliation in enumerate(affiliations):
@@ -64,13 +85,14 @@ class CreatibutorsMapper(MapperBase):
                 else {}
             )
             if affiliation_identifier.get("schema") == "ROR":
+                record_affiliation_path(INSPIRE_ROR)
                 mapped_affiliations.append(
                     {"id": normalize_ror(affiliation_identifier["value"])}
                 )
             else:
                 value = affiliation.get("value")
                 if value:
-                    mapped_affiliations.append({"name": value.rstrip(".").strip()})
+                    mapped_affiliations.append(self._name_affiliation(value))
 
         return mapped_affiliations
 
@@ -140,6 +162,7 @@ class AuthorsMapper(CreatibutorsMapper):
     """Mapper for authors/creators."""
 
     id = "metadata.creators"
+    source_fields = ("authors", "corporate_author")
 
     def map_value(self, src_record, ctx, logger):
         """Map authors to RDM creators."""
@@ -178,6 +201,7 @@ class ContributorsMapper(CreatibutorsMapper):
     """Mapper for contributors."""
 
     id = "metadata.contributors"
+    source_fields = ("authors",)
 
     def map_value(self, src_record, ctx, logger):
         """Map authors to RDM contributors."""
@@ -20,6 +20,8 @@ class ImprintMapper(MapperBase):
     """Mapper for imprint custom fields."""
 
     id = "custom_fields.imprint:imprint"
+    source_fields = ("imprints", "isbns", "editions")
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Apply thesis field mapping."""
@@ -68,6 +70,26 @@ class CERNFieldsMapper(MapperBase):
     """Map CERN specific custom fields."""
 
     id = "custom_fields"
+    source_fields = ("accelerator_experiments",)
+    depends_on_resource_type = False
+
+    def _terms(self, item):
+        """Return the accelerator and experiment vocabulary terms of an item."""
+        accelerator = item.get("accelerator")
+        institution = item.get("institution")
+        if accelerator and institution:
+            accelerator = f"{institution} {accelerator}"
+        return accelerator, item.get("experiment")
+
+    def vocabulary_terms(self, src_record):
+        """Return the accelerators and experiments looked up by the mapper."""
+        src_metadata = src_record.get("metadata", {})
+        for item in src_metadata.get("accelerator_experiments", []):
+            accelerator_term, experiment = self._terms(item)
+            if accelerator_term:
+                yield "accelerators", accelerator_term
+            if experiment:
+                yield "experiments", experiment
 
     def map_value(self, src_record, ctx, logger):
         """Apply mapping."""
@@ -77,16 +99,9 @@ class CERNFieldsMapper(MapperBase):
         _experiments = []
 
         for item in acc_exp_list:
-            accelerator = item.get("accelerator")
-            experiment = item.get("experiment")
-            institution = item.get("institution")
-
-            if accelerator:
-                if institution:
-                    accelerator_term = f"{institution} {accelerator}"
-                else:
-                    accelerator_term = accelerator
+            accelerator_term, experiment = self._terms(item)
 
+            if accelerator_term:
                 vocab_id = get_vocabulary_exact(
                     accelerator_term, "accelerators", ctx, logger
                 )
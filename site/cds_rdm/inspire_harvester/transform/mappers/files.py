@@ -17,6 +17,8 @@ class FilesMapper(MapperBase):
     """Mapper for files."""
 
     id = "files"
+    source_fields = ("documents",)
+    depends_on_resource_type = False
 
     def filter(self, file):
         """Filters files based on given criteria."""
@@ -7,13 +7,19 @@
 
 """INSPIRE to CDS harvester module."""
 
+from contextvars import ContextVar
 from dataclasses import dataclass
 
 from invenio_access.permissions import system_identity
+from invenio_db import db
 from invenio_records_resources.proxies import current_service_registry
 
 from cds_rdm.inspire_harvester.transform.mappers.mapper import MapperBase
 
+# funding resolved for the batch being transformed, as
+# ``{funding_key: (funder_id or None, award_id or None)}``
+current_funding_resolutions = ContextVar("current_funding_resolutions", default=None)
+
 
 def _normalize(value):
     """Normalize free-text for comparison."""
@@ -31,11 +37,140 @@ def _funder_matches(hit, agency):
     return any(_normalize(v) == needle for v in title.values())
 
 
+def funding_key(agency, grant_number):
+    """Return the key of a funding entry in the resolution table."""
+    return _normalize(agency), str(grant_number or "").strip()
+
+
+def _search_funder(agency):
+    """Search the funder vocabulary id of an agency name, or None."""
+    service = current_service_registry.get("funders")
+    result = service.search(system_identity, q=agency, size=20)
+    matches = [h for h in result.hits if _funder_matches(h, agency)]
+    if len(matches) == 1:
+        return matches[0]["id"]
+    if not matches and result.total == 1:
+        return list(result.hits)[0]["id"]
+    return None
+
+
+def _search_award(number, funder_id):
+    """Search the award of a grant/project number, return its id and hit or Nones."""
+    service = current_service_registry.get("awards")
+    query = f'number:"{number}"'
+    if funder_id:
+        query = f"{query} AND funder.id:{funder_id}"
+    result = service.search(system_identity, q=query, size=20)
+    hits = list(result.hits)
+
+    if funder_id and not hits:
+        # Fall back to number-only search if funder-scoped search missed.
+        result = service.search(system_identity, q=f'number:"{number}"', size=20)
+        hits = list(result.hits)
+
+    exact = [h for h in hits if str(h.get("number")) == str(number)]
+    candidates = exact or hits
+    if len(candidates) == 1:
+        return candidates[0]["id"], candidates[0]
+    return None, None
+
+
+def _award_funder_id(award_hit):
+    """Return the funder id of an award hit, or None."""
+    funder = (award_hit or {}).get("funder") or {}
+    return funder.get("id")
+
+
+def _search_funding(agency, grant_number):
+    """Search the funder and award ids of a funding entry."""
+    funder_id = _search_funder(agency) if agency else None
+    award_id, award_hit = (
+        _search_award(grant_number, funder_id) if grant_number else (None, None)
+    )
+    # Award can provide the funder when agency was missing/unresolved.
+    return funder_id or _award_funder_id(award_hit), award_id
+
+
+def resolve_funding_entries(src_records, logger):
+    """Resolve the funding entries of records with the resolution table.
+
+    Entries missing from the table are resolved once each and added to it.
+    Returns ``{funding_key: (funder_id, award_id)}``.
+    """
+    from cds_rdm.inspire_harvester.models import InspireHarvesterFundingResolution
+
+    entries = {}
+    for src_record in src_records:
+        for agency, grant_number in FundingMapper.funding_entries(src_record):
+            key = funding_key(agency, grant_number)
+            entries.setdefault(key, (agency, grant_number))
+    if not entries:
+        return {}
+
+    resolved = InspireHarvesterFundingResolution.get_many(entries)
+    new = {}
+    for key, (agency, grant_number) in entries.items():
+        if key in resolved:
+            continue
+        try:
+            new[key] = _search_funding(agency, grant_number)
+        except Exception as e:
+            # left to the mapper, which reports the failing search
+            logger.error(
+                f"Failed funding resolution. "
+                f"| details: agency={agency}, grant_number={grant_number}, error={e}"
+            )
+    if new:
+        InspireHarvesterFundingResolution.save_many(new)
+        db.session.commit()
+    resolved.update(new)
+    return resolved
+
+
+def clear_funding_resolutions(sender, record=None, **kwargs):
+    """Drop the resolutions that a changed funder or award may affect.
+
+    Connected to the record insert, update and delete signals.
+    """
+    from invenio_vocabularies.contrib.awards.api import Award
+    from invenio_vocabularies.contrib.funders.api import Funder
+
+    from cds_rdm.inspire_harvester.models import InspireHarvesterFundingResolution
+
+    if isinstance(record, Funder):
+        names = [record.get("name"), *(record.get("title") or {}).values()]
+        agencies = {_normalize(name) for name in names} - {""}
+        InspireHarvesterFundingResolution.invalidate_funder(
+            record.get("id"), agencies
+        )
+    elif isinstance(record, Award):
+        _, grant_number = funding_key(None, record.get("number"))
+        InspireHarvesterFundingResolution.invalidate_award(
+            record.get("id"), grant_number
+        )
+
+
 @dataclass(frozen=True)
 class FundingMapper(MapperBase):
     """Mapper for funding information."""
 
     id = "metadata.funding"
+    source_fields = ("funding_info",)
+    depends_on_resource_type = False
+
+    @staticmethod
+    def _funding_terms(entry):
+        """Return the agency and grant/project number of a funding entry."""
+        return entry.get("agency"), entry.get("grant_number") or entry.get(
+            "project_number"
+        )
+
+    @classmethod
+    def funding_entries(cls, src_record):
+        """Return the ``(agency, grant_number)`` of the funding entries."""
+        src_metadata = src_record.get("metadata", {})
+        for entry in src_metadata.get("funding_info", []):
+            yield cls._funding_terms(entry)
 
     def _resolve_funder(self, agency, ctx, logger):
         """Resolve a funder vocabulary id from an agency name, or None."""
@@ -43,14 +178,7 @@ class FundingMapper(MapperBase):
             return None
 
         try:
-            service = current_service_registry.get("funders")
-            result = service.search(system_identity, q=agency, size=20)
-            matches = [h for h in result.hits if _funder_matches(h, agency)]
-            if len(matches) == 1:
-                return matches[0]["id"]
-            if not matches and result.total == 1:
-                return list(result.hits)[0]["id"]
-            return None
+            return _search_funder(agency)
         except Exception as e:
             logger.error(
                 f"Failed funder search. "
@@ -64,25 +192,7 @@ class FundingMapper(MapperBase):
             return None, None
 
         try:
-            service = current_service_registry.get("awards")
-            query = f'number:"{number}"'
-            if funder_id:
-                query = f"{query} AND funder.id:{funder_id}"
-            result = service.search(system_identity, q=query, size=20)
-            hits = list(result.hits)
-
-            if funder_id and not hits:
-                # Fall back to number-only search if funder-scoped search missed.
-                result = service.search(
-                    system_identity, q=f'number:"{number}"', size=20
-                )
-                hits = list(result.hits)
-
-            exact = [h for h in hits if str(h.get("number")) == str(number)]
-            candidates = exact or hits
-            if len(candidates) == 1:
-                return candidates[0]["id"], candidates[0]
-            return None, None
+            return _search_award(number, funder_id)
         except Exception as e:
             logger.error(
                 f"Failed award search. "
@@ -90,6 +200,28 @@ class FundingMapper(MapperBase):
             )
             return None, None
 
+    def _resolve(self, agency, grant_number, ctx, logger):
+        """Return the funder and award ids of a funding entry.
+
+        Entries resolved for the batch are looked up locally.
+        """
+        resolutions = current_funding_resolutions.get()
+        if resolutions is not None:
+            resolved = resolutions.get(funding_key(agency, grant_number))
+            if resolved is not None:
+                return resolved
+
+        funder_id = self._resolve_funder(agency, ctx, logger) if agency else None
+        award_id = None
+        award_hit = None
+        if grant_number:
+            award_id, award_hit = self._resolve_award(
+                grant_number, funder_id, ctx, logger
+            )
+
+        # Award can provide the funder when agency was missing/unresolved.
+        return funder_id or _award_funder_id(award_hit), award_id
+
     def map_value(self, src_record, ctx, logger):
         """Map funding_info entries to funder/award vocabulary references.
 
@@ -103,21 +235,8 @@ class FundingMapper(MapperBase):
 
         mapped = []
         for entry in funding_info:
-            agency = entry.get("agency")
-            grant_number = entry.get("grant_number") or entry.get("project_number")
-
-            funder_id = self._resolve_funder(agency, ctx, logger) if agency else None
-            award_id = None
-            award_hit = None
-            if grant_number:
-                award_id, award_hit = self._resolve_award(
-                    grant_number, funder_id, ctx, logger
-                )
-
-            # Award can provide the funder when agency was missing/unresolved.
-            if not funder_id and award_hit:
-                funder = award_hit.get("funder") or {}
-                funder_id = funder.get("id")
+            agency, grant_number = self._funding_terms(entry)
+            funder_id, award_id = self._resolve(agency, grant_number, ctx, logger)
 
             if agency and not funder_id:
                 ctx.errors.append(
@@ -8,7 +8,6 @@
 """INSPIRE to CDS harvester module."""
 
 import json
-import re
 from dataclasses import dataclass
 
 from flask import current_app
@@ -16,6 +15,7 @@ from idutils.normalizers import normalize_isbn, normalize_urn
 from idutils.validators import is_doi, is_urn
 
 from cds_rdm import schemes
+from cds_rdm.config_lookups import current_config_lookups
 from cds_rdm.inspire_harvester.transform.mappers.mapper import MapperBase
 
 
@@ -62,16 +62,6 @@ def _related_identifier(schema, value, ctx):
     return related
 
 
-def _committee_approval_prefixes():
-    """Return configured committee approval report-number prefixes."""
-    communities = current_app.config.get("CDS_COMMITTEE_APPROVAL_COMMUNITIES", {})
-    return {
-        cfg.get("report_number", {}).get("prefix")
-        for cfg in communities.values()
-        if cfg.get("report_number", {}).get("prefix")
-    }
-
-
 def _is_approval_report_number(value):
     """Return True if value is a valid EP/approval report number.
 
@@ -83,11 +73,7 @@ def _is_approval_report_number(value):
         return False
     if not schemes.is_approval_report_number(value):
         return False
-    # Prefix then a digit (the year), not another word like DRAFT.
-    return any(
-        re.match(rf"^{re.escape(prefix)}-\d", value)
-        for prefix in _committee_approval_prefixes()
-    )
+    return current_config_lookups.matches_committee_report_number(value)
 
 
 @dataclass(frozen=True)
@@ -95,6 +81,7 @@ class DOIMapper(MapperBase):
     """Mapper for DOI identifiers."""
 
     id = "pids"
+    source_fields = ("dois",)
 
     def filter(self, doi):
         """Filter doi based on given criteria."""
@@ -185,6 +172,8 @@ class IdentifiersMapper(MapperBase):
     """Mapper for record identifiers."""
 
     id = "metadata.identifiers"
+    source_fields = ("external_system_identifiers", "report_numbers")
+    depends_on_resource_type = False
 
     def map_value(self, src_record, ctx, logger):
         """Map identifiers from external system identifiers."""
@@ -238,6 +227,14 @@ class RelatedIdentifiersMapper(MapperBase):
     """Mapper for related identifiers."""
 
     id = "metadata.related_identifiers"
+    source_fields = (
+        "persistent_identifiers",
+        "external_system_identifiers",
+        "isbns",
+        "arxiv_eprints",
+        "report_numbers",
+        "dois",
+    )
 
     def map_value(self, src_record, ctx, logger):
         """Mapping of alternate identifiers."""
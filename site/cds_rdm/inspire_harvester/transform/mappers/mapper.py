@@ -7,8 +7,10 @@
 
 """INSPIRE to CDS harvester context module."""
 
+import time
 from abc import ABC, abstractmethod
 
+from cds_rdm.inspire_harvester.transform.timing import current_mapper_timings
 from cds_rdm.inspire_harvester.utils import build_path
 
 
@@ -17,10 +19,25 @@ class MapperBase(ABC):
 
     id: str
     returns_patch: bool = False
+    # top-level INSPIRE metadata keys read by the mapper
+    source_fields: tuple = ()
+    # whether the result depends on the resource type (or on other mappers
+    # through the context); if not, split versions reuse the main record patch
+    depends_on_resource_type: bool = True
 
     def apply(self, src_record, ctx, logger):
         """Apply the mapper to source metadata and return the result."""
-        result = self.map_value(src_record, ctx, logger)
+        timings = current_mapper_timings.get()
+        if timings is None:
+            result = self.map_value(src_record, ctx, logger)
+        else:
+            start = time.perf_counter()
+            try:
+                result = self.map_value(src_record, ctx, logger)
+            finally:
+                timings.record(
+                    self.id, ctx.resource_type, time.perf_counter() - start
+                )
         if not result:
             return
         if self.returns_patch:
@@ -34,6 +51,10 @@ class MapperBase(ABC):
         # Normal mode: wrap result under self.id
         return build_path(self.id, result)
 
+    def vocabulary_terms(self, src_record):
+        """Return the ``(vocabulary_type, term)`` pairs the mapper looks up."""
+        return ()
+
     @abstractmethod
     def map_value(self, src_record, ctx, logger):
         """Return a value (not a patch). Return None for no-op."""
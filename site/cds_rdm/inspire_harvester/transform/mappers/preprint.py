@@ -51,6 +51,7 @@ class PreprintTitleMapper(MapperBase):
     """Title mapper."""
 
     id = "metadata.title"
+    source_fields = ("titles",)
 
     def map_value(self, src_record, ctx, logger):
         """Map title value."""
@@ -69,6 +70,7 @@ class PreprintDescriptionMapper(MapperBase):
     """Description mapper."""
 
     id = "metadata.description"
+    source_fields = ("abstracts",)
 
     def map_value(self, src_record, ctx, logger):
         """Mapping of abstracts."""
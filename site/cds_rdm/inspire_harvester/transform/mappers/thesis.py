@@ -22,6 +22,7 @@ class ThesisPublicationDateMapper(MapperBase):
     """Mapper for thesis publication date."""
 
     id = "metadata.publication_date"
+    source_fields = ("imprints", "thesis_info")
 
     def map_value(self, src_record, ctx, logger):
         """Mapping of INSPIRE thesis_info.date to metadata.publication_date."""
@@ -53,6 +54,7 @@ class ThesisDefenceDateMapper(MapperBase):
     """Mapper for thesis defence date."""
 
     id = "custom_fields.thesis:thesis.defense_date"
+    source_fields = ("thesis_info",)
 
     def map_value(self, src_record, ctx, logger):
         """Apply thesis field mapping."""
@@ -67,6 +69,7 @@ class ThesisUniversityMappers(MapperBase):
     """Mapper for thesis university."""
 
     id = "custom_fields.thesis:thesis.university"
+    source_fields = ("thesis_info",)
 
     def map_value(self, src_record, ctx, logger):
         """Apply thesis field mapping."""
@@ -85,6 +88,7 @@ class ThesisTypeMappers(MapperBase):
     """Mapper for thesis type."""
 
     id = "custom_fields.thesis:thesis.type"
+    source_fields = ("thesis_info",)
 
     def map_value(self, src_record, ctx, logger):
         """Apply thesis field mapping."""
@@ -99,6 +103,7 @@ class ThesisContributorsMapper(ContributorsMapper):
     """Mapper for thesis contributors including supervisors."""
 
     id = "metadata.contributors"
+    source_fields = ("authors", "supervisors")
 
     def map_value(self, src_record, ctx, logger):
         """Map thesis contributors and supervisors."""
@@ -8,7 +8,7 @@
 """INSPIRE to CDS policies module."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 
 from cds_rdm.inspire_harvester.transform.mappers.mapper import MapperBase as Mapper
 from cds_rdm.inspire_harvester.transform.resource_types import ResourceType
@@ -49,3 +49,14 @@ class MapperPolicy:
 
         # optional: enforce stable ordering if needed
         return mappers
+
+    def mappers(self) -> List[Mapper]:
+        """Return the mappers of any resource type."""
+        mappers: List[Mapper] = [*self.base, *self.replace.values()]
+        for extra in self.add.values():
+            mappers.extend(extra)
+        return mappers
+
+    def source_fields(self) -> Set[str]:
+        """Return the INSPIRE metadata keys read by the mappers of any resource type."""
+        return {key for m in self.mappers() for key in m.source_fields}
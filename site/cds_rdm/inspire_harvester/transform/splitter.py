@@ -1,10 +1,13 @@
 """Splits a multi-doc-type INSPIRE record into per-source sub-records."""
 
+from copy import deepcopy
+
 from cds_rdm.inspire_harvester.logger import Logger
 from cds_rdm.inspire_harvester.transform.config import mapper_policy
 from cds_rdm.inspire_harvester.transform.context import MetadataSerializationContext
 from cds_rdm.inspire_harvester.transform.resource_types import (
     INSPIRE_DOCUMENT_TYPE_MAPPING,
+    ResourceType,
 )
 from cds_rdm.inspire_harvester.utils import assert_unique_ids, deep_merge_all
 
@@ -54,9 +57,45 @@ class InspireVersionSplitter:
         has_other = any(not _is_arxiv(d.get("source")) for d in sourced_fields)
         return has_arxiv and has_other
 
-    def split(self):
-        """Return [preprint_record, publication_record], or None if split is not applicable."""
+    def version_source(self, main_patches):
+        """Return what the split needs to run later, or None if it does not apply.
+
+        The source is JSON serializable, so that it can be carried on the stream
+        entry to the writer, which only builds the versions when it uses them.
+        In the same process its patches share their values with the main record,
+        which is not changed in place; ``_apply`` copies them for each version.
+        """
+        if not self.needs_split():
+            return None
+        return {
+            "record": self.inspire_record,
+            "resource_type": getattr(self.main_res_type, "value", None),
+            "cds_id": self.cds_id,
+            "patches": {
+                mapper.id: patch
+                for mapper, patch in main_patches.items()
+                if not mapper.depends_on_resource_type
+            },
+        }
+
+    def _apply(self, mapper, version_ctx, main_patches):
+        """Apply a mapper to the version, reusing the main record patch if possible.
+
+        A reused patch is copied, so that the versions share no values with the
+        main record or with each other.
+        """
+        if not mapper.depends_on_resource_type and mapper in main_patches:
+            return deepcopy(main_patches[mapper])
+        return mapper.apply(self.inspire_record, version_ctx, self.logger)
+
+    def split(self, main_patches=None):
+        """Return [preprint_record, publication_record], or None if split is not applicable.
+
+        ``main_patches`` are the patches of the main record by mapper; the ones of
+        mappers independent of the resource type are reused instead of re-mapped.
+        """
         versions = []
+        main_patches = main_patches or {}
 
         if not self.needs_split():
             return versions
@@ -80,10 +119,7 @@ class InspireVersionSplitter:
                 )
                 mappers = self.policy.build_for(resource_type)
                 assert_unique_ids(mappers)
-                patches = [
-                    m.apply(self.inspire_record, version_ctx, self.logger)
-                    for m in mappers
-                ]
+                patches = [self._apply(m, version_ctx, main_patches) for m in mappers]
 
                 out_record = deep_merge_all(patches)
                 versions.append(out_record)
@@ -92,3 +128,27 @@ class InspireVersionSplitter:
             f"resource types {[v['metadata']['resource_type']['id'] for v in versions]}"
         )
         return versions
+
+
+def split_versions(version_source, policy=mapper_policy):
+    """Build the version sub-records from a ``version_source`` of the splitter."""
+    if not version_source:
+        return []
+
+    resource_type = version_source["resource_type"]
+    resource_type = ResourceType(resource_type) if resource_type else None
+    record = version_source["record"]
+    ctx = MetadataSerializationContext(
+        resource_type=resource_type,
+        inspire_id=record.get("id"),
+        cds_rdm_id=version_source["cds_id"],
+    )
+    # the patches are keyed by id, match them to the mappers of the main record
+    patches = version_source["patches"]
+    main_patches = {
+        mapper: patches[mapper.id]
+        for mapper in policy.build_for(resource_type)
+        if mapper.id in patches
+    }
+    splitter = InspireVersionSplitter(record, ctx, version_source["cds_id"], policy)
+    return splitter.split(main_patches=main_patches)
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE to CDS harvester mapper timing module."""
+
+import threading
+from contextvars import ContextVar
+
+# timings of the harvest being processed, when it is instrumented
+current_mapper_timings = ContextVar("current_mapper_timings", default=None)
+
+
+class MapperTimings:
+    """Aggregates the time spent in each mapper, per resource type."""
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.Lock()
+        self._timings = {}
+
+    def record(self, mapper_id, resource_type, seconds):
+        """Adds a mapper call to the aggregates."""
+        key = (mapper_id, getattr(resource_type, "value", str(resource_type)))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                self._timings[key] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                timing[2] = max(timing[2], seconds)
+
+    def update(self, timings):
+        """Adds ``as_dict`` aggregates, e.g. of another process, to the aggregates."""
+        with self._lock:
+            for mapper_id, by_type in timings.items():
+                for resource_type, timing in by_type.items():
+                    current = self._timings.get((mapper_id, resource_type))
+                    if current is None:
+                        self._timings[(mapper_id, resource_type)] = [
+                            timing["count"],
+                            timing["total"],
+                            timing["max"],
+                        ]
+                    else:
+                        current[0] += timing["count"]
+                        current[1] += timing["total"]
+                        current[2] = max(current[2], timing["max"])
+
+    def as_dict(self):
+        """Returns the aggregates as ``{mapper_id: {resource_type: timing}}``."""
+        with self._lock:
+            items = list(self._timings.items())
+        timings = {}
+        for (mapper_id, resource_type), (count, total, max_) in items:
+            timings.setdefault(mapper_id, {})[resource_type] = {
+                "count": count,
+                "total": total,
+                "max": max_,
+            }
+        return timings
+
+
+def merge_timings(timings, other):
+    """Returns the sum of two ``MapperTimings.as_dict`` aggregates."""
+    merged = {mapper_id: dict(by_type) for mapper_id, by_type in timings.items()}
+    for mapper_id, by_type in other.items():
+        for resource_type, timing in by_type.items():
+            current = merged.setdefault(mapper_id, {}).get(resource_type)
+            if current is None:
+                merged[mapper_id][resource_type] = dict(timing)
+                continue
+            merged[mapper_id][resource_type] = {
+                "count": current["count"] + timing["count"],
+                "total": current["total"] + timing["total"],
+                "max": max(current["max"], timing["max"]),
+            }
+    return merged
+
+
+def timing_rows(timings):
+    """Returns the aggregates as rows, slowest mapper first."""
+    rows = [
+        {
+            "mapper": mapper_id,
+            "resource_type": resource_type,
+            "count": timing["count"],
+            "total": timing["total"],
+            "mean": timing["total"] / timing["count"] if timing["count"] else 0,
+            "max": timing["max"],
+        }
+        for mapper_id, by_type in timings.items()
+        for resource_type, timing in by_type.items()
+    ]
+    return sorted(rows, key=lambda row: row["total"], reverse=True)
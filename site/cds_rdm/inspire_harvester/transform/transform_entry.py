@@ -6,7 +6,6 @@
 # the terms of the MIT License; see LICENSE file for more details.
 
 """Transform RDM entry."""
-from copy import deepcopy
 
 from flask import current_app
 from invenio_access.permissions import system_user_id
@@ -42,9 +41,9 @@ class RDMEntry:
         self.errors.extend(self.transformer.ctx.errors)
         return record
 
-    def _versions(self):
-        versions = self.splitter.split()
-        return versions
+    def _version_source(self):
+        """Source of the version sub-records, only built when the writer needs them."""
+        return self.splitter.version_source(self.transformer.patches)
 
     def _files(self, record):
         """Transformation of files."""
@@ -105,8 +104,8 @@ class RDMEntry:
             f"[inspire_id={inspire_id}] Building CDS-RDM entry record finished. "
         )
 
-        versions = self._versions()
-        return rdm_record, versions, self.cds_id, self.errors
+        version_source = self._version_source()
+        return rdm_record, version_source, self.cds_id, self.errors
 
 
 class Inspire2RDM:
@@ -117,6 +116,8 @@ class Inspire2RDM:
     ):
         """Initializes the Inspire2RDM class."""
         self.policy = policy
+        # patches of the last transformation, by mapper
+        self.patches = {}
 
         self.inspire_record = inspire_record
         self.inspire_original_metadata = inspire_record["metadata"]
@@ -141,8 +142,12 @@ class Inspire2RDM:
         self.inspire_record["metadata"] = self.inspire_metadata
 
     def _clean_data(self, src_metadata):
-        """Cleans the input data."""
-        metadata = deepcopy(src_metadata)
+        """Cleans the input data.
+
+        Only the cleaned fields are replaced, the others are shared with the
+        source metadata, which the mappers never modify.
+        """
+        metadata = dict(src_metadata)
         self._clean_identifiers(metadata)
         return metadata
 
@@ -213,6 +218,7 @@ class Inspire2RDM:
         mappers = self.policy.build_for(self.ctx.resource_type)
         assert_unique_ids(mappers)
         patches = [m.apply(self.inspire_record, self.ctx, self.logger) for m in mappers]
+        self.patches = dict(zip(mappers, patches))
 
         out_record = deep_merge_all(patches)
         return out_record
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE to CDS harvester vocabulary prefetching module."""
+
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_records_resources.proxies import current_service_registry
+
+from cds_rdm.inspire_harvester.utils import chunked
+
+# vocabulary terms resolved for the batch being transformed, as
+# ``{(vocabulary_type, term): vocabulary_id or None}``
+current_vocabulary_terms = ContextVar("current_vocabulary_terms", default=None)
+
+# vocabulary cache hits and misses of the harvest being processed
+current_vocabulary_cache_stats = ContextVar(
+    "current_vocabulary_cache_stats", default=None
+)
+
+# maximum number of terms per vocabulary search
+TERMS_CHUNK_SIZE = 100
+
+# number of entries per search when indexing a vocabulary
+INDEX_PAGE_SIZE = 1000
+
+# maximum number of entries of an indexed vocabulary
+INDEX_MAX_ENTRIES = 10000
+
+
+class VocabularyCacheStats:
+    """Counts the vocabulary cache hits and misses, per vocabulary type."""
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, vocab_type, hit):
+        """Adds a cache lookup to the counts."""
+        with self._lock:
+            counts = self._counts.setdefault(vocab_type, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def update(self, stats):
+        """Adds ``as_dict`` counts, e.g. of another process, to the counts."""
+        with self._lock:
+            for vocab_type, counts in stats.items():
+                current = self._counts.setdefault(vocab_type, [0, 0])
+                current[0] += counts["hits"]
+                current[1] += counts["misses"]
+
+    def as_dict(self):
+        """Returns the counts as ``{vocabulary_type: {"hits": n, "misses": n}}``."""
+        with self._lock:
+            return {
+                vocab_type: {"hits": hits, "misses": misses}
+                for vocab_type, (hits, misses) in self._counts.items()
+            }
+
+
+def merge_cache_stats(stats, other):
+    """Returns the sum of two ``VocabularyCacheStats.as_dict`` counts."""
+    merged = {vocab_type: dict(counts) for vocab_type, counts in stats.items()}
+    for vocab_type, counts in other.items():
+        current = merged.setdefault(vocab_type, {"hits": 0, "misses": 0})
+        current["hits"] += counts["hits"]
+        current["misses"] += counts["misses"]
+    return merged
+
+
+def cache_stats_rows(stats):
+    """Returns the counts as rows, by vocabulary type."""
+    rows = []
+    for vocab_type, counts in sorted(stats.items()):
+        lookups = counts["hits"] + counts["misses"]
+        rows.append(
+            {
+                "vocabulary": vocab_type,
+                "hits": counts["hits"],
+                "misses": counts["misses"],
+                "hit_rate": counts["hits"] / lookups if lookups else 0,
+            }
+        )
+    return rows
+
+
+class VocabularyCache:
+    """Bounded cache of vocabulary lookups with expiry, per vocabulary type.
+
+    Lookups of terms not found in the vocabulary are cached as well. The size
+    and time to live are read from ``INSPIRE_HARVESTER_VOCABULARY_CACHE_SIZE``
+    and ``INSPIRE_HARVESTER_VOCABULARY_CACHE_TTL``.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, vocab_type, key):
+        """Return ``(True, value)`` for a cached lookup, ``(False, None)`` if not."""
+        found, value = False, None
+        with self._lock:
+            entries = self._entries.get(vocab_type)
+            cached = entries.get(key) if entries else None
+            if cached is not None:
+                expires, value = cached
+                if expires > time.monotonic():
+                    entries.move_to_end(key)
+                    found = True
+                else:
+                    del entries[key]
+                    value = None
+        stats = current_vocabulary_cache_stats.get()
+        if stats is not None:
+            stats.record(vocab_type, found)
+        return found, value
+
+    def set(self, vocab_type, key, value):
+        """Cache the value of a lookup, evicting the least recently used one."""
+        maxsize = current_app.config["INSPIRE_HARVESTER_VOCABULARY_CACHE_SIZE"]
+        if not maxsize:
+            return
+        ttl = current_app.config["INSPIRE_HARVESTER_VOCABULARY_CACHE_TTL"]
+        with self._lock:
+            entries = self._entries.setdefault(vocab_type, OrderedDict())
+            entries[key] = (time.monotonic() + ttl, value)
+            entries.move_to_end(key)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+
+    def clear(self, vocab_type=None):
+        """Drop the cached lookups of a vocabulary type, or of all of them."""
+        with self._lock:
+            if vocab_type is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(vocab_type, None)
+
+
+class VocabularyIndex:
+    """In-memory index of the ids and aliases of small vocabularies.
+
+    The vocabulary types listed in ``INSPIRE_HARVESTER_VOCABULARY_INDEX_TYPES``
+    are loaded on their first lookup, then matched like
+    ``get_vocabulary_exact`` without searching. An index is loaded again
+    after ``INSPIRE_HARVESTER_VOCABULARY_CACHE_TTL`` seconds.
+    """
+
+    def __init__(self):
+        """Constructor."""
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def _load(self, vocab_type):
+        """Return the ids and the ids of each alias of a vocabulary type."""
+        service = current_service_registry.get("vocabularies")
+        ids = set()
+        aliases = {}
+        page = 1
+        while True:
+            result = service.search(
+                system_identity, type=vocab_type, size=INDEX_PAGE_SIZE, page=page
+            )
+            if result.total > INDEX_MAX_ENTRIES:
+                raise ValueError(f"Too many entries to index ({result.total}).")
+            hits = list(result.hits)
+            for hit in hits:
+                ids.add(hit["id"])
+                for alias in _aliases(hit):
+                    aliases.setdefault(alias, set()).add(hit["id"])
+            if not hits or page * INDEX_PAGE_SIZE >= result.total:
+                return ids, aliases
+            page += 1
+
+    def _index(self, vocab_type):
+        """Return the ids and aliases of a vocabulary type, loading them if needed.
+
+        Returns ``(None, None)`` when the vocabulary cannot be loaded, until
+        the next attempt.
+        """
+        with self._lock:
+            index = self._indexes.get(vocab_type)
+            if index is not None and index[0] > time.monotonic():
+                return index[1:]
+        try:
+            ids, aliases = self._load(vocab_type)
+        except Exception as e:
+            current_app.logger.error(
+                f"Failed vocabulary indexing of '{vocab_type}'. | details: error={e}"
+            )
+            ids, aliases = None, None
+        ttl = current_app.config["INSPIRE_HARVESTER_VOCABULARY_CACHE_TTL"]
+        with self._lock:
+            self._indexes[vocab_type] = (time.monotonic() + ttl, ids, aliases)
+        return ids, aliases
+
+    def lookup(self, vocab_type, term):
+        """Return ``(True, vocabulary_id)`` for an indexed type, else ``(False, None)``.
+
+        The vocabulary id is None when the term was not found. Types whose
+        index cannot be loaded are treated as not indexed.
+        """
+        if vocab_type not in current_app.config[
+            "INSPIRE_HARVESTER_VOCABULARY_INDEX_TYPES"
+        ]:
+            return False, None
+        ids, aliases = self._index(vocab_type)
+        if ids is None:
+            return False, None
+
+        if term in ids:
+            return True, term
+        normalized = _normalize_term(term)
+        if normalized in ids:
+            return True, normalized
+        alias_ids = aliases.get(term, ())
+        if len(alias_ids) == 1:
+            return True, next(iter(alias_ids))
+        return True, None
+
+    def clear(self, vocab_type=None):
+        """Drop the index of a vocabulary type, or of all of them."""
+        with self._lock:
+            if vocab_type is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(vocab_type, None)
+
+
+# lookups cached by the harvester process
+vocabulary_cache = VocabularyCache()
+
+# vocabularies indexed by the harvester process
+vocabulary_index = VocabularyIndex()
+
+
+def clear_vocabulary_cache(sender, record=None, **kwargs):
+    """Drop the cached lookups and the index of the vocabulary of a changed record.
+
+    Connected to the record insert, update and delete signals.
+    """
+    from invenio_vocabularies.records.api import Vocabulary
+
+    if isinstance(record, Vocabulary):
+        vocab_type = getattr(record.type, "id", None)
+        vocabulary_cache.clear(vocab_type)
+        vocabulary_index.clear(vocab_type)
+
+
+def prefetched_vocabulary_id(vocab_type, term):
+    """Return ``(True, vocabulary_id)`` for a prefetched term, ``(False, None)`` if not.
+
+    The vocabulary id is None when the term was not found.
+    """
+    resolved = current_vocabulary_terms.get()
+    if resolved is None or (vocab_type, term) not in resolved:
+        return False, None
+    return True, resolved[(vocab_type, term)]
+
+
+def collect_vocabulary_terms(src_records):
+    """Return the vocabulary terms looked up by the mappers, by vocabulary type."""
+    from cds_rdm.inspire_harvester.transform.config import mapper_policy
+
+    mappers = mapper_policy.mappers()
+    terms = {}
+    for src_record in src_records:
+        for mapper in mappers:
+            for vocab_type, term in mapper.vocabulary_terms(src_record):
+                terms.setdefault(vocab_type, set()).add(term)
+    return terms
+
+
+def _normalize_term(term):
+    """Return the upper-case form of a term, without hyphens."""
+    return term.upper().replace("-", "")
+
+
+def _aliases(hit):
+    """Return the aliases of a vocabulary entry."""
+    aliases = (hit.get("props") or {}).get("aliases") or []
+    return aliases if isinstance(aliases, list) else [aliases]
+
+
+def _quote(term):
+    """Quote a term for a query string."""
+    escaped = term.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _search_terms(vocab_type, field, terms):
+    """Search the vocabulary entries with one of the terms in a field."""
+    service = current_service_registry.get("vocabularies")
+    query = " OR ".join(_quote(term) for term in terms)
+    return service.search(
+        system_identity,
+        type=vocab_type,
+        q=f"{field}:({query})",
+        size=2 * len(terms),
+    )
+
+
+def _resolve_chunk(vocab_type, terms):
+    """Resolve terms like ``get_vocabulary_exact``, with two searches at most."""
+    normalized = {term: _normalize_term(term) for term in terms}
+    result = _search_terms(vocab_type, "id", sorted({*terms, *normalized.values()}))
+    found = {hit["id"] for hit in result.hits}
+
+    resolved = {}
+    missing = []
+    for term in terms:
+        if term in found:
+            resolved[(vocab_type, term)] = term
+        elif normalized[term] in found:
+            resolved[(vocab_type, term)] = normalized[term]
+        else:
+            missing.append(term)
+    if not missing:
+        return resolved
+
+    result = _search_terms(vocab_type, "props.aliases.keyword", missing)
+    hits = list(result.hits)
+    if result.total > len(hits):
+        # truncated, the missing terms are looked up one by one by the mappers
+        return resolved
+    alias_ids = {}
+    for hit in hits:
+        for alias in _aliases(hit):
+            alias_ids.setdefault(alias, []).append(hit["id"])
+    for term in missing:
+        ids = alias_ids.get(term, [])
+        resolved[(vocab_type, term)] = ids[0] if len(ids) == 1 else None
+    return resolved
+
+
+def resolve_vocabulary_terms(terms, logger):
+    """Resolve the terms of each vocabulary type with a few batched searches.
+
+    Returns ``{(vocabulary_type, term): vocabulary_id or None}``. Terms of
+    indexed vocabularies or already in the vocabulary cache are not searched,
+    the others are cached.
+    Terms whose search failed are left out, so that the mappers look them up
+    themselves.
+    """
+    resolved = {}
+    for vocab_type, type_terms in terms.items():
+        uncached = []
+        for term in sorted(type_terms):
+            indexed, vocab_id = vocabulary_index.lookup(vocab_type, term)
+            if indexed:
+                resolved[(vocab_type, term)] = vocab_id
+                continue
+            cached, vocab_id = vocabulary_cache.get(vocab_type, ("exact", term))
+            if cached:
+                resolved[(vocab_type, term)] = vocab_id
+            else:
+                uncached.append(term)
+        for chunk in chunked(uncached, TERMS_CHUNK_SIZE):
+            try:
+                chunk_resolved = _resolve_chunk(vocab_type, chunk)
+            except Exception as e:
+                logger.error(
+                    f"Failed vocabulary prefetch in '{vocab_type}'. "
+                    f"| details: terms={len(chunk)}, error={e}"
+                )
+                continue
+            for (_, term), vocab_id in chunk_resolved.items():
+                vocabulary_cache.set(vocab_type, ("exact", term), vocab_id)
+            resolved.update(chunk_resolved)
+    return resolved
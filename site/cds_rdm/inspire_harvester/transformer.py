@@ -6,10 +6,32 @@
 # the terms of the MIT License; see LICENSE file for more details.
 
 """Transformer module."""
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 from flask import current_app
+from invenio_app.factory import create_app
+from invenio_jobs.logging.jobs import EMPTY_JOB_CTX, job_context
+from invenio_vocabularies.datastreams.errors import TransformerError
+from invenio_vocabularies.datastreams.factories import TransformerFactory
 from invenio_vocabularies.datastreams.transformers import BaseTransformer
 
+from .transform.affiliations import (
+    current_affiliation_index,
+    current_affiliation_paths,
+    load_affiliation_index,
+)
+from .transform.mappers.funding import current_funding_resolutions
+from .transform.timing import MapperTimings, current_mapper_timings
 from .transform.transform_entry import RDMEntry
+from .transform.vocabularies import (
+    VocabularyCacheStats,
+    current_vocabulary_cache_stats,
+    current_vocabulary_terms,
+)
+from .utils import source_hash
 
 
 class InspireJsonTransformer(BaseTransformer):
@@ -25,8 +47,14 @@ class InspireJsonTransformer(BaseTransformer):
         current_app.logger.info("Start transformation of INSPIRE record to CDS record.")
         # assign original source record to the stream entry
         stream_entry.source_entry = stream_entry.entry
+        # hash the source before the build cleans up the INSPIRE metadata
+        entry_hash = (
+            source_hash(stream_entry.entry)
+            if current_app.config["INSPIRE_HARVESTER_SKIP_UNCHANGED"]
+            else None
+        )
         entry_builder = RDMEntry(stream_entry.entry)
-        rdm_entry, versions, cds_id, errors = entry_builder.build()
+        rdm_entry, version_source, cds_id, errors = entry_builder.build()
 
         if errors:
             # Stable, id-prefixed reasons — skip logs wrap this list as-is.
@@ -36,6 +64,146 @@ class InspireJsonTransformer(BaseTransformer):
                 f"[INSPIRE#{control_number}] {error}" for error in unique_errors
             )
 
-        rdm_entry["_inspire_ctx"] = {"cds_id": cds_id, "versions": versions}
+        rdm_entry["_inspire_ctx"] = {
+            "cds_id": cds_id,
+            # versions are split by the writer, only if it needs them
+            "version_source": version_source,
+            "source_hash": entry_hash,
+        }
         stream_entry.entry = rdm_entry
         return stream_entry
+
+
+# transformer of the current pool worker process
+_pool_transformer = None
+
+
+def _init_pool_worker(transformer_config, affiliation_index=False):
+    """Initialise a pool worker with its own application and transformer.
+
+    The worker loads its own legacy affiliation index if the harvest has one.
+    """
+    global _pool_transformer
+    app = create_app()
+    app.app_context().push()
+    _pool_transformer = TransformerFactory.create(transformer_config)
+    if affiliation_index:
+        current_affiliation_index.set(load_affiliation_index())
+
+
+def _pool_transform(
+    stream_entry,
+    job_ctx=None,
+    timed=False,
+    vocabulary_terms=None,
+    funding_resolutions=None,
+):
+    """Transform an entry in a pool worker.
+
+    Returns it with its mapper timings, vocabulary cache counts and
+    affiliation path counts.
+    """
+    timings = MapperTimings() if timed else None
+    cache_stats = VocabularyCacheStats() if timed else None
+    affiliation_paths = Counter() if timed else None
+    timings_token = current_mapper_timings.set(timings)
+    cache_token = current_vocabulary_cache_stats.set(cache_stats)
+    paths_token = current_affiliation_paths.set(affiliation_paths)
+    terms_token = current_vocabulary_terms.set(vocabulary_terms)
+    funding_token = current_funding_resolutions.set(funding_resolutions)
+    job_ctx_token = job_context.set(job_ctx) if job_ctx else None
+    try:
+        stream_entry = _pool_transformer.apply(stream_entry)
+    except TransformerError as err:
+        # same as the data stream does for transformers applied in process
+        stream_entry.errors.append(f"{_pool_transformer.__class__.__name__}: {err}")
+    finally:
+        if job_ctx_token:
+            job_context.reset(job_ctx_token)
+        current_funding_resolutions.reset(funding_token)
+        current_vocabulary_terms.reset(terms_token)
+        current_affiliation_paths.reset(paths_token)
+        current_vocabulary_cache_stats.reset(cache_token)
+        current_mapper_timings.reset(timings_token)
+    if not timed:
+        return stream_entry, None, None, None
+    return (
+        stream_entry,
+        timings.as_dict(),
+        cache_stats.as_dict(),
+        dict(affiliation_paths),
+    )
+
+
+class InspirePoolTransformer(BaseTransformer):
+    """Applies a transformer in a pool of worker processes.
+
+    Mapping INSPIRE records is CPU bound, the pool spreads it over several
+    cores. Each worker process runs its own application, in which it creates
+    the wrapped ``transformer`` from its config. Batches of entries are
+    transformed in the pool with ``apply_many`` (see ``InspireDataStream``),
+    single entries in the current process.
+    """
+
+    def __init__(self, transformer, workers=2, chunksize=10, *args, **kwargs):
+        """Initializes the transformer."""
+        self._transformer_config = transformer
+        self._transformer = TransformerFactory.create(transformer)
+        self._workers = workers
+        self._chunksize = chunksize
+        self._pool = None
+        super().__init__(*args, **kwargs)
+
+    def apply(self, stream_entry, *args, **kwargs):
+        """Applies the wrapped transformation to the entry in the current process."""
+        return self._transformer.apply(stream_entry, *args, **kwargs)
+
+    def apply_many(self, stream_entries):
+        """Applies the wrapped transformation to the entries in the pool.
+
+        Returns the transformed entries in the order of ``stream_entries``.
+        Transformer errors are added to the errors of their entry.
+        """
+        if self._pool is None:
+            # spawn, forked workers would share the connections of the app
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_pool_worker,
+                initargs=(
+                    self._transformer_config,
+                    current_affiliation_index.get() is not None,
+                ),
+            )
+        job_ctx = job_context.get()
+        timings = current_mapper_timings.get()
+        cache_stats = current_vocabulary_cache_stats.get()
+        affiliation_paths = current_affiliation_paths.get()
+        results = self._pool.map(
+            partial(
+                _pool_transform,
+                job_ctx=None if job_ctx is EMPTY_JOB_CTX else dict(job_ctx),
+                timed=timings is not None,
+                vocabulary_terms=current_vocabulary_terms.get(),
+                funding_resolutions=current_funding_resolutions.get(),
+            ),
+            stream_entries,
+            chunksize=self._chunksize,
+        )
+
+        transformed_entries = []
+        for stream_entry, entry_timings, entry_cache_stats, entry_paths in results:
+            if entry_timings:
+                timings.update(entry_timings)
+            if entry_cache_stats and cache_stats is not None:
+                cache_stats.update(entry_cache_stats)
+            if entry_paths and affiliation_paths is not None:
+                affiliation_paths.update(entry_paths)
+            transformed_entries.append(stream_entry)
+        return transformed_entries
+
+    def close(self):
+        """Shuts the worker processes down."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
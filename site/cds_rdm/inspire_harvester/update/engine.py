@@ -85,7 +85,11 @@ class UpdateEngine:
             logger.debug(str(conflict.details))
 
     def update(self, current, incoming, ctx, logger):
-        """Apply all strategies and return the merged UpdateResult."""
+        """Apply all strategies and return the merged UpdateResult.
+
+        ``current`` is copied once; the strategies copy only the dicts along
+        their path, and never change the values they share with their input.
+        """
         updated = copy.deepcopy(current)
         conflicts = []
         warnings = []
@@ -11,7 +11,7 @@ import copy
 
 from cds_rdm.inspire_harvester.update.engine import UpdateConflict, UpdateResult
 from cds_rdm.inspire_harvester.update.field import FieldUpdateBase
-from cds_rdm.inspire_harvester.utils import get_path, set_path
+from cds_rdm.inspire_harvester.utils import get_path, replace_path
 
 
 class OverwriteFieldUpdate(FieldUpdateBase):
@@ -23,8 +23,7 @@ class OverwriteFieldUpdate(FieldUpdateBase):
         if inc_v is None:
             return UpdateResult(updated=current)
 
-        updated = copy.deepcopy(current)
-        set_path(updated, path, copy.deepcopy(inc_v))
+        updated = replace_path(current, path, copy.deepcopy(inc_v))
         return UpdateResult(updated=updated, audit=[f"{path}: overwritten"])
 
 
@@ -47,8 +46,7 @@ class PreferCurrentMergeDictUpdate(FieldUpdateBase):
             return UpdateResult(updated=current)
 
         if cur_v is None:
-            updated = copy.deepcopy(current)
-            set_path(updated, path, copy.deepcopy(inc_v))
+            updated = replace_path(current, path, copy.deepcopy(inc_v))
             return UpdateResult(updated=updated)
 
         if not isinstance(cur_v, dict) or not isinstance(inc_v, dict):
@@ -72,8 +70,7 @@ class PreferCurrentMergeDictUpdate(FieldUpdateBase):
             if k not in merged or merged[k] in (None, "", [], {}):
                 merged[k] = copy.deepcopy(v)
 
-        updated = copy.deepcopy(current)
-        set_path(updated, path, merged)
+        updated = replace_path(current, path, merged)
         return UpdateResult(updated=updated, audit=[f"{path}: merged dict"])
 
 
@@ -162,6 +159,5 @@ class ListOfDictAppendUniqueUpdate(FieldUpdateBase):
             idx_by_key[k] = len(updated_list) - 1
             audit.append(f"{path}: appended item {self.key_field}={k!r}")
 
-        updated = copy.deepcopy(current)
-        set_path(updated, path, updated_list)
+        updated = replace_path(current, path, updated_list)
         return UpdateResult(updated=updated, conflicts=conflicts, audit=audit)
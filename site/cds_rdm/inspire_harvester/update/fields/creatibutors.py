@@ -12,7 +12,7 @@ import re
 
 from cds_rdm.inspire_harvester.update.engine import UpdateConflict, UpdateResult
 from cds_rdm.inspire_harvester.update.field import FieldUpdateBase
-from cds_rdm.inspire_harvester.utils import get_path, set_path
+from cds_rdm.inspire_harvester.utils import get_path, replace_path
 
 
 def _normalize_affiliation_name(name):
@@ -42,7 +42,8 @@ class CreatibutorsFieldUpdate(FieldUpdateBase):
         cur_list = cur_list or []
         inc_list = inc_list or []
 
-        out = list(copy.deepcopy(cur_list))
+        # current entries are replaced, never changed, no need to copy them
+        out = list(cur_list)
         # Track exact names and normalised names for existing entries.
         exact_seen = {
             a.get("name") for a in out if isinstance(a, dict) and a.get("name")
@@ -93,8 +94,15 @@ class CreatibutorsFieldUpdate(FieldUpdateBase):
         )
 
     def _merge_creator(self, cur, inc):
-        """Merge a single current creator entry with its incoming counterpart."""
-        merged = copy.deepcopy(inc)
+        """Merge a single current creator entry with its incoming counterpart.
+
+        The merged entry shares no value with ``inc``, and shares with ``cur``
+        only values it does not change.
+        """
+        merged = {
+            k: v if k in ("affiliations", "person_or_org") else copy.deepcopy(v)
+            for k, v in inc.items()
+        }
 
         # Affiliations: union, never remove
         if "affiliations" in cur or "affiliations" in inc:
@@ -110,7 +118,7 @@ class CreatibutorsFieldUpdate(FieldUpdateBase):
             if k == "identifiers":
                 continue
             if k not in mp or mp[k] in (None, "", [], {}):
-                mp[k] = copy.deepcopy(v)
+                mp[k] = v
 
         # union identifiers
         seen = {
@@ -119,7 +127,7 @@ class CreatibutorsFieldUpdate(FieldUpdateBase):
         for i in cur_p.get("identifiers", []) or []:
             key = (i.get("scheme"), i.get("identifier"))
             if key not in seen:
-                mp.setdefault("identifiers", []).append(copy.deepcopy(i))
+                mp.setdefault("identifiers", []).append(i)
 
         merged["person_or_org"] = mp
         return merged
@@ -132,7 +140,8 @@ class CreatibutorsFieldUpdate(FieldUpdateBase):
         if inc_list is None:
             return UpdateResult(updated=current)
 
-        updated_list = copy.deepcopy(cur_list)
+        # entries are replaced, never changed, no need to copy them
+        updated_list = list(cur_list)
         conflicts = []
         warnings = []
         audit = []
@@ -177,8 +186,7 @@ class CreatibutorsFieldUpdate(FieldUpdateBase):
             updated_list[idx] = self._merge_creator(cur_list[idx], inc)
             audit.append(f"{path}: merged creator {k}")
 
-        updated = copy.deepcopy(current)
-        set_path(updated, path, updated_list)
+        updated = replace_path(current, path, updated_list)
         return UpdateResult(
             updated=updated, conflicts=conflicts, warnings=warnings, audit=audit
         )
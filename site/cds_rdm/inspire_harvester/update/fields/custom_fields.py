@@ -11,7 +11,7 @@ import copy
 
 from cds_rdm.inspire_harvester.update.engine import UpdateConflict, UpdateResult
 from cds_rdm.inspire_harvester.update.field import FieldUpdateBase
-from cds_rdm.inspire_harvester.utils import get_path, set_path
+from cds_rdm.inspire_harvester.utils import get_path, replace_path
 
 
 class ThesisFieldUpdate(FieldUpdateBase):
@@ -57,8 +57,7 @@ class ThesisFieldUpdate(FieldUpdateBase):
                         )
                     ],
                 )
-            updated = copy.deepcopy(current)
-            set_path(updated, path, copy.deepcopy(inc_obj))
+            updated = replace_path(current, path, copy.deepcopy(inc_obj))
             return UpdateResult(updated=updated, audit=[f"{path}: set (was missing)"])
 
         # Both must be dicts to merge
@@ -84,8 +83,7 @@ class ThesisFieldUpdate(FieldUpdateBase):
                 merged[k] = copy.deepcopy(inc_obj[k])
 
         # Keep all other current keys as-is (including date_defended/date_submitted)
-        updated = copy.deepcopy(current)
-        set_path(updated, path, merged)
+        updated = replace_path(current, path, merged)
 
         changed_keys = [k for k in self.updatable_keys if k in inc_obj]
         audit = (
@@ -17,7 +17,7 @@ from cds_rdm.inspire_harvester.update.engine import (
     UpdateResult,
 )
 from cds_rdm.inspire_harvester.update.field import FieldUpdateBase
-from cds_rdm.inspire_harvester.utils import get_path, set_path
+from cds_rdm.inspire_harvester.utils import get_path, replace_path
 
 
 class IdentifiersFieldUpdate(FieldUpdateBase):
@@ -163,8 +163,7 @@ class IdentifiersFieldUpdate(FieldUpdateBase):
                     f"WARNING {path}: current has schemes not present in incoming: {extra}"
                 )
 
-        updated = copy.deepcopy(current)
-        set_path(updated, path, updated_list)
+        updated = replace_path(current, path, updated_list)
         return UpdateResult(updated=updated, conflicts=conflicts, audit=audit)
 
 
@@ -315,6 +314,5 @@ class RelatedIdentifiersUpdate(FieldUpdateBase):
                 f"(incoming may have removed {len(cur_list) - len(inc_list)} related_identifiers)"
             )
 
-        updated = copy.deepcopy(current)
-        set_path(updated, path, updated_list)
+        updated = replace_path(current, path, updated_list)
         return UpdateResult(updated=updated, conflicts=conflicts, audit=audit)
@@ -7,13 +7,11 @@
 
 """Field update strategies for core metadata fields."""
 
-import copy
-
 import dateparser
 
 from cds_rdm.inspire_harvester.update.engine import UpdateConflict, UpdateResult
 from cds_rdm.inspire_harvester.update.field import FieldUpdateBase
-from cds_rdm.inspire_harvester.utils import get_path, set_path
+from cds_rdm.inspire_harvester.utils import get_path, replace_path
 
 
 class PublicationDateUpdate(FieldUpdateBase):
@@ -143,8 +141,7 @@ class PublicationDateUpdate(FieldUpdateBase):
 
         # Incoming more accurate → update
         if inc_g > cur_g:
-            updated = copy.deepcopy(current)
-            set_path(updated, path, inc_v.strip())
+            updated = replace_path(current, path, inc_v.strip())
             return UpdateResult(
                 updated=updated,
                 audit=[f"{path}: updated to more accurate value ({cur_v} → {inc_v})"],
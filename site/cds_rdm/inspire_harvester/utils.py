@@ -7,7 +7,11 @@
 
 """INSPIRE to CDS harvester module."""
 
+import hashlib
+import json
+import re
 from collections import Counter
+from datetime import timedelta
 
 from invenio_access.permissions import system_identity
 from invenio_records_resources.proxies import current_service_registry
@@ -33,6 +37,9 @@ def compare_metadata(a, b):
     if isinstance(a, list) and isinstance(b, list):
         if len(a) != len(b):
             return False
+        if a == b:
+            # equal lists are equal by id too, compared without walking them
+            return True
         return all(compare_metadata(x, y) for x, y in zip(a, b))
 
     # Fallback normal comparison
@@ -67,6 +74,21 @@ def set_path(doc, path, value) -> None:
     cur[parts[-1]] = value
 
 
+def replace_path(doc, path, value):
+    """Return a copy of ``doc`` with the value at the given path replaced.
+
+    Only the dicts along the path are copied, the rest is shared with ``doc``.
+    """
+    parts = path.split(".")
+    out = dict(doc)
+    cur = out
+    for p in parts[:-1]:
+        cur[p] = dict(cur.get(p, {}))
+        cur = cur[p]
+    cur[parts[-1]] = value
+    return out
+
+
 def build_path(path, value):
     """Build nested dict from dotted path."""
     keys = path.split(".")
@@ -90,12 +112,35 @@ def deep_merge(a, b):
     return out
 
 
+def _merge_into(out, patch, owned):
+    """Merge ``patch`` into ``out`` in place.
+
+    Dicts of the patches are shared until another patch is merged into them,
+    then they are copied once; ``owned`` holds the ids of the copies.
+    """
+    for k, v in patch.items():
+        node = out.get(k)
+        if isinstance(v, dict) and isinstance(node, dict):
+            if id(node) not in owned:
+                node = out[k] = dict(node)
+                owned.add(id(node))
+            _merge_into(node, v, owned)
+        else:
+            out[k] = v
+
+
 def deep_merge_all(parts):
-    """Deep merge all parts into a single dictionary."""
+    """Deep merge all parts into a single dictionary.
+
+    Same result as folding the parts with ``deep_merge``, but in a single pass:
+    the accumulated dict is not copied for every part, and the parts are left
+    untouched.
+    """
     out = {}
+    owned = {id(out)}
     for p in parts:
         if p is not None:
-            out = deep_merge(out, p)
+            _merge_into(out, p, owned)
     return out
 
 
@@ -132,39 +177,149 @@ def _search_vocabulary_id(service, term, vocab_type):
     return None
 
 
-def get_vocabulary_exact(term, vocab_type, ctx, logger):
-    """Get vocabulary ID by exact match, with fallback to normalized term."""
-    if not term:
-        return None
+def get_vocabulary_id(term, vocab_type, ctx, logger):
+    """Get vocabulary ID by exact ID match, or None."""
+    from cds_rdm.inspire_harvester.transform.vocabularies import vocabulary_cache
 
-    service = current_service_registry.get("vocabularies")
+    cached, vocab_id = vocabulary_cache.get(vocab_type, ("id", term))
+    if cached:
+        return vocab_id
 
+    service = current_service_registry.get("vocabularies")
     try:
         vocab_id = _search_vocabulary_id(service, term, vocab_type)
+    except RequestError as e:
+        logger.error(
+            f"Failed vocabulary search in '{vocab_type}'. "
+            f"| details: term={term}, error={e}"
+        )
+        return None
+    vocabulary_cache.set(vocab_type, ("id", term), vocab_id)
+    return vocab_id
+
+
+def _search_vocabulary_exact(service, term, vocab_type):
+    """Search vocabulary by ID, normalized ID, then alias, returning the ID or None."""
+    vocab_id = _search_vocabulary_id(service, term, vocab_type)
+    if vocab_id:
+        return vocab_id
+
+    # Fallback: normalize (uppercase + strip hyphens) and search again
+    normalized = term.upper().replace("-", "")
+    if normalized != term:
+        vocab_id = _search_vocabulary_id(service, normalized, vocab_type)
         if vocab_id:
             return vocab_id
 
-        # Fallback: normalize (uppercase + strip hyphens) and search again
-        normalized = term.upper().replace("-", "")
-        if normalized != term:
-            vocab_id = _search_vocabulary_id(service, normalized, vocab_type)
-            if vocab_id:
-                return vocab_id
+    result = service.search(
+        system_identity, type=vocab_type, q=f'props.aliases.keyword:{term}'
+    )
+    if result.total == 1:
+        return list(result.hits)[0]["id"]
+    return None
 
-        result = service.search(
-            system_identity, type=vocab_type, q=f'props.aliases.keyword:{term}'
-        )
-        if result.total == 1:
-            return list(result.hits)[0]["id"]
 
-        logger.warning(
-            f"Vocabulary term not found in '{vocab_type}'. | details: term={term}"
-        )
+def get_vocabulary_exact(term, vocab_type, ctx, logger):
+    """Get vocabulary ID by exact match, with fallback to normalized term."""
+    if not term:
         return None
 
-    except Exception as e:
-        logger.error(
-            f"Failed vocabulary search in '{vocab_type}'. "
-            f"| details: term={term}, error={e}"
+    from cds_rdm.inspire_harvester.transform.vocabularies import (
+        prefetched_vocabulary_id,
+        vocabulary_cache,
+        vocabulary_index,
+    )
+
+    found, vocab_id = prefetched_vocabulary_id(vocab_type, term)
+    if not found:
+        found, vocab_id = vocabulary_index.lookup(vocab_type, term)
+    if not found:
+        found, vocab_id = vocabulary_cache.get(vocab_type, ("exact", term))
+    if not found:
+        service = current_service_registry.get("vocabularies")
+        try:
+            vocab_id = _search_vocabulary_exact(service, term, vocab_type)
+        except Exception as e:
+            logger.error(
+                f"Failed vocabulary search in '{vocab_type}'. "
+                f"| details: term={term}, error={e}"
+            )
+            return None
+        vocabulary_cache.set(vocab_type, ("exact", term), vocab_id)
+
+    if not vocab_id:
+        logger.warning(
+            f"Vocabulary term not found in '{vocab_type}'. | details: term={term}"
         )
-        return None
+    return vocab_id
+
+
+def split_date_range(since, until, days):
+    """Split the inclusive ``since``-``until`` date range into windows of ``days``.
+
+    Returns a list of inclusive ``(start, end)`` date tuples covering the range
+    without overlap; the last window may be shorter.
+    """
+    days = max(int(days), 1)
+    windows = []
+    start = since
+    while start <= until:
+        end = min(start + timedelta(days=days - 1), until)
+        windows.append((start, end))
+        start = end + timedelta(days=1)
+    return windows
+
+
+def parse_inspire_ids(value):
+    """Returns the INSPIRE ids of a list, or of a comma or whitespace separated string.
+
+    Duplicated ids are dropped, keeping the order of the first occurrences.
+    """
+    if not value:
+        return []
+    if isinstance(value, (int, str)):
+        value = re.split(r"[\s,;]+", str(value))
+    inspire_ids = [str(inspire_id).strip() for inspire_id in value]
+    invalid = [
+        inspire_id
+        for inspire_id in inspire_ids
+        if inspire_id and not inspire_id.isdigit()
+    ]
+    if invalid:
+        raise ValueError(f"Invalid INSPIRE ids: {', '.join(invalid)}.")
+    return list(dict.fromkeys(inspire_id for inspire_id in inspire_ids if inspire_id))
+
+
+def read_inspire_ids(path):
+    """Returns the INSPIRE ids listed in a text file."""
+    with open(path, encoding="utf-8") as fp:
+        return parse_inspire_ids(fp.read())
+
+
+def chunked(items, size):
+    """Yields successive lists of at most ``size`` items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def source_hash(inspire_record):
+    """Hash the part of an INSPIRE record that is read by the harvester.
+
+    Only the metadata keys used by the mappers and the rest of the pipeline are
+    hashed, so changes to other INSPIRE internal fields keep the same hash.
+    """
+    from cds_rdm.inspire_harvester.transform.config import (
+        PIPELINE_SOURCE_FIELDS,
+        SOURCE_HASH_VERSION,
+        mapper_policy,
+    )
+
+    metadata = inspire_record.get("metadata", {})
+    fields = mapper_policy.source_fields() | set(PIPELINE_SOURCE_FIELDS)
+    source = {
+        "version": SOURCE_HASH_VERSION,
+        "created": inspire_record.get("created"),
+        "metadata": {key: metadata.get(key) for key in sorted(fields)},
+    }
+    serialized = json.dumps(source, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
@@ -11,6 +11,7 @@ from copy import deepcopy
 
 from flask import current_app
 from invenio_access.permissions import system_identity
+from invenio_db import db
 from invenio_rdm_records.proxies import current_rdm_records_service
 from invenio_vocabularies.datastreams.errors import WriterError
 from invenio_vocabularies.datastreams.writers import BaseWriter
@@ -25,6 +26,11 @@ from cds_rdm.inspire_harvester.logger import (
     format_validation_error,
     hlog,
 )
+from cds_rdm.inspire_harvester.models import (
+    InspireHarvesterSourceHash,
+    SourceHashOutcomeEnum,
+)
+from cds_rdm.inspire_harvester.transform.splitter import split_versions
 from cds_rdm.inspire_harvester.update.config import (
     CDS_ORIGINAL_RECORD_UPDATE_STRATEGY_CONFIG,
     UPDATE_STRATEGY_CONFIG,
@@ -84,8 +90,23 @@ class InspireWriter(BaseWriter):
             stream_entry.errors.append(f"[inspire_id={inspire_id}] {error_message}")
 
         stream_entry.op_type = op_type
+        self._save_source_hash(stream_entry)
         return stream_entry
 
+    def _save_source_hash(self, stream_entry):
+        """Store the outcome of the entry, to skip its unchanged source later."""
+        ctx = stream_entry.entry.get("_inspire_ctx") or {}
+        if not ctx.get("source_hash"):
+            return
+        success = stream_entry.op_type and not stream_entry.errors
+        InspireHarvesterSourceHash.save(
+            stream_entry.entry["id"],
+            ctx["source_hash"],
+            SourceHashOutcomeEnum.SUCCESS if success else SourceHashOutcomeEnum.FAILED,
+            record_pid=ctx.get("record_pid"),
+        )
+        db.session.commit()
+
     @hlog
     def _route(self, stream_entry, inspire_id=None, record_pid=None, logger=None):
         """Route the entry to create or update based on existing record lookup."""
@@ -102,6 +123,7 @@ class InspireWriter(BaseWriter):
 
         elif match_result.found:
             logger.info(f"Matching record found: CDS#{match_result.record_pid}")
+            stream_entry.entry["_inspire_ctx"]["record_pid"] = match_result.record_pid
             if not self._update_record(
                 stream_entry, record_pid=match_result.record_pid
             ):
@@ -141,7 +163,8 @@ class InspireWriter(BaseWriter):
         if should_update_files and not record_dict.get("files", {}).get(
             "enabled", False
         ):
-            entry["files"]["enabled"] = True
+            # not in place, the files are shared with the version source
+            entry["files"] = {**entry["files"], "enabled": True}
 
         has_cds_doi = record.data["pids"].get("doi", {}).get("provider") == "datacite"
 
@@ -187,6 +210,12 @@ class InspireWriter(BaseWriter):
                 )
         return True
 
+    def _versions(self, ctx):
+        """Split the entry into its versions on first use."""
+        if "versions" not in ctx:
+            ctx["versions"] = split_versions(ctx.pop("version_source", None))
+        return ctx["versions"]
+
     def _resource_type_versioning(self, record, update_metadata, ctx, logger):
 
         search_result = current_rdm_records_service.scan_versions(
@@ -199,7 +228,7 @@ class InspireWriter(BaseWriter):
         logger.debug(
             f"Resource types mapped to versions {existing_record_versions.keys()}"
         )
-        for version in ctx["versions"]:
+        for version in self._versions(ctx):
             # find if version with this resource type exists
             incoming_resource_type = version["metadata"]["resource_type"]["id"]
             logger.info(f"Processing {incoming_resource_type} version")
@@ -301,6 +330,7 @@ class InspireWriter(BaseWriter):
 
         draft = self.drafts.create(entry)
         logger.info(f"New draft is created ({draft.id}).")
+        stream_entry.entry["_inspire_ctx"]["record_pid"] = draft.id
 
         try:
             if file_entries:
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE harvester data stream tests."""
+from unittest.mock import Mock, patch
+
+from invenio_vocabularies.datastreams import StreamEntry
+from invenio_vocabularies.datastreams.errors import TransformerError
+
+from cds_rdm.inspire_harvester import transformer as transformer_module
+from cds_rdm.inspire_harvester.datastream import InspireDataStream
+from cds_rdm.inspire_harvester.transform.timing import (
+    MapperTimings,
+    current_mapper_timings,
+)
+
+
+class BatchTransformer:
+    """Transformer of whole batches, failing on odd entries."""
+
+    def __init__(self):
+        """Constructor."""
+        self.batches = []
+        self.closed = False
+
+    def apply(self, stream_entry):
+        """Not used, entries are transformed by batch."""
+        raise AssertionError("Entries must be transformed by batch.")
+
+    def apply_many(self, stream_entries):
+        """Transform the entries in reverse order, and return them in order."""
+        self.batches.append([e.entry for e in stream_entries])
+        for stream_entry in reversed(stream_entries):
+            stream_entry.entry = {"id": stream_entry.entry}
+            if stream_entry.entry["id"] % 2:
+                stream_entry.errors.append(f"Odd entry {stream_entry.entry['id']}.")
+        return stream_entries
+
+    def close(self):
+        """Release the transformer."""
+        self.closed = True
+
+
+class TimedTransformer:
+    """Transformer recording a mapper call, failing on invalid entries."""
+
+    def apply(self, stream_entry):
+        """Transform the entry."""
+        current_mapper_timings.get().record("metadata.title", "thesis", 0.5)
+        if stream_entry.entry == "invalid":
+            raise TransformerError("Invalid entry.")
+        stream_entry.entry = {"id": stream_entry.entry}
+        return stream_entry
+
+
+def test_datastream_transforms_batches(running_app):
+    """Test entries are transformed by batch, keeping their order and errors."""
+    reader = Mock()
+    reader.read.side_effect = lambda item=None: iter(range(5))
+    writer = Mock()
+    writer.write.side_effect = lambda stream_entry: stream_entry
+    transformer = BatchTransformer()
+
+    ds = InspireDataStream(
+        readers=[reader], writers=[writer], transformers=[transformer], batch_size=3
+    )
+    results = list(ds.process())
+
+    assert transformer.batches == [[0, 1, 2], [3, 4]]
+    assert [r.entry["id"] for r in results if r.errors] == [1, 3]
+    assert [r.entry["id"] for r in results if not r.errors] == [0, 2, 4]
+    assert results[0].errors == ["Odd entry 1."]
+    assert transformer.closed
+
+
+def test_pool_transform(running_app):
+    """Test the pool worker keeps transformer errors and returns mapper timings."""
+    with patch.object(transformer_module, "_pool_transformer", TimedTransformer()):
+        valid, valid_timings, valid_cache_stats, valid_paths = (
+            transformer_module._pool_transform(StreamEntry("12345"), timed=True)
+        )
+        invalid, _, _, _ = transformer_module._pool_transform(
+            StreamEntry("invalid"), timed=True
+        )
+
+    assert valid.entry == {"id": "12345"} and not valid.errors
+    assert invalid.errors == ["TimedTransformer: Invalid entry."]
+    assert valid_cache_stats == {}
+    assert valid_paths == {}
+
+    timings = MapperTimings()
+    timings.update(valid_timings)
+    timings.update(valid_timings)
+    assert timings.as_dict()["metadata.title"]["thesis"]["count"] == 2
@@ -7,12 +7,37 @@
 
 """ISNPIRE harvester reader tests."""
 
+import gzip
+import io
+import json
+import threading
+import time
+import uuid
+from collections import Counter
 from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 from invenio_vocabularies.datastreams.errors import ReaderError
 
-from cds_rdm.inspire_harvester.reader import InspireHTTPReader
+from cds_rdm.inspire_harvester.models import (
+    InspireHarvesterCheckpoint,
+    InspireHarvesterDatestamp,
+    InspireHarvesterRunStats,
+    InspireHarvesterSourceHash,
+    SourceHashOutcomeEnum,
+)
+from cds_rdm.inspire_harvester.reader import (
+    AdaptivePageSize,
+    InspireDumpReader,
+    InspireHTTPReader,
+    InspireOAIReader,
+    InspireReplayReader,
+    SeenIds,
+    current_duplicate_records,
+    current_skipped_records,
+)
+from cds_rdm.inspire_harvester.utils import source_hash
 
 
 def test_reader_response_400(running_app):
@@ -62,3 +87,465 @@ def test_reader_success(running_app):
         assert "metadata" in data
         assert "id" in data
         assert "links" in data
+
+
+def test_reader_prefetch_pages(running_app):
+    """Test InspireHTTPReader follows pages through a prefetching session."""
+    pages = {
+        "https://inspirehep.net/api/literature?q=_oai.sets%3AForCDS+AND+id%3A1234": {
+            "hits": {"hits": [{"id": "1"}, {"id": "2"}], "total": 3},
+            "links": {"next": "https://inspirehep.net/api/literature?page=2"},
+        },
+        "https://inspirehep.net/api/literature?page=2": {
+            "hits": {"hits": [{"id": "3"}], "total": 3},
+            "links": {},
+        },
+    }
+
+    def mock_get(url, headers=None):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = pages[url]
+        return mock_response
+
+    with patch("cds_rdm.inspire_harvester.reader.requests.Session") as mock_session:
+        session = mock_session.return_value.__enter__.return_value
+        session.get.side_effect = mock_get
+
+        reader = InspireHTTPReader(inspire_id="1234", prefetch_pages=1)
+        records = list(reader.read())
+
+    assert [record["id"] for record in records] == ["1", "2", "3"]
+    assert session.get.call_count == 2
+
+
+def test_reader_prefetch_close(running_app):
+    """Test the prefetched request in flight is awaited before the session closes."""
+    page_2 = "https://inspirehep.net/api/literature?page=2"
+    in_flight = threading.Event()
+    events = []
+
+    def mock_get(url, headers=None):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        if url == page_2:
+            in_flight.set()
+            time.sleep(0.2)
+            events.append("fetched")
+            mock_response.json.return_value = {"hits": {"hits": []}, "links": {}}
+        else:
+            mock_response.json.return_value = {
+                "hits": {"hits": [{"id": "1"}], "total": 2},
+                "links": {"next": page_2},
+            }
+        return mock_response
+
+    with patch("cds_rdm.inspire_harvester.reader.requests.Session") as mock_session:
+        mock_session.return_value.__exit__.side_effect = (
+            lambda *args: events.append("closed")
+        )
+        session = mock_session.return_value.__enter__.return_value
+        session.get.side_effect = mock_get
+
+        reader = InspireHTTPReader(inspire_id="1234", prefetch_pages=1)
+        records = reader.read()
+        assert next(records)["id"] == "1"
+        assert in_flight.wait(timeout=5)
+        # the consumer stops while page 2 is being fetched
+        records.close()
+
+    assert events == ["fetched", "closed"]
+
+
+def test_reader_multiple_ids(running_app, caplog):
+    """Test InspireHTTPReader queries a list of INSPIRE ids in chunks."""
+    queries = []
+
+    def mock_get(url, headers=None):
+        query = parse_qs(urlparse(url).query)["q"][0]
+        queries.append(query)
+        ids = query.split("id:(")[1].rstrip(")").split(" OR ")
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "hits": {"hits": [{"id": i} for i in ids if i != "3"], "total": 2},
+            "links": {},
+        }
+        return mock_response
+
+    with patch("cds_rdm.inspire_harvester.reader.requests.get", side_effect=mock_get):
+        reader = InspireHTTPReader(inspire_id="1, 2 3\n4,4", id_chunk_size=2)
+        records = list(reader.read())
+
+    assert [record["id"] for record in records] == ["1", "2", "4"]
+    assert queries == [
+        "_oai.sets:ForCDS AND id:(1 OR 2)",
+        "_oai.sets:ForCDS AND id:(3 OR 4)",
+    ]
+    assert "not marked for CDS: 3." in caplog.text
+
+
+OAI_PAGE = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+  <responseDate>{date}</responseDate>
+  <ListIdentifiers>
+    {headers}
+    <resumptionToken>{token}</resumptionToken>
+  </ListIdentifiers>
+</OAI-PMH>"""
+
+
+def _oai_header(inspire_id, status=""):
+    """Build an OAI-PMH record header."""
+    return (
+        f'<header {status}><identifier>oai:inspirehep.net:{inspire_id}</identifier>'
+        "<datestamp>2024-01-02T00:00:00Z</datestamp></header>"
+    )
+
+
+def test_oai_reader(running_app):
+    """Test InspireOAIReader lists changed records and persists the datestamp."""
+    oai_pages = {
+        "from=2024-01-01T00%3A00%3A00Z": OAI_PAGE.format(
+            date="2024-01-03T10:00:00Z",
+            headers=_oai_header(1) + _oai_header(2, 'status="deleted"'),
+            token="page-2",
+        ),
+        "resumptionToken=page-2": OAI_PAGE.format(
+            date="2024-01-03T10:00:01Z", headers=_oai_header(3), token=""
+        ),
+    }
+    requested = []
+
+    def mock_get(url, headers=None):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        if url.startswith("http://oai.local"):
+            requested.append(url)
+            page = next(page for key, page in oai_pages.items() if key in url)
+            mock_response.content = page.encode("utf-8")
+        else:
+            inspire_id = parse_qs(urlparse(url).query)["q"][0].split("id:")[1]
+            mock_response.json.return_value = {
+                "hits": {
+                    "hits": [{"id": inspire_id, "metadata": {"document_type": []}}],
+                    "total": 1,
+                },
+                "links": {},
+            }
+        return mock_response
+
+    with patch("cds_rdm.inspire_harvester.reader.requests.get", side_effect=mock_get):
+        reader = InspireOAIReader(
+            origin="http://oai.local/oai2d",
+            since="2024-01-01T00:00:00+00:00",
+            datestamp_key="job",
+        )
+        assert [record["id"] for record in reader.read()] == ["1", "3"]
+
+    assert len(requested) == 2
+    # the datestamp is only used once the harvest has been processed
+    assert InspireHarvesterDatestamp.get_datestamp("job") is None
+    InspireHarvesterDatestamp.commit_pending("job")
+    assert InspireHarvesterDatestamp.get_datestamp("job") == "2024-01-03T10:00:00Z"
+
+
+def test_reader_retries_transient_errors(running_app):
+    """Test InspireHTTPReader retries throttled and failing INSPIRE requests."""
+    throttled = Mock(status_code=429, headers={"Retry-After": "0"})
+    unavailable = Mock(status_code=503, headers={})
+    success = Mock(status_code=200)
+    success.json.return_value = {"hits": {"hits": [{"id": "1"}], "total": 1}}
+
+    with (
+        patch("requests.get", side_effect=[throttled, unavailable, success]),
+        patch("cds_rdm.inspire_harvester.reader.time.sleep") as mock_sleep,
+    ):
+        reader = InspireHTTPReader(inspire_id="1234", retries=2, retry_backoff=1)
+        assert [record["id"] for record in reader.read()] == ["1"]
+    # Retry-After is honoured, then the backoff applies with jitter
+    assert mock_sleep.call_args_list[0].args == (0,)
+    assert 0.5 <= mock_sleep.call_args_list[1].args[0] <= 2
+
+    with (
+        patch("requests.get", return_value=throttled),
+        patch("cds_rdm.inspire_harvester.reader.time.sleep"),
+    ):
+        reader = InspireHTTPReader(inspire_id="1234", retries=2)
+        with pytest.raises(ReaderError):
+            list(reader.read())
+
+
+def test_reader_drops_duplicates(running_app, caplog):
+    """Test InspireHTTPReader drops records repeated across result pages."""
+    pages = {
+        "https://inspirehep.net/api/literature?q=_oai.sets%3AForCDS+AND+id%3A1234": {
+            "hits": {"hits": [{"id": "1"}, {"id": "2"}], "total": 3},
+            "links": {"next": "https://inspirehep.net/api/literature?page=2"},
+        },
+        # the record 2 moved to the second page while paginating
+        "https://inspirehep.net/api/literature?page=2": {
+            "hits": {"hits": [{"id": "2"}, {"id": "3"}], "total": 3},
+            "links": {},
+        },
+    }
+
+    def mock_get(url, headers=None):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = pages[url]
+        return mock_response
+
+    duplicates = Counter()
+    token = current_duplicate_records.set(duplicates)
+    try:
+        with patch(
+            "cds_rdm.inspire_harvester.reader.requests.get", side_effect=mock_get
+        ):
+            reader = InspireHTTPReader(inspire_id="1234")
+            assert [record["id"] for record in reader.read()] == ["1", "2", "3"]
+    finally:
+        current_duplicate_records.reset(token)
+
+    assert "Suppressed 1 duplicated INSPIRE records" in caplog.text
+    assert duplicates == {"2": 1}
+
+    # the count of each harvest is added to the one of its run
+    run_id = uuid.uuid4()
+    InspireHarvesterRunStats.add_duplicate_count(run_id, sum(duplicates.values()))
+    InspireHarvesterRunStats.add_duplicate_count(run_id, 2)
+    assert InspireHarvesterRunStats.get_duplicate_count(run_id) == 3
+    assert InspireHarvesterRunStats.get_duplicate_count(uuid.uuid4()) == 0
+
+
+def test_seen_ids():
+    """Test the bitmap set of INSPIRE ids."""
+    seen_ids = SeenIds()
+    assert seen_ids.add("2708123")
+    assert seen_ids.add(7)
+    assert not seen_ids.add(2708123)
+    assert not seen_ids.add("7")
+    assert seen_ids.add(8)
+
+
+def test_reader_resume_from_checkpoint(running_app):
+    """Test InspireHTTPReader resumes an interrupted harvest from its checkpoint."""
+    first_page = (
+        "https://inspirehep.net/api/literature?q=_oai.sets%3AForCDS+AND+id%3A1234"
+    )
+    pages = {
+        first_page: {
+            "hits": {"hits": [{"id": "1"}, {"id": "2"}], "total": 3},
+            "links": {"next": "https://inspirehep.net/api/literature?page=2"},
+        },
+        "https://inspirehep.net/api/literature?page=2": {
+            "hits": {"hits": [{"id": "3"}], "total": 3},
+            "links": {},
+        },
+    }
+
+    def mock_get(url, headers=None):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = pages[url]
+        return mock_response
+
+    with patch("cds_rdm.inspire_harvester.reader.requests.get", side_effect=mock_get):
+        reader = InspireHTTPReader(
+            inspire_id="1234", checkpoint_key="job", checkpoint_every=2
+        )
+        records = reader.read()
+        # the run dies while the third record is being processed
+        assert [next(records)["id"] for _ in range(3)] == ["1", "2", "3"]
+        records.close()
+
+        checkpoint = InspireHarvesterCheckpoint.get("job")
+        assert checkpoint.url == first_page
+        assert checkpoint.skip == 2
+
+        reader = InspireHTTPReader(
+            inspire_id="1234", checkpoint_key="job", checkpoint_every=2, resume=True
+        )
+        assert [record["id"] for record in reader.read()] == ["3"]
+
+
+def test_reader_skip_unchanged(running_app):
+    """Test InspireHTTPReader skips records already written from the same source."""
+    hits = [
+        {"id": str(i), "metadata": {"control_number": i, "titles": [{"title": "T"}]}}
+        for i in (1, 2, 3)
+    ]
+    InspireHarvesterSourceHash.save(
+        "1", source_hash(hits[0]), SourceHashOutcomeEnum.SUCCESS, record_pid="abc"
+    )
+    # failed writes are retried even when the source is unchanged
+    InspireHarvesterSourceHash.save(
+        "2", source_hash(hits[1]), SourceHashOutcomeEnum.FAILED
+    )
+    # a changed source is written again
+    InspireHarvesterSourceHash.save(
+        "3", "outdated", SourceHashOutcomeEnum.SUCCESS, record_pid="def"
+    )
+
+    mock_response = Mock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"hits": {"hits": hits, "total": 3}, "links": {}}
+
+    skipped = set()
+    token = current_skipped_records.set(skipped)
+    try:
+        with patch("requests.get", return_value=mock_response):
+            reader = InspireHTTPReader(since="2024-01-01", skip_unchanged=True)
+            assert [record["id"] for record in reader.read()] == ["2", "3"]
+    finally:
+        current_skipped_records.reset(token)
+    assert skipped == {"1"}
+
+    # the count of each harvest is added to the one of its run
+    run_id = uuid.uuid4()
+    InspireHarvesterRunStats.add_skipped_count(run_id, len(skipped))
+    InspireHarvesterRunStats.add_skipped_count(run_id, 2)
+    assert InspireHarvesterRunStats.get_skipped_count(run_id) == 3
+    assert InspireHarvesterRunStats.get_skipped_count(uuid.uuid4()) == 0
+
+
+def test_reader_capture_and_replay(running_app, tmp_path):
+    """Test captured INSPIRE pages are streamed back by the replay reader."""
+    pages = {
+        "https://inspirehep.net/api/literature?q=_oai.sets%3AForCDS+AND+id%3A1234": {
+            "hits": {"hits": [{"id": "1"}, {"id": "2"}], "total": 3},
+            "links": {"next": "https://inspirehep.net/api/literature?page=2"},
+        },
+        "https://inspirehep.net/api/literature?page=2": {
+            "hits": {"hits": [{"id": "3"}], "total": 3},
+            "links": {},
+        },
+    }
+
+    def mock_get(url, headers=None):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = pages[url]
+        return mock_response
+
+    with patch("cds_rdm.inspire_harvester.reader.requests.get", side_effect=mock_get):
+        reader = InspireHTTPReader(inspire_id="1234", capture_dir=str(tmp_path))
+        harvested = list(reader.read())
+
+    assert len(list(tmp_path.glob("*.jsonl.gz"))) == 2
+    replayed = list(InspireReplayReader(origin=str(tmp_path)).read())
+    assert replayed == harvested
+
+
+def test_dump_reader(running_app, tmp_path):
+    """Test InspireDumpReader yields the dump records marked for CDS."""
+    records = [
+        # bare metadata of a thesis marked for CDS
+        {
+            "control_number": 1,
+            "_oai": {"sets": ["ForCDS"]},
+            "document_type": ["thesis"],
+        },
+        # API hit of a thesis marked for CDS
+        {
+            "id": "2",
+            "created": "2024-01-01T00:00:00+00:00",
+            "metadata": {
+                "control_number": 2,
+                "_oai": {"sets": ["ForCDS"]},
+                "document_type": ["thesis"],
+            },
+        },
+        # not marked for CDS
+        {"control_number": 3, "document_type": ["thesis"]},
+        # not a thesis
+        {
+            "control_number": 4,
+            "_oai": {"sets": ["ForCDS"]},
+            "document_type": ["article"],
+        },
+    ]
+    with gzip.open(tmp_path / "literature.jsonl.gz", "wt") as fp:
+        fp.writelines(json.dumps(record) + "\n" for record in records)
+
+    reader = InspireDumpReader(origin=str(tmp_path), document_type="thesis")
+    entries = list(reader.read())
+    assert [entry["id"] for entry in entries] == ["1", "2"]
+    assert entries[0]["metadata"]["control_number"] == 1
+
+    reader = InspireDumpReader(origin=str(tmp_path / "literature.jsonl.gz"))
+    assert [entry["id"] for entry in reader.read()] == ["1", "2", "4"]
+
+
+def test_reader_stream_pages(running_app):
+    """Test InspireHTTPReader decodes hits incrementally from the response stream."""
+    pytest.importorskip("ijson")
+    pages = {
+        "https://inspirehep.net/api/literature?q=_oai.sets%3AForCDS+AND+id%3A1234": {
+            "hits": {"hits": [{"id": "1", "metadata": {"x": 1.5}}, {"id": "2"}], "total": 3},
+            "links": {"next": "https://inspirehep.net/api/literature?page=2"},
+        },
+        "https://inspirehep.net/api/literature?page=2": {
+            "hits": {"hits": [{"id": "3"}], "total": 3},
+            "links": {},
+        },
+    }
+
+    def mock_get(url, headers=None, stream=False):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.raw = io.BytesIO(json.dumps(pages[url]).encode())
+        mock_response.__enter__ = Mock(return_value=mock_response)
+        mock_response.__exit__ = Mock(return_value=False)
+        return mock_response
+
+    with patch("cds_rdm.inspire_harvester.reader.requests.Session") as mock_session:
+        session = mock_session.return_value.__enter__.return_value
+        session.get.side_effect = mock_get
+
+        reader = InspireHTTPReader(inspire_id="1234", stream_pages=True)
+        records = list(reader.read())
+
+    assert records == [
+        {"id": "1", "metadata": {"x": 1.5}},
+        {"id": "2"},
+        {"id": "3"},
+    ]
+
+
+def test_reader_stream_pages_without_ijson(running_app):
+    """Test InspireHTTPReader refuses to stream pages without the ijson extra."""
+    with patch("cds_rdm.inspire_harvester.reader.ijson", None):
+        with pytest.raises(ReaderError):
+            InspireHTTPReader(inspire_id="1234", stream_pages=True)
+
+
+def test_adaptive_page_size():
+    """Test the page size follows the response time without skipping records."""
+    page_size = AdaptivePageSize(size=64, min_size=8, max_size=256, target_seconds=5)
+    base = "https://inspirehep.net/api/literature?q=test"
+
+    # slow page: records 129-192 were read, continue at record 193 with size 32
+    assert page_size.next_url(
+        f"{base}&page=3&size=64", f"{base}&page=4&size=64", seconds=10, nbytes=1
+    ) == f"{base}&page=7&size=32"
+    # fast page: records 65-128 were read, continue at record 129 with size 128
+    assert page_size.next_url(
+        f"{base}&page=2&size=64", f"{base}&page=3&size=64", seconds=0.1, nbytes=1
+    ) == f"{base}&page=2&size=128"
+    # fast page, but 192 records cannot be split in pages of 128
+    assert page_size.next_url(
+        f"{base}&page=3&size=64", f"{base}&page=4&size=64", seconds=0.1, nbytes=1
+    ) == f"{base}&page=4&size=64"
+    # last page
+    assert page_size.next_url(f"{base}&page=3&size=64", None, 10, 1) is None
+
+
+def test_reader_project_fields(running_app):
+    """Test the harvest query only requests the fields used by the mappers."""
+    reader = InspireHTTPReader(inspire_id="1234", project_fields=True)
+    url = reader._build_url(**reader._read_params())
+    fields = parse_qs(urlparse(url).query)["fields"][0].split(",")
+
+    assert {"control_number", "titles", "authors", "thesis_info"} <= set(fields)
+    assert "references" not in fields
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the MIT License; see LICENSE file for more details.
+
+"""INSPIRE harvester tasks tests."""
+from unittest.mock import patch
+
+import pytest
+from invenio_db import db
+from invenio_jobs.logging.jobs import job_context
+from invenio_jobs.models import Job, Run, RunStatusEnum
+from marshmallow import ValidationError
+
+from cds_rdm.inspire_harvester.jobs import InspireArgsSchema
+from cds_rdm.inspire_harvester.models import InspireHarvesterDatestamp
+from cds_rdm.inspire_harvester.tasks import (
+    _commit_datestamp,
+    _commit_written_datestamp,
+    build_window_configs,
+)
+
+
+def _config(since, until):
+    """Build a minimal datastream config."""
+    return {
+        "readers": [
+            {
+                "type": "inspire-http-reader",
+                "args": {"since": since, "until": until, "document_type": "thesis"},
+            }
+        ],
+        "writers": [{"type": "async", "args": {"writer": {"type": "inspire-writer"}}}],
+    }
+
+
+def _windows(configs):
+    """Return the reader date ranges of the window configs."""
+    return [
+        (config["readers"][0]["args"]["since"], config["readers"][0]["args"]["until"])
+        for config in configs
+    ]
+
+
+def test_build_window_configs_by_days(running_app):
+    """Test that the date range is split in inclusive windows of N days."""
+    config = _config("2024-01-01T10:00:00", "2024-01-10")
+    configs = build_window_configs(config, {"days": 4})
+
+    assert _windows(configs) == [
+        ("2024-01-01T10:00:00", "2024-01-04"),
+        ("2024-01-05", "2024-01-08"),
+        ("2024-01-09", "2024-01-10"),
+    ]
+    assert all(c["readers"][0]["args"]["document_type"] == "thesis" for c in configs)
+    # the original config is left untouched
+    assert config["readers"][0]["args"]["until"] == "2024-01-10"
+
+
+def test_build_window_configs_by_size(running_app):
+    """Test that the window length is derived from the probed record count."""
+    config = _config("2024-01-01", "2024-01-10")
+    with patch(
+        "cds_rdm.inspire_harvester.tasks.InspireHTTPReader.count", return_value=250
+    ):
+        configs = build_window_configs(config, {"size": 100})
+
+    assert _windows(configs) == [
+        ("2024-01-01", "2024-01-04"),
+        ("2024-01-05", "2024-01-08"),
+        ("2024-01-09", "2024-01-10"),
+    ]
+
+
+def test_sharding_args_validation(running_app):
+    """Test that sharding requires a date range and a single strategy."""
+    schema = InspireArgsSchema()
+    schema.load({"since": "2024-01-01", "shard_days": 7})
+
+    with pytest.raises(ValidationError):
+        schema.load({"since": "2024-01-01", "shard_days": 7, "shard_size": 100})
+    with pytest.raises(ValidationError):
+        schema.load({"inspire_id": "12345", "shard_days": 7})
+
+
+def test_commit_datestamp_after_successful_writes(running_app):
+    """Test that the datestamp is only committed once the run wrote without errors."""
+    config = {"readers": [{"args": {"datestamp_key": "job"}}]}
+    job = Job(title="INSPIRE incremental harvest")
+    run = Run(job=job, queue="celery", status=RunStatusEnum.RUNNING)
+    db.session.add_all([job, run])
+    db.session.commit()
+    InspireHarvesterDatestamp.save_pending("job", "2024-01-03T10:00:00Z")
+
+    token = job_context.set({"job_id": str(job.id), "run_id": str(run.id)})
+    try:
+        # errored entries leave the datestamp pending
+        _commit_datestamp(config, errored=True)
+        assert InspireHarvesterDatestamp.get_pending_run_id("job") is None
+
+        _commit_datestamp(config, errored=False)
+        assert InspireHarvesterDatestamp.get_pending_run_id("job") == run.id
+        assert InspireHarvesterDatestamp.get_datestamp("job") is None
+    finally:
+        job_context.reset(token)
+
+    # the writes of the run are not done yet
+    _commit_written_datestamp(config)
+    assert InspireHarvesterDatestamp.get_datestamp("job") is None
+
+    run.status = RunStatusEnum.SUCCESS
+    db.session.commit()
+    _commit_written_datestamp(config)
+    assert InspireHarvesterDatestamp.get_datestamp("job") == "2024-01-03T10:00:00Z"
+    assert InspireHarvesterDatestamp.get_pending_run_id("job") is None
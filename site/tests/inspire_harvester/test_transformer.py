@@ -6,11 +6,18 @@
 # the terms of the GPL-2.0 License; see LICENSE file for more details.
 
 """INSPIRE harvester transformer tests."""
+import json
+from collections import Counter
 from unittest.mock import Mock, patch
 
 from edtf.parser.grammar import ParseException
 
 from cds_rdm.inspire_harvester.logger import Logger
+from cds_rdm.inspire_harvester.transform.affiliations import (
+    current_affiliation_index,
+    current_affiliation_paths,
+    load_affiliation_index,
+)
 from cds_rdm.inspire_harvester.transform.context import MetadataSerializationContext
 from cds_rdm.inspire_harvester.transform.mappers.basic_metadata import (
     AdditionalDescriptionsMapper,
@@ -37,8 +44,19 @@ from cds_rdm.inspire_harvester.transform.mappers.identifiers import (
     RelatedIdentifiersMapper,
 )
 from cds_rdm.inspire_harvester.transform.resource_types import ResourceType
-from cds_rdm.inspire_harvester.transform.splitter import InspireVersionSplitter
+from cds_rdm.inspire_harvester.transform.splitter import (
+    InspireVersionSplitter,
+    split_versions,
+)
+from cds_rdm.inspire_harvester.transform.timing import (
+    MapperTimings,
+    current_mapper_timings,
+    merge_timings,
+    timing_rows,
+)
 from cds_rdm.inspire_harvester.transform.transform_entry import Inspire2RDM
+from cds_rdm.inspire_harvester.utils import deep_merge_all
+from cds_rdm.legacy.models import CDSMigrationAffiliationMapping
 
 
 @patch("cds_rdm.inspire_harvester.transform.mappers.identifiers.normalize_isbn")
@@ -270,6 +288,113 @@ def test_transform_funding_missing_award_errors():
     assert "Award not found in vocabulary" in ctx.errors[0]
 
 
+def test_transform_funding_batch_resolutions():
+    """Funding entries resolved for the batch are not searched again."""
+    from cds_rdm.inspire_harvester.transform.mappers.funding import (
+        FundingMapper,
+        current_funding_resolutions,
+    )
+
+    src_metadata = {
+        "funding_info": [
+            {"agency": " European Research Council ", "grant_number": "755021"},
+            {"agency": "Unknown Funding Agency XYZ"},
+        ]
+    }
+    ctx = MetadataSerializationContext(
+        resource_type=ResourceType.OTHER, inspire_id="12345"
+    )
+    logger = Logger(inspire_id="12345")
+    src_record = {"metadata": src_metadata, "created": "2023-01-01"}
+
+    token = current_funding_resolutions.set(
+        {
+            ("european research council", "755021"): ("00k4n6c32", "00k4n6c32::755021"),
+            ("unknown funding agency xyz", ""): (None, None),
+        }
+    )
+    try:
+        with patch.object(FundingMapper, "_resolve_funder") as resolve_funder:
+            result = FundingMapper().map_value(src_record, ctx, logger)
+    finally:
+        current_funding_resolutions.reset(token)
+
+    assert not resolve_funder.called
+    assert result == [
+        {"funder": {"id": "00k4n6c32"}, "award": {"id": "00k4n6c32::755021"}}
+    ]
+    assert ctx.errors == [
+        "Funder not found in vocabulary. | details: agency=Unknown Funding Agency XYZ"
+    ]
+
+
+def test_resolve_funding_entries(running_app):
+    """Funding entries are searched once, then read from the resolution table."""
+    from cds_rdm.inspire_harvester.models import InspireHarvesterFundingResolution
+    from cds_rdm.inspire_harvester.transform.mappers import funding
+
+    src_records = [
+        {"metadata": {"funding_info": [{"agency": "ERC", "grant_number": "755021"}]}},
+        {
+            "metadata": {
+                "funding_info": [{"agency": "erc ", "project_number": "755021"}]
+            }
+        },
+    ]
+    logger = Mock()
+
+    with patch.object(
+        funding, "_search_funding", return_value=("00k4n6c32", "00k4n6c32::755021")
+    ) as search_funding:
+        resolved = funding.resolve_funding_entries(src_records, logger)
+        assert resolved == {("erc", "755021"): ("00k4n6c32", "00k4n6c32::755021")}
+        assert search_funding.call_count == 1
+
+        resolved = funding.resolve_funding_entries(src_records, logger)
+        assert resolved == {("erc", "755021"): ("00k4n6c32", "00k4n6c32::755021")}
+        assert search_funding.call_count == 1
+
+        # a change of the funder drops its resolutions
+        InspireHarvesterFundingResolution.invalidate_funder("00k4n6c32", set())
+        funding.resolve_funding_entries(src_records, logger)
+        assert search_funding.call_count == 2
+
+
+def test_invalidate_funding_resolutions(running_app):
+    """A changed funder or award only drops the resolutions it may affect."""
+    from cds_rdm.inspire_harvester.models import InspireHarvesterFundingResolution
+
+    InspireHarvesterFundingResolution.save_many(
+        {
+            ("erc", "755021"): ("00k4n6c32", "00k4n6c32::755021"),
+            ("erc", "101000"): ("00k4n6c32", None),
+            ("nsf", "101000"): (None, None),
+            ("doe", ""): (None, None),
+            ("cern", ""): ("01ggx4157", None),
+        }
+    )
+    keys = [
+        ("erc", "755021"),
+        ("erc", "101000"),
+        ("nsf", "101000"),
+        ("doe", ""),
+        ("cern", ""),
+    ]
+
+    InspireHarvesterFundingResolution.invalidate_award("00k4n6c32::101000", "101000")
+    assert set(InspireHarvesterFundingResolution.get_many(keys)) == {
+        ("erc", "755021"),
+        ("doe", ""),
+        ("cern", ""),
+    }
+
+    InspireHarvesterFundingResolution.invalidate_funder("05k8ep420", {"doe"})
+    assert set(InspireHarvesterFundingResolution.get_many(keys)) == {
+        ("erc", "755021"),
+        ("cern", ""),
+    }
+
+
 def test_transform_report_numbers_as_identifiers(running_app):
     """CERN- report numbers go to identifiers; EP prefixes use apprn."""
     from flask import current_app
@@ -643,6 +768,115 @@ def test_splitter_creates_one_version_for_duplicate_resource_types(mock_logger):
     policy.build_for.assert_called_once_with(ResourceType.REPORT)
 
 
+@patch("cds_rdm.inspire_harvester.transform.splitter.Logger")
+def test_splitter_reuses_type_independent_patches(mock_logger):
+    """Test split versions reuse the main record patches of type-independent mappers."""
+    record = {
+        "id": "12345",
+        "metadata": {
+            "document_type": ["thesis", "report"],
+            "documents": [{"source": "arxiv"}, {"source": "publisher"}],
+        },
+    }
+    ctx = MetadataSerializationContext(
+        resource_type=ResourceType.THESIS, inspire_id="12345"
+    )
+    resource_type_mapper = Mock(id="resource-type", depends_on_resource_type=True)
+    resource_type_mapper.apply.side_effect = lambda record, ctx, logger: {
+        "metadata": {"resource_type": {"id": ctx.resource_type.value}}
+    }
+    title_mapper = Mock(id="metadata.title", depends_on_resource_type=False)
+    title_patch = {"metadata": {"title": "Main Title"}}
+    policy = Mock()
+    policy.build_for.return_value = [resource_type_mapper, title_mapper]
+
+    versions = InspireVersionSplitter(record, ctx, None, policy=policy).split(
+        main_patches={
+            resource_type_mapper: {"metadata": {"resource_type": {"id": "thesis"}}},
+            title_mapper: title_patch,
+        }
+    )
+
+    assert versions == [
+        {
+            "metadata": {
+                "resource_type": {"id": ResourceType.REPORT.value},
+                "title": "Main Title",
+            }
+        }
+    ]
+    title_mapper.apply.assert_not_called()
+    resource_type_mapper.apply.assert_called_once()
+    # the main record patch is not shared with the version
+    versions[0]["metadata"]["title"] = "Changed"
+    assert title_patch == {"metadata": {"title": "Main Title"}}
+
+
+@patch("cds_rdm.inspire_harvester.transform.splitter.Logger")
+def test_splitter_version_source(mock_logger):
+    """Test the versions are split later from a serializable version source."""
+    record = {
+        "id": "12345",
+        "metadata": {
+            "document_type": ["thesis", "report"],
+            "documents": [{"source": "arxiv"}, {"source": "publisher"}],
+        },
+    }
+    ctx = MetadataSerializationContext(
+        resource_type=ResourceType.THESIS, inspire_id="12345"
+    )
+    resource_type_mapper = Mock(id="resource-type", depends_on_resource_type=True)
+    resource_type_mapper.apply.side_effect = lambda record, ctx, logger: {
+        "metadata": {"resource_type": {"id": ctx.resource_type.value}}
+    }
+    title_mapper = Mock(id="metadata.title", depends_on_resource_type=False)
+    policy = Mock()
+    policy.build_for.return_value = [resource_type_mapper, title_mapper]
+    title_patch = {"metadata": {"title": "Main Title", "subjects": [{"id": "a"}]}}
+    main_patches = {
+        resource_type_mapper: {"metadata": {"resource_type": {"id": "thesis"}}},
+        title_mapper: title_patch,
+    }
+
+    single_type = {"id": "1", "metadata": {"document_type": ["thesis"]}}
+    assert (
+        InspireVersionSplitter(single_type, ctx, None, policy=policy).version_source(
+            main_patches
+        )
+        is None
+    )
+    assert split_versions(None) == []
+
+    source = InspireVersionSplitter(
+        record, ctx, "cds-1", policy=policy
+    ).version_source(main_patches)
+    resource_type_mapper.apply.assert_not_called()
+    expected = {
+        "metadata": {
+            "resource_type": {"id": ResourceType.REPORT.value},
+            "title": "Main Title",
+            "subjects": [{"id": "a"}],
+        }
+    }
+    # split in the same process, the version shares no values with the source
+    versions = split_versions(source, policy=policy)
+    assert versions == [expected]
+    versions[0]["metadata"]["subjects"].append({"id": "b"})
+    assert title_patch["metadata"]["subjects"] == [{"id": "a"}]
+
+    # carried on the stream entry to the writer
+    source = json.loads(json.dumps(source))
+    assert source["patches"] == {
+        "metadata.title": {
+            "metadata": {"title": "Main Title", "subjects": [{"id": "a"}]}
+        }
+    }
+
+    versions = split_versions(source, policy=policy)
+    assert versions == [expected]
+    title_mapper.apply.assert_not_called()
+
+
 def test_transform_document_type_unmapped(running_app):
     """Test ResourceTypeDetector with unmapped type."""
     from cds_rdm.inspire_harvester.transform.resource_types import ResourceTypeDetector
@@ -925,6 +1159,67 @@ def test_transform_author_affiliations_with_mixed_identifiers(running_app):
     assert result == [{"name": "University of Paris"}, {"id": "01ggx4157"}]
 
 
+def test_transform_author_affiliations_with_legacy_index(running_app, db):
+    """Test non-ROR affiliations are resolved with the legacy affiliation index."""
+    db.session.add_all(
+        [
+            CDSMigrationAffiliationMapping(
+                legacy_affiliation_input="Univ. of Geneva",
+                ror_exact_match="https://ror.org/01swzsf04",
+            ),
+            CDSMigrationAffiliationMapping(
+                legacy_affiliation_input="Orsay, LAL",
+                curated_affiliation={"id": "03gc1p724"},
+            ),
+            CDSMigrationAffiliationMapping(
+                legacy_affiliation_input="Somewhere",
+                ror_not_exact_match="05a28rw58",
+            ),
+        ]
+    )
+    db.session.commit()
+    author = {
+        "affiliations": [
+            {"value": "univ.  of Geneva."},
+            {"value": "Orsay, LAL"},
+            {"value": "Somewhere"},
+            {"value": "CERN"},
+        ],
+        "affiliations_identifiers": [
+            {"value": "grid.example", "schema": "GRID"},
+            {"value": "grid.example", "schema": "GRID"},
+            {"value": "grid.example", "schema": "GRID"},
+            {"value": "https://ror.org/01ggx4157", "schema": "ROR"},
+        ],
+    }
+
+    index = load_affiliation_index()
+    paths = Counter()
+    index_token = current_affiliation_index.set(index)
+    paths_token = current_affiliation_paths.set(paths)
+    try:
+        result = CreatibutorsMapper()._transform_author_affiliations(author)
+    finally:
+        current_affiliation_paths.reset(paths_token)
+        current_affiliation_index.reset(index_token)
+
+    assert result == [
+        {"id": "01swzsf04"},
+        {"id": "03gc1p724"},
+        {"name": "Somewhere"},
+        {"id": "01ggx4157"},
+    ]
+    assert paths == {
+        "legacy_ror": 1,
+        "legacy_curated": 1,
+        "name": 1,
+        "inspire_ror": 1,
+    }
+    # a result is not shared with the index
+    result[0]["id"] = "changed"
+    assert index["univ. of geneva"][0] == {"id": "01swzsf04"}
+
+
 def test_transform_copyrights_complete(running_app):
     """Test CopyrightMapper with complete copyright info."""
     src_metadata = {
@@ -1395,3 +1690,87 @@ def test_transform_publication_date_parse_exception(mock_parse_edtf, running_app
 
     assert date is None
     assert len(ctx.errors) == 1
+
+
+def test_mapper_timings(running_app):
+    """Test mapper calls are timed per mapper and resource type."""
+    src_record = {"metadata": {"titles": [{"title": "Main Title"}]}}
+    logger = Logger(inspire_id="12345")
+    thesis_ctx = MetadataSerializationContext(
+        resource_type=ResourceType.THESIS, inspire_id="12345"
+    )
+    other_ctx = MetadataSerializationContext(
+        resource_type=ResourceType.OTHER, inspire_id="12345"
+    )
+
+    # not instrumented outside of a harvest
+    TitleMapper().apply(src_record, other_ctx, logger)
+
+    timings = MapperTimings()
+    token = current_mapper_timings.set(timings)
+    try:
+        TitleMapper().apply(src_record, thesis_ctx, logger)
+        TitleMapper().apply(src_record, thesis_ctx, logger)
+        TitleMapper().apply(src_record, other_ctx, logger)
+    finally:
+        current_mapper_timings.reset(token)
+
+    aggregates = timings.as_dict()
+    assert aggregates["metadata.title"]["publication-dissertation"]["count"] == 2
+    assert aggregates["metadata.title"]["publication-other"]["count"] == 1
+
+    merged = merge_timings(aggregates, aggregates)
+    assert merged["metadata.title"]["publication-dissertation"]["count"] == 4
+    rows = timing_rows(merged)
+    assert len(rows) == 2
+    assert rows[0]["total"] >= rows[1]["total"]
+
+
+def test_clean_data_shares_unchanged_fields(running_app):
+    """Test cleaning replaces the identifiers and shares the other fields."""
+    authors = [{"full_name": "Doe, John"}]
+    persistent_ids = [
+        {"schema": "HAL", "value": "hal-1"},
+        {"schema": "URN", "value": "u"},
+    ]
+    src_metadata = {
+        "authors": authors,
+        "external_system_identifiers": [{"schema": "OSTI", "value": "1"}],
+        "persistent_identifiers": persistent_ids,
+    }
+    detector_cls = Mock()
+    detector_cls.return_value.detect.return_value = (ResourceType.OTHER, [])
+
+    transformer = Inspire2RDM(
+        {"id": "12345", "metadata": src_metadata}, detector_cls=detector_cls
+    )
+
+    metadata = transformer.inspire_metadata
+    assert metadata["authors"] is authors
+    assert metadata["external_system_identifiers"] == []
+    assert metadata["persistent_identifiers"] == [{"schema": "URN", "value": "u"}]
+    # the source metadata is left untouched
+    assert len(src_metadata["external_system_identifiers"]) == 1
+    assert src_metadata["persistent_identifiers"] is persistent_ids
+    assert len(persistent_ids) == 2
+
+
+def test_deep_merge_all_leaves_patches_untouched():
+    """Test patches are merged into a new record without being modified."""
+    creators = [{"person_or_org": {"name": "Doe, John"}}]
+    title_patch = {"metadata": {"title": "Title"}}
+    creators_patch = {"metadata": {"creators": creators}}
+    imprint_patch = {"custom_fields": {"imprint:imprint": {"place": "Geneva"}}}
+    isbn_patch = {"custom_fields": {"imprint:imprint": {"isbn": "978-3-16"}}}
+
+    record = deep_merge_all(
+        [title_patch, None, creators_patch, imprint_patch, isbn_patch]
+    )
+
+    assert record == {
+        "metadata": {"title": "Title", "creators": creators},
+        "custom_fields": {"imprint:imprint": {"place": "Geneva", "isbn": "978-3-16"}},
+    }
+    assert record["metadata"]["creators"] is creators
+    assert title_patch == {"metadata": {"title": "Title"}}
+    assert imprint_patch == {"custom_fields": {"imprint:imprint": {"place": "Geneva"}}}
@@ -6,10 +6,27 @@
 # the terms of the GPL-2.0 License; see LICENSE file for more details.
 
 """Tests for vocabulary exact matching functionality."""
+from unittest.mock import patch
+
+from flask import current_app
+from invenio_access.permissions import system_identity
+from invenio_vocabularies.proxies import current_service as vocabulary_service
+from invenio_vocabularies.records.api import Vocabulary
+
 from cds_rdm.inspire_harvester.logger import Logger
 from cds_rdm.inspire_harvester.transform.context import MetadataSerializationContext
 from cds_rdm.inspire_harvester.transform.mappers.custom_fields import CERNFieldsMapper
 from cds_rdm.inspire_harvester.transform.resource_types import ResourceType
+from cds_rdm.inspire_harvester.transform.vocabularies import (
+    VocabularyCache,
+    VocabularyCacheStats,
+    collect_vocabulary_terms,
+    current_vocabulary_cache_stats,
+    current_vocabulary_terms,
+    resolve_vocabulary_terms,
+    vocabulary_cache,
+    vocabulary_index,
+)
 from cds_rdm.inspire_harvester.utils import get_vocabulary_exact
 
 
@@ -198,3 +215,144 @@ def test_cern_fields_mapper_mixed_results(running_app):
     assert result["cern:experiments"][0]["id"] == "ALICE"
 
     assert len(ctx.errors) == 0
+
+
+def test_resolve_vocabulary_terms(running_app):
+    """Test the terms of a batch resolve like get_vocabulary_exact."""
+    src_records = [
+        {
+            "metadata": {
+                "accelerator_experiments": [
+                    {
+                        "accelerator": "LHC",
+                        "institution": "CERN",
+                        "experiment": "alice",
+                    },
+                    {"accelerator": "UNKNOWN", "experiment": "NA-62"},
+                ]
+            }
+        },
+        {"metadata": {"accelerator_experiments": [{"experiment": "alice"}]}},
+    ]
+    terms = collect_vocabulary_terms(src_records)
+    assert terms["accelerators"] == {"CERN LHC", "UNKNOWN"}
+    assert terms["experiments"] == {"alice", "NA-62"}
+
+    resolved = resolve_vocabulary_terms(terms, Logger(inspire_id="12345"))
+
+    assert resolved == {
+        ("accelerators", "CERN LHC"): "CERN LHC",
+        ("accelerators", "UNKNOWN"): None,
+        ("experiments", "alice"): "ALICE",
+        ("experiments", "NA-62"): "NA62",
+    }
+
+    ctx = MetadataSerializationContext(
+        resource_type=ResourceType.OTHER, inspire_id="12345"
+    )
+    logger = Logger(inspire_id="12345")
+    token = current_vocabulary_terms.set(
+        {**resolved, ("experiments", "NA-62"): "NA62-PREFETCHED"}
+    )
+    try:
+        assert get_vocabulary_exact("NA-62", "experiments", ctx, logger) == (
+            "NA62-PREFETCHED"
+        )
+        assert get_vocabulary_exact("UNKNOWN", "accelerators", ctx, logger) is None
+        result = CERNFieldsMapper().map_value(src_records[0], ctx, logger)
+    finally:
+        current_vocabulary_terms.reset(token)
+
+    assert result["cern:accelerators"] == [{"id": "CERN LHC"}]
+    assert result["cern:experiments"] == [{"id": "ALICE"}, {"id": "NA62-PREFETCHED"}]
+
+
+def test_vocabulary_cache(running_app):
+    """Test the cache keeps the most recent lookups, misses included, until expired."""
+    cache = VocabularyCache()
+    stats = VocabularyCacheStats()
+    token = current_vocabulary_cache_stats.set(stats)
+    config = {"INSPIRE_HARVESTER_VOCABULARY_CACHE_SIZE": 2}
+    with patch.dict(current_app.config, config):
+        cache.set("experiments", ("exact", "alice"), "ALICE")
+        cache.set("experiments", ("exact", "UNKNOWN"), None)
+        assert cache.get("experiments", ("exact", "alice")) == (True, "ALICE")
+        cache.set("experiments", ("exact", "NA-62"), "NA62")
+        # the least recently used lookup is evicted
+        assert cache.get("experiments", ("exact", "UNKNOWN")) == (False, None)
+        assert cache.get("experiments", ("exact", "NA-62")) == (True, "NA62")
+
+        cache.set("accelerators", ("exact", "UNKNOWN"), None)
+        assert cache.get("accelerators", ("exact", "UNKNOWN")) == (True, None)
+        cache.clear("accelerators")
+        assert cache.get("accelerators", ("exact", "UNKNOWN")) == (False, None)
+        assert cache.get("experiments", ("exact", "alice")) == (True, "ALICE")
+
+        current_app.config["INSPIRE_HARVESTER_VOCABULARY_CACHE_TTL"] = -1
+        cache.set("experiments", ("exact", "alice"), "ALICE")
+        assert cache.get("experiments", ("exact", "alice")) == (False, None)
+    current_vocabulary_cache_stats.reset(token)
+
+    assert stats.as_dict() == {
+        "experiments": {"hits": 3, "misses": 2},
+        "accelerators": {"hits": 1, "misses": 1},
+    }
+
+
+def test_get_vocabulary_exact_cached(running_app):
+    """Test get_vocabulary_exact searches a term, found or not, only once."""
+    ctx = MetadataSerializationContext(
+        resource_type=ResourceType.OTHER, inspire_id="12345"
+    )
+    logger = Logger(inspire_id="12345")
+    vocabulary_cache.clear()
+    stats = VocabularyCacheStats()
+    token = current_vocabulary_cache_stats.set(stats)
+    config = {"INSPIRE_HARVESTER_VOCABULARY_INDEX_TYPES": []}
+    try:
+        with patch.dict(current_app.config, config):
+            for _ in range(2):
+                assert (
+                    get_vocabulary_exact("alice", "experiments", ctx, logger)
+                    == "ALICE"
+                )
+                assert (
+                    get_vocabulary_exact("UNKNOWN", "experiments", ctx, logger)
+                    is None
+                )
+    finally:
+        current_vocabulary_cache_stats.reset(token)
+        vocabulary_cache.clear()
+
+    assert stats.as_dict() == {"experiments": {"hits": 2, "misses": 2}}
+    assert len(ctx.errors) == 0
+
+
+def test_vocabulary_index(running_app):
+    """Test indexed vocabularies are matched in memory, and reloaded on changes."""
+    vocabulary_index.clear()
+    assert vocabulary_index.lookup("accelerators", "CERN LHC") == (True, "CERN LHC")
+    assert vocabulary_index.lookup("experiments", "alice") == (True, "ALICE")
+    assert vocabulary_index.lookup("experiments", "NA-62") == (True, "NA62")
+    assert vocabulary_index.lookup("accelerators", "SPS") == (True, None)
+    assert vocabulary_index.lookup("licenses", "cc-by-4.0") == (False, None)
+
+    vocabulary_service.create(
+        system_identity,
+        {
+            "id": "CERN SPS",
+            "title": {"en": "CERN SPS"},
+            "props": {"aliases": "SPS"},
+            "type": "accelerators",
+        },
+    )
+    Vocabulary.index.refresh()
+
+    assert vocabulary_index.lookup("accelerators", "SPS") == (True, "CERN SPS")
+    with patch.object(
+        vocabulary_index, "_load", side_effect=AssertionError("Not indexed again.")
+    ):
+        assert vocabulary_index.lookup("accelerators", "CERN SPS") == (
+            True,
+            "CERN SPS",
+        )
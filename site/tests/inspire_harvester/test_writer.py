@@ -17,6 +17,8 @@ from invenio_rdm_records.records.api import RDMRecord
 from invenio_vocabularies.datastreams import StreamEntry
 
 from cds_rdm.inspire_harvester.load.files import FileSynchronizer
+from cds_rdm.inspire_harvester.update.config import UPDATE_STRATEGY_CONFIG
+from cds_rdm.inspire_harvester.update.engine import UpdateContext, UpdateEngine
 from cds_rdm.inspire_harvester.writer import InspireWriter
 
 
@@ -756,3 +758,49 @@ def test_writer_1_existing_found_new_version_creation_failed(
     created_records.to_dict()["hits"]["hits"][0]["versions"]["index"] == 1
 
     _cleanup_record(created_records.to_dict()["hits"]["hits"][0]["id"])
+
+
+def test_update_engine_merges_creators_without_changing_inputs():
+    """Test creators are merged into a new record, the inputs are left as they are."""
+
+    def creator(i, **person):
+        return {
+            "person_or_org": {
+                "type": "personal",
+                "family_name": f"Family {i}",
+                "identifiers": [{"scheme": "inspire_author", "identifier": f"{i}"}],
+                **person,
+            },
+            "affiliations": [{"name": "CERN"}],
+        }
+
+    current = {
+        "metadata": {
+            "title": "Title",
+            "creators": [creator(i) for i in range(3)],
+        },
+    }
+    incoming = {
+        "metadata": {
+            "title": "New title",
+            "creators": [
+                creator(0),
+                {**creator(1, given_name="Given"), "affiliations": [{"name": "MIT"}]},
+                creator(2),
+            ],
+        },
+    }
+    current_copy = deepcopy(current)
+    incoming_copy = deepcopy(incoming)
+
+    result = UpdateEngine(strategies=UPDATE_STRATEGY_CONFIG).update(
+        current, incoming, UpdateContext(source="inspire_import"), Mock()
+    )
+
+    creators = result.updated["metadata"]["creators"]
+    assert result.updated["metadata"]["title"] == "New title"
+    assert creators[0] == current["metadata"]["creators"][0]
+    assert creators[1]["person_or_org"]["given_name"] == "Given"
+    assert creators[1]["affiliations"] == [{"name": "CERN"}, {"name": "MIT"}]
+    assert current == current_copy
+    assert incoming == incoming_copy
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2026 CERN.
+#
+# CDS-RDM is free software; you can redistribute it and/or modify it under
+# the terms of the GPL-2.0 License; see LICENSE file for more details.
+
+"""Config lookups tests."""
+
+from unittest.mock import patch
+
+from cds_rdm.config_lookups import current_config_lookups
+
+
+def test_committee_approval_lookups(app):
+    """Test committee report-number lookups follow changes of the config."""
+    communities = {"ep": {"report_number": {"prefix": "CERN-EP"}}}
+    with patch.dict(app.config, {"CDS_COMMITTEE_APPROVAL_COMMUNITIES": communities}):
+        assert current_config_lookups.committee_approval_prefixes == {"CERN-EP"}
+        assert current_config_lookups.matches_committee_report_number(
+            "CERN-EP-2026-001"
+        )
+        assert not current_config_lookups.matches_committee_report_number(
+            "CERN-EP-DRAFT-2026-001"
+        )
+        assert not current_config_lookups.matches_committee_report_number(
+            "CERN-TH-EP-2026-001"
+        )
+
+        # a community enrolled at runtime
+        communities["th"] = {"report_number": {"prefix": "CERN-TH-EP"}}
+        assert current_config_lookups.matches_committee_report_number(
+            "CERN-TH-EP-2026-001"
+        )
+        assert current_config_lookups.has_committee_approval_prefix("CERN-TH-EP-X")
+        assert not current_config_lookups.has_committee_approval_prefix("CERN-TH-1")
+
+    # the replaced config value
+    with patch.dict(app.config, {"CDS_COMMITTEE_APPROVAL_COMMUNITIES": {}}):
+        assert current_config_lookups.committee_approval_prefixes == frozenset()
+        assert not current_config_lookups.matches_committee_report_number(
+            "CERN-EP-2026-001"
+        )
+        assert not current_config_lookups.has_committee_approval_prefix("CERN-EP-1")
+
+
+def test_clc_sync_allowed_lookup(app):
+    """Test CLC sync allowed resource types are matched by prefix."""
+    with patch.dict(app.config, {"CLC_SYNC_ALLOWED_RESOURCE_TYPES": ["publication"]}):
+        assert current_config_lookups.is_clc_sync_allowed("publication-article")
+        assert not current_config_lookups.is_clc_sync_allowed("dataset")